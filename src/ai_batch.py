@@ -0,0 +1,135 @@
+"""
+ai2 候选着法的批量评估（可选依赖 NumPy）。
+
+与 ai_othello._score_position 的评分完全一致，只是把所有候选的“走后局面”放进一个
+(候选数, 格子数) 的布尔数组里一次算完：
+- 位置分：按尺寸预计算的权重向量（角 100、边 10、内部 1），空角旁的危险区改为 -50；
+- 子数差与翻子数：对数组按行求和；
+- 对手行动力：8 个方向上用平移后的掩码做洪泛，得到每个走后局面的对手合法点数
+  （扁平布局带哨兵列，平移只是切片视图；某方向上已无延伸时提前结束）。
+
+没有安装 NumPy 时 HAVE_NUMPY 为 False，调用方退回逐个试走的纯 Python 实现。
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import List, Sequence, Tuple
+
+from src.core.board import Board
+from src.core.geometry import geometry_for
+from src.core.player import PlayerColor
+from src.rules.othello_bitboard import bitboards_of
+
+try:
+    import numpy as np
+except ImportError:  # NumPy 为可选依赖
+    np = None
+
+HAVE_NUMPY = np is not None
+BATCH_MIN_SIZE = 10  # 小棋盘上候选少，数组开销大于收益，仍走纯 Python
+
+_DIRECTIONS = ((-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1))
+
+
+def batch_enabled(size: int) -> bool:
+    return HAVE_NUMPY and size >= BATCH_MIN_SIZE
+
+
+@lru_cache(maxsize=None)
+def _weights_for(size: int) -> Tuple["np.ndarray", Tuple[Tuple[int, "np.ndarray"], ...]]:
+    """
+    返回 (基础位置权重向量, ((角位, 该角危险区下标数组), ...))。
+    """
+    geometry = geometry_for(size)
+    base = np.array([10 if edge else 1 for edge in geometry.is_edge], dtype=np.int64)
+    base[list(geometry.corners)] = 100
+    zones = tuple((corner, np.array(sorted(danger), dtype=np.intp)) for corner, danger in geometry.corner_zones)
+    return base, zones
+
+
+def _unpack(values: Sequence[int], cells: int) -> "np.ndarray":
+    """
+    若干个位棋盘整数 -> (len(values), cells) 的布尔数组，第 i 位对应第 i 格。
+    """
+    width = (cells + 7) // 8
+    raw = np.frombuffer(b"".join(value.to_bytes(width, "little") for value in values), dtype=np.uint8)
+    bits = np.unpackbits(raw.reshape(len(values), width), axis=1, bitorder="little")
+    return bits[:, :cells].astype(bool)
+
+
+@lru_cache(maxsize=None)
+def _layout(size: int) -> Tuple[int, int, Tuple[int, ...]]:
+    """
+    行宽 size + 1 的扁平布局（每行末尾一个恒为 False 的哨兵列，前后各留 margin 格）：
+    八个方向的平移都是同一数组上错开固定偏移的切片视图，不用复制也不会跨行回绕。
+    返回 (行宽, margin, 各方向的偏移)。
+    """
+    width = size + 1
+    margin = width + 1
+    return width, margin, tuple(dy * width + dx for dy, dx in _DIRECTIONS)
+
+
+def _padded(grid: "np.ndarray", size: int) -> "np.ndarray":
+    """
+    (K, size * size) 的布尔数组 -> (K, 扁平布局长度) 的数组。
+    """
+    width, margin, _ = _layout(size)
+    count = grid.shape[0]
+    out = np.zeros((count, size * width + 2 * margin), dtype=bool)
+    out[:, margin : margin + size * width].reshape(count, size, width)[:, :, :size] = grid.reshape(count, size, size)
+    return out
+
+
+def _mobility(mover: "np.ndarray", other: "np.ndarray", size: int) -> "np.ndarray":
+    """
+    一批局面（扁平布局）中 mover 一方的合法落子数：
+    从 mover 的子出发沿方向穿过连续的 other 子，落在空格上即为合法点。
+    """
+    width, margin, offsets = _layout(size)
+    end = mover.shape[1] - margin
+    core = slice(margin, end)
+    other_core = other[:, core]
+    empty = ~(mover[:, core] | other_core)
+    empty[:, width - 1 :: width] = False  # 哨兵列不是棋盘格
+    legal = np.zeros_like(empty)
+    front = np.zeros_like(mover)  # 本方向上最新延伸到的 other 子
+    for offset in offsets:
+        # 平移 offset：新数组第 i 格取原数组第 i - offset 格
+        step = mover[:, margin - offset : end - offset] & other_core
+        while step.any():
+            front[:, core] = step
+            shifted = front[:, margin - offset : end - offset]
+            # 连线再走一格落在空格上即为合法点；仍是 other 子则继续延伸
+            legal |= shifted & empty
+            step = shifted & other_core
+    return legal.sum(axis=1)
+
+
+def batch_scores(board: Board, color: PlayerColor, moves: Sequence[int], flips: Sequence[int]) -> List[float]:
+    """
+    moves 为候选落子下标，flips 为各自的翻子掩码；返回与 ai2 逐个评估相同的分数列表。
+    """
+    size = board.size
+    cells = size * size
+    black, white = bitboards_of(board)
+    own, opp = (black, white) if color == PlayerColor.BLACK else (white, black)
+
+    # 位置分看落子前的局面：空角旁的危险区为 -50
+    base, zones = _weights_for(size)
+    weights = base.copy()
+    for corner, danger in zones:
+        if not ((own | opp) >> corner) & 1:
+            weights[danger] = -50
+    positional = weights[np.array(moves, dtype=np.intp)]
+
+    changed = _unpack([mask | (1 << index) for index, mask in zip(moves, flips)], cells)
+    own_after = changed | _unpack([own], cells)
+    opp_after = _unpack([opp], cells) & ~changed
+    flip_counts = changed.sum(axis=1) - 1
+    disc_diff = own_after.sum(axis=1) - opp_after.sum(axis=1)
+    opp_mobility = _mobility(_padded(opp_after, size), _padded(own_after, size), size)
+
+    raw = positional * 100 + flip_counts * 2 + disc_diff - opp_mobility * 5
+    # 与逐个评估相同：整数部分精确，再乘同一个浮点系数
+    return (raw.astype(np.float64) * (8.0 / float(size))).tolist()
@@ -0,0 +1,233 @@
+"""
+黑白棋残局精确求解：空格数不超过阈值时，搜到终局，求出双方最优下的最终子数差。
+
+- 分数为行棋方视角的最终子数差（与 OthelloRuleEngine.result 的判定一致，空格不计入任何一方）；
+- 空格较多时按“最快优先”排序：先走让对方行动力最少的着法，其次看区域奇偶；
+- 空格较少时只按区域奇偶排序：棋盘四等分，先下空格数为奇数的区域；
+- 最后几个空格走专用快速路径：直接对每个空格算翻子，不生成整盘走法掩码、不排序；
+  只剩一个空格时直接算出终局子数差。
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+from src.ai_time import CHECK_NODES, Deadline
+from src.core.bitmask import iter_indices, popcount
+from src.core.board import Board
+from src.core.geometry import geometry_for
+from src.core.move import Move
+from src.core.player import PlayerColor
+from src.rules.othello_bitboard import bitboards_of, flip_mask, legal_mask
+
+DEFAULT_ENDGAME_EMPTIES = 10  # ai3+ 在空格数不超过该值时改用精确求解
+MAX_SOLVE_EMPTIES = 14  # solve 命令允许的最大空格数
+FASTEST_FIRST_EMPTIES = 7  # 空格数超过该值时按最快优先排序
+FAST_PATH_EMPTIES = 3  # 空格数不超过该值时走快速路径
+
+
+class EndgameAbort(Exception):
+    """
+    节点预算或时间用完（或被取消）。
+    """
+
+
+@dataclass
+class EndgameResult:
+    move: Move
+    score: int  # 行棋方视角的最终子数差
+    empties: int
+    nodes: int
+
+    @property
+    def outcome(self) -> str:
+        if self.score > 0:
+            return "win"
+        if self.score < 0:
+            return "loss"
+        return "draw"
+
+    def summary(self) -> str:
+        if self.score == 0:
+            proof = "draw"
+        else:
+            proof = f"{self.outcome} by {abs(self.score)}"
+        unit = "empty" if self.empties == 1 else "empties"
+        return f"exact endgame ({self.empties} {unit}): {proof}, {self.nodes} nodes"
+
+
+@lru_cache(maxsize=None)
+def _quadrants(size: int) -> Tuple[int, ...]:
+    """
+    每个格子所属的四分区编号，用于区域奇偶排序。
+    """
+    half = size // 2
+    return tuple((y >= half) * 2 + (x >= half) for y in range(size) for x in range(size))
+
+
+@lru_cache(maxsize=None)
+def _quadrant_masks(size: int) -> Tuple[int, ...]:
+    masks = [0, 0, 0, 0]
+    for index, quadrant in enumerate(_quadrants(size)):
+        masks[quadrant] |= 1 << index
+    return tuple(masks)
+
+
+class EndgameSolver:
+    """
+    一次求解的状态：节点计数与可选的节点预算、用时。
+    """
+
+    def __init__(self, size: int, nodes: Optional[int] = None, deadline: Optional[Deadline] = None):
+        self.size = size
+        self.limit = nodes
+        self.deadline = deadline
+        self.nodes = 0
+        self.full = geometry_for(size).full_mask
+        self.quadrants = _quadrants(size)
+        self.quadrant_masks = _quadrant_masks(size)
+
+    def solve(self, own: int, opp: int) -> Tuple[Optional[int], int]:
+        """
+        返回 (最佳落子下标或 None 表示只能 pass, 行棋方视角的最终子数差)。
+        """
+        empty = self.full & ~(own | opp)
+        bound = self.size * self.size + 1
+        moves = self._ordered(own, opp, legal_mask(own, opp, self.size), empty)
+        if not moves:
+            return None, -self._solve(opp, own, empty, -bound, bound, True)
+        best_move, alpha, beta = moves[0], -bound, bound
+        for index in moves:
+            flips = flip_mask(own, opp, index, self.size)
+            bit = 1 << index
+            score = -self._solve(opp & ~flips, own | flips | bit, empty & ~bit, -beta, -alpha, False)
+            if score > alpha:
+                alpha, best_move = score, index
+        return best_move, alpha
+
+    def _solve(self, own: int, opp: int, empty: int, alpha: int, beta: int, passed: bool) -> int:
+        self.nodes += 1
+        if self.limit is not None and self.nodes > self.limit:
+            raise EndgameAbort()
+        if self.deadline is not None and not self.nodes % CHECK_NODES and self.deadline.expired():
+            raise EndgameAbort()
+        size = self.size
+        remaining = popcount(empty)
+        if remaining == 1:
+            return self._last(own, opp, empty)
+        if remaining <= FAST_PATH_EMPTIES:
+            return self._solve_few(own, opp, empty, alpha, beta, passed)
+
+        mask = legal_mask(own, opp, size)
+        if not mask:
+            if passed:
+                return popcount(own) - popcount(opp)
+            return -self._solve(opp, own, empty, -beta, -alpha, True)
+
+        best = -size * size - 1
+        for index in self._ordered(own, opp, mask, empty):
+            flips = flip_mask(own, opp, index, size)
+            bit = 1 << index
+            score = -self._solve(opp & ~flips, own | flips | bit, empty & ~bit, -beta, -alpha, False)
+            if score > best:
+                best = score
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        break
+        return best
+
+    def _solve_few(self, own: int, opp: int, empty: int, alpha: int, beta: int, passed: bool) -> int:
+        """
+        快速路径：按区域奇偶遍历空格，直接算翻子判断合法性。
+        """
+        size = self.size
+        best = None
+        for index in self._parity_order(empty):
+            flips = flip_mask(own, opp, index, size)
+            if not flips:
+                continue
+            bit = 1 << index
+            score = -self._solve(opp & ~flips, own | flips | bit, empty & ~bit, -beta, -alpha, False)
+            if best is None or score > best:
+                best = score
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        break
+        if best is not None:
+            return best
+        if passed:
+            return popcount(own) - popcount(opp)
+        return -self._solve(opp, own, empty, -beta, -alpha, True)
+
+    def _last(self, own: int, opp: int, empty: int) -> int:
+        """
+        只剩一个空格：依次尝试行棋方与对方落子，直接得出终局子数差。
+        """
+        index = empty.bit_length() - 1
+        diff = popcount(own) - popcount(opp)
+        flipped = popcount(flip_mask(own, opp, index, self.size))
+        if flipped:
+            return diff + 2 * flipped + 1
+        flipped = popcount(flip_mask(opp, own, index, self.size))
+        if flipped:
+            return diff - 2 * flipped - 1
+        return diff
+
+    # --- 着法排序 ---
+
+    def _ordered(self, own: int, opp: int, mask: int, empty: int) -> List[int]:
+        moves = list(iter_indices(mask))
+        if len(moves) < 2:
+            return moves
+        odd = self._odd_regions(empty)
+        quadrants = self.quadrants
+        if popcount(empty) > FASTEST_FIRST_EMPTIES:
+            size = self.size
+
+            def mobility(index: int) -> int:
+                flips = flip_mask(own, opp, index, size)
+                bit = 1 << index
+                return popcount(legal_mask(opp & ~flips, own | flips | bit, size))
+
+            # 最快优先：对方行动力越少越先试，同分时奇数区域优先
+            moves.sort(key=lambda index: (mobility(index), not (odd >> quadrants[index]) & 1))
+        else:
+            moves.sort(key=lambda index: not (odd >> quadrants[index]) & 1)
+        return moves
+
+    def _parity_order(self, empty: int) -> List[int]:
+        odd = self._odd_regions(empty)
+        quadrants = self.quadrants
+        return sorted(iter_indices(empty), key=lambda index: not (odd >> quadrants[index]) & 1)
+
+    def _odd_regions(self, empty: int) -> int:
+        """
+        空格数为奇数的区域编号集合（按位）。
+        """
+        odd = 0
+        for quadrant, mask in enumerate(self.quadrant_masks):
+            if popcount(empty & mask) & 1:
+                odd |= 1 << quadrant
+        return odd
+
+
+def solve_othello(
+    board: Board, color: PlayerColor, nodes: Optional[int] = None, deadline: Optional[Deadline] = None
+) -> EndgameResult:
+    """
+    精确求解 color 行棋时的局面；nodes 为节点预算，deadline 为用时，用完抛出 EndgameAbort。
+    """
+    black, white = bitboards_of(board)
+    own, opp = (black, white) if color == PlayerColor.BLACK else (white, black)
+    solver = EndgameSolver(board.size, nodes, deadline)
+    index, score = solver.solve(own, opp)
+    if index is None:
+        move = Move.pass_move(color)
+    else:
+        move = Move(x=index % board.size, y=index // board.size, color=color)
+    empties = board.size * board.size - popcount(own | opp)
+    return EndgameResult(move=move, score=score, empties=empties, nodes=solver.nodes)
@@ -4,6 +4,9 @@ import random
 from dataclasses import dataclass
 from typing import List, Optional, Tuple
 
+from src.ai_batch import batch_enabled, batch_scores
+from src.ai_search import MIN_SEARCH_LEVEL, limits_for_level, search_othello_move
+from src.core.bitmask import popcount
 from src.core.board import Board
 from src.core.move import Move
 from src.core.player import PlayerColor
@@ -34,15 +37,13 @@ def choose_othello_move(
         x, y = rng.choice(legal)
         return Move(x=x, y=y, color=color, is_pass=False)
 
-    scored: List[ScoredMove] = []
-    for x, y in legal:
-        flips = engine.flips_for_move(board, x, y, color)
-        sim = board.clone()
-        sim.set(x, y, color)
-        for fx, fy in flips:
-            sim.set(fx, fy, color)
-        score = _score_position(board, sim, x, y, color, engine, flips=len(flips))
-        scored.append(ScoredMove(x=x, y=y, score=score, flips=len(flips)))
+    if level >= MIN_SEARCH_LEVEL:
+        return search_othello_move(board, color, limits_for_level(level), rng=rng).move
+
+    if batch_enabled(board.size):
+        scored = _score_moves_batched(board, color, engine, legal)
+    else:
+        scored = _score_moves(board, color, engine, legal)
 
     best_score = max(m.score for m in scored)
     best = [m for m in scored if m.score == best_score]
@@ -50,29 +51,56 @@ def choose_othello_move(
     return Move(x=chosen.x, y=chosen.y, color=color, is_pass=False)
 
 
+def _score_moves(
+    board: Board, color: PlayerColor, engine: OthelloRuleEngine, legal: List[Tuple[int, int]]
+) -> List[ScoredMove]:
+    # 在同一块棋盘上试走再撤销（make/unmake），不为每个候选复制棋盘
+    scored: List[ScoredMove] = []
+    for x, y in legal:
+        move = Move(x=x, y=y, color=color)
+        plan = engine.prepare_move(board, move, None)
+        flips = popcount(plan.flips)
+        # 位置权重要看落子前的局面（角是否为空）
+        positional = _positional_weight(board, x, y)
+        token = engine.make_move(board, move, plan)
+        try:
+            score = _score_position(board, positional, color, engine, flips=flips)
+        finally:
+            engine.unmake_move(board, token)
+        scored.append(ScoredMove(x=x, y=y, score=score, flips=flips))
+    return scored
+
+
+def _score_moves_batched(
+    board: Board, color: PlayerColor, engine: OthelloRuleEngine, legal: List[Tuple[int, int]]
+) -> List[ScoredMove]:
+    # 与 _score_moves 分数相同：只生成翻子掩码，评估交给 ai_batch 一次算完
+    size = board.size
+    masks = [engine.prepare_move(board, Move(x=x, y=y, color=color), None).flips for x, y in legal]
+    scores = batch_scores(board, color, [y * size + x for x, y in legal], masks)
+    return [
+        ScoredMove(x=x, y=y, score=score, flips=popcount(mask)) for (x, y), score, mask in zip(legal, scores, masks)
+    ]
+
+
 def _score_position(
-    before: Board,
     after: Board,
-    x: int,
-    y: int,
+    positional: int,
     color: PlayerColor,
     engine: OthelloRuleEngine,
     flips: int,
 ) -> float:
-    size = before.size
+    """
+    after 为试走后的局面；positional 为落子点在落子前的位置权重（角 > 边 > 内部，临近空角极大惩罚）。
+    """
+    size = after.size
     opponent = color.opposite()
 
-    # 位置权重：角 > 边 > 内部；临近空角则极大惩罚
-    positional = _positional_weight(before, x, y)
-
-    # 走完后的子力差（越大越好）
-    black, white = engine.count_discs(after)
-    my_count = black if color == PlayerColor.BLACK else white
-    opp_count = white if color == PlayerColor.BLACK else black
-    disc_diff = my_count - opp_count
+    # 走完后的子力差（越大越好；计数由棋盘增量维护）
+    disc_diff = after.count(color) - after.count(opponent)
 
     # 限制对手行动力（越少越好）
-    opp_mobility = len(engine.legal_moves(after, opponent))
+    opp_mobility = popcount(engine.legal_move_bits(after, opponent))
 
     # 组合评分（经验权重，目标：稳定胜过随机 AI）
     score = 0.0
@@ -88,30 +116,17 @@ def _score_position(
 
 
 def _positional_weight(board: Board, x: int, y: int) -> int:
-    size = board.size
-    corners = {(0, 0), (0, size - 1), (size - 1, 0), (size - 1, size - 1)}
-    if (x, y) in corners:
+    geometry = board.geometry
+    index = y * board.size + x
+    if index in geometry.corners:
         return 100
 
     # “危险区”：角附近 3 个位置，且该角仍为空时
-    for cx, cy, danger in _corner_danger_zones(size):
-        if (x, y) in danger and board.get(cx, cy) is None:
+    for corner, danger in geometry.corner_zones:
+        if index in danger and board.get(*geometry.coords(corner)) is None:
             return -50
 
     # 边线略好，内部默认
-    if x == 0 or y == 0 or x == size - 1 or y == size - 1:
+    if geometry.is_edge[index]:
         return 10
     return 1
-
-
-def _corner_danger_zones(size: int) -> List[Tuple[int, int, List[Tuple[int, int]]]]:
-    return [
-        (0, 0, [(0, 1), (1, 0), (1, 1)]),
-        (0, size - 1, [(0, size - 2), (1, size - 1), (1, size - 2)]),
-        (size - 1, 0, [(size - 2, 0), (size - 1, 1), (size - 2, 1)]),
-        (
-            size - 1,
-            size - 1,
-            [(size - 2, size - 1), (size - 1, size - 2), (size - 2, size - 2)],
-        ),
-    ]
@@ -0,0 +1,306 @@
+"""
+ai3+ 的并行根节点分裂搜索（可选）。
+
+- 进程池常驻：ProcessPoolExecutor 在第一次使用时创建，之后各着法复用，进程退出时关闭；
+- 局面经 ai_shared.PositionBuffer（共享内存）交换：协调者把根局面写进槽位，
+  任务只传缓冲区名、槽位、代号、着法、深度与窗口几个整数，工作进程在共享内存上读局面、写结果；
+- 每个工作进程有自己的置换表，跨任务、跨着法保留；使用模式表评估时任务带上权重文件路径，
+  工作进程各自载入一次并缓存；
+- 迭代加深的每一层先单独搜长子（上一层的最佳着法）得到 alpha，
+  其余根着法再分发给工作进程（young brothers wait）。协调者只保留与工作进程数相同的在途任务，
+  每收到一个结果就更新 alpha，后续提交的任务用更紧的窗口；
+- 节点预算是整步的上限：长子用剩余预算，其余着法在提交时均分尚未分出的预算；
+- 限时与取消：协调者等待结果时定期检查 limits.deadline，到点后置位共享槽位的停止标志，
+  工作进程每隔若干节点看一眼该标志并放弃搜索；这一层已搜完的着法中的最佳者仍可使用。
+"""
+
+from __future__ import annotations
+
+import atexit
+import random
+import signal
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Dict, List, Optional, Tuple
+
+from src.ai_search import (
+    INFINITY,
+    WIN_SCORE,
+    OthelloSearch,
+    SearchAbort,
+    SearchLimits,
+    SearchResult,
+    index_to_move,
+    own_opp,
+    solve_endgame,
+)
+from src.ai_patterns import PatternEvaluator, load_patterns
+from src.ai_time import Deadline
+from src.ai_transposition import DEFAULT_TT_MB, TranspositionTable
+from src.ai_shared import RESULT_ABORTED, RESULT_DONE, PositionBuffer
+from src.core.bitmask import cells_mask
+from src.core.board import BLACK, WHITE, Board
+from src.core.player import PlayerColor
+
+MAX_WORKERS = 64
+SERIAL_DEPTH = 2  # 浅层迭代直接在协调进程里搜，进程往返不划算
+POLL_SECONDS = 0.02  # 协调者等待工作进程时检查用时与取消的间隔
+
+# (缓冲区名, 槽位, 局面代号, 着法, 深度, alpha, beta, 节点预算或 0, 模式权重文件路径或 "")
+Task = Tuple[str, int, int, int, int, int, int, int, str]
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_config: Tuple[int, int] = (0, 0)
+_buffer: Optional[PositionBuffer] = None
+
+# 工作进程内的状态
+_worker_table: Optional[TranspositionTable] = None
+_worker_buffers: Dict[str, PositionBuffer] = {}
+_worker_patterns: Dict[str, PatternEvaluator] = {}
+_worker_position: Tuple[int, int, int] = (-1, -1, -1)  # (槽位, 代号, 置换表换代用)
+
+
+def _init_worker(tt_mb: int) -> None:
+    global _worker_table
+    # Ctrl+C 由协调进程处理（取消当前搜索），工作进程不随之退出
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    _worker_table = TranspositionTable(tt_mb) if tt_mb else None
+
+
+def _search_task(task: Task) -> int:
+    """
+    工作进程：从共享缓冲区读根局面，搜索一个根着法，把 (分数, 节点数, 状态) 写回该着法的结果条目。
+    """
+    global _worker_position
+    name, slot, generation, index, depth, alpha, beta, nodes, pattern_path = task
+    buffer = _worker_buffers.get(name)
+    if buffer is None:
+        buffer = PositionBuffer.attach(name)
+        _worker_buffers[name] = buffer
+    current, size, white, key = buffer.read_header(slot)
+    if current != generation:
+        return index  # 槽位已被新局面覆盖，任务作废
+    cells = bytes(buffer.cells(slot))
+    black_bits, white_bits = cells_mask(cells, BLACK), cells_mask(cells, WHITE)
+    own, opp = (white_bits, black_bits) if white else (black_bits, white_bits)
+    table = _worker_table
+    if table is not None and (slot, generation) != _worker_position[:2]:
+        table.new_search()
+        _worker_position = (slot, generation, 0)
+    patterns = None
+    if pattern_path:
+        patterns = _worker_patterns.get(pattern_path)
+        if patterns is None:
+            patterns = load_patterns(pattern_path)
+            _worker_patterns[pattern_path] = patterns
+    deadline = Deadline(stopped=lambda: buffer.stopped(slot))
+    limits = SearchLimits(depth=depth, nodes=nodes or None, deadline=deadline)
+    searcher = OthelloSearch(size, limits, table, patterns)
+    try:
+        score = searcher.search_move(own, opp, key, white, index, depth, alpha, beta)
+    except SearchAbort:
+        buffer.write_result(slot, index, 0, searcher.nodes, RESULT_ABORTED)
+        return index
+    buffer.write_result(slot, index, score, searcher.nodes, RESULT_DONE)
+    return index
+
+
+def worker_pool(workers: int, tt_mb: int = DEFAULT_TT_MB) -> ProcessPoolExecutor:
+    """
+    取得常驻进程池；工作进程数或置换表大小变化时重建。
+    """
+    global _pool, _pool_config
+    config = (workers, tt_mb)
+    if _pool is None or _pool_config != config:
+        shutdown_pool()
+        _pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(tt_mb,))
+        _pool_config = config
+    return _pool
+
+
+def position_buffer() -> PositionBuffer:
+    """
+    协调进程的共享局面缓冲区，与进程池同生命周期。
+    """
+    global _buffer
+    if _buffer is None:
+        _buffer = PositionBuffer.create()
+    return _buffer
+
+
+def shutdown_pool() -> None:
+    global _pool, _buffer
+    if _pool is not None:
+        _pool.shutdown(wait=True)
+        _pool = None
+    if _buffer is not None:
+        _buffer.close()
+        _buffer = None
+
+
+atexit.register(shutdown_pool)
+
+
+def parallel_search_othello_move(
+    board: Board,
+    color: PlayerColor,
+    limits: SearchLimits,
+    workers: int,
+    rng: Optional[random.Random] = None,
+    tt_mb: int = DEFAULT_TT_MB,
+    patterns: Optional[PatternEvaluator] = None,
+) -> SearchResult:
+    """
+    与 search_othello_move 相同的接口与结果，根节点着法分给 workers 个进程并行搜索。
+    patterns 须是从文件载入的（工作进程按 patterns.path 重新载入）。
+    """
+    solved = solve_endgame(board, color, limits)
+    if solved is not None:
+        return solved
+    size = board.size
+    own, opp = own_opp(board, color)
+    key = board.position_key(color)
+    white = 1 if color == PlayerColor.WHITE else 0
+    local = OthelloSearch(size, limits, patterns=patterns)
+    moves = local.root_moves(own, opp, rng)
+    if not moves:
+        score = local.evaluate(own, opp, white)
+        return SearchResult(move=index_to_move(None, size, color), score=score, depth=0, nodes=0)
+
+    pool = worker_pool(workers, tt_mb)
+    buffer = position_buffer()
+    slot = buffer.allocate()
+    if slot is None:
+        raise RuntimeError("No free slot in the shared position buffer")
+    try:
+        generation = buffer.write_position(slot, bytes(board.data), size, white, key)
+        return _iterate(local, (own, opp, key, white), (buffer, slot, generation), pool, moves, limits, workers, color)
+    finally:
+        buffer.release(slot)
+
+
+def _iterate(
+    local: OthelloSearch,
+    root: Tuple[int, int, int, int],
+    shared: Tuple[PositionBuffer, int, int],
+    pool: ProcessPoolExecutor,
+    moves: List[int],
+    limits: SearchLimits,
+    workers: int,
+    color: PlayerColor,
+) -> SearchResult:
+    """
+    迭代加深：浅层在本进程搜，之后每层交给 _split_root 并行搜。
+    """
+    size = local.size
+    nodes = 0
+    best_move, best_score, completed = moves[0], 0, 0
+    for depth in range(1, max(1, limits.depth) + 1):
+        if depth <= SERIAL_DEPTH:
+            try:
+                score, move = local.search_root(*root, moves, depth, -INFINITY, INFINITY)
+            except SearchAbort:
+                if local.partial is not None:
+                    best_move, best_score = local.partial
+                break
+            nodes = local.nodes
+        else:
+            budget = limits.nodes - nodes if limits.nodes is not None else 0
+            if limits.nodes is not None and budget <= 0:
+                break
+            pattern_path = local.patterns.path if local.patterns is not None else ""
+            found, complete, used = _split_root(
+                pool, shared, moves, depth, budget, workers, limits.deadline, pattern_path
+            )
+            nodes += used
+            if found is None:
+                break
+            move, score = found
+            if not complete:
+                # 这一层没搜完：已搜完的着法中的最佳者仍优于上一层的结论（长子必在其中）
+                best_move, best_score = move, score
+                break
+        best_move, best_score, completed = move, score, depth
+        moves.remove(move)
+        moves.insert(0, move)
+        if abs(best_score) >= WIN_SCORE // 2:
+            break
+    return SearchResult(
+        move=index_to_move(best_move, size, color), score=best_score, depth=completed, nodes=nodes, workers=workers
+    )
+
+
+def _split_root(
+    pool: ProcessPoolExecutor,
+    shared: Tuple[PositionBuffer, int, int],
+    moves: List[int],
+    depth: int,
+    budget: int,
+    workers: int,
+    deadline: Optional[Deadline] = None,
+    pattern_path: str = "",
+) -> Tuple[Optional[Tuple[int, int]], bool, int]:
+    """
+    搜索一层迭代：先搜长子，再并行搜其余着法并共享 alpha。budget 为本层可用的节点预算（0 表示不限），
+    各任务分到的预算之和不超过它，累计节点数到达预算即停下。
+    返回 ((最佳着法, 分数), 是否搜完, 节点数)；长子没搜完时第一项为 None，
+    中途停下时第一项为已搜完的着法中的最佳者。
+    """
+
+    buffer, slot, generation = shared
+
+    def task(index: int, alpha: int, nodes: int) -> Task:
+        return (buffer.name, slot, generation, index, depth, alpha, INFINITY, nodes, pattern_path)
+
+    def collect(index: int) -> Tuple[Optional[int], int]:
+        status, score, used = buffer.read_result(slot, index)
+        return (score if status == RESULT_DONE else None), used
+
+    def wait_any(futures) -> set:
+        # 等待期间检查用时与取消，到点后通过共享内存通知所有在途任务停下
+        while True:
+            if deadline is not None and not buffer.stopped(slot) and deadline.expired():
+                buffer.stop(slot)
+            done, _ = wait(futures, timeout=POLL_SECONDS, return_when=FIRST_COMPLETED)
+            if done:
+                return done
+
+    nodes = 0
+    # 长子单独搜，可用全部剩余预算（与串行搜索一致）
+    eldest = pool.submit(_search_task, task(moves[0], -INFINITY, budget))
+    wait_any([eldest])
+    score, used = collect(eldest.result())
+    nodes += used
+    if score is None:
+        return None, False, nodes
+    best, alpha = moves[0], score
+    pending = list(moves[1:])
+    running: Dict[Future, Tuple[int, int]] = {}  # 在途任务 -> (着法, 分到的节点预算)
+    reserved = 0  # 在途任务分到的预算之和
+    while pending or running:
+        while pending and len(running) < workers and not buffer.stopped(slot):
+            share = 0
+            if budget:
+                # 剩余预算（扣除在途任务已分走的）均分给尚未提交的着法，整层合计不超过 budget
+                share = (budget - nodes - reserved) // len(pending)
+                if share <= 0:
+                    buffer.stop(slot)
+                    break
+            index = pending.pop(0)
+            running[pool.submit(_search_task, task(index, alpha, share))] = (index, share)
+            reserved += share
+        if not running:
+            break
+        for future in wait_any(running):
+            index, share = running.pop(future)
+            reserved -= share
+            score, used = collect(future.result())
+            nodes += used
+            if score is None or (budget and nodes >= budget):
+                # 预算或时间用完：不再提交新任务，等在途任务停下后返回已搜完部分的结果
+                buffer.stop(slot)
+            if score is None:
+                continue
+            # 窗口为 (alpha, +inf)：不超过 alpha 的分数只是上界，不会被选中
+            if score > alpha:
+                best, alpha = index, score
+    return (best, alpha), not buffer.stopped(slot), nodes
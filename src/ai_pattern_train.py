@@ -0,0 +1,216 @@
+"""
+模式表权重的离线训练：从自对弈与存档对局中收集局面，以最终子数差为目标做最小二乘拟合。
+
+- 每个局面（行棋方有合法落子）是一行：16 个模式实例各命中一个权重（值为 1），
+  另有行动力差与常数项，全部落在该局面所属阶段的那一段权重里；
+  目标为行棋方视角的最终子数差，只收录下到终局（双方都无棋可走）的对局；
+- 求解带岭回归项的最小二乘 min |Ax - b|^2 + ridge * |x|^2，用 CGLS（最小二乘共轭梯度），
+  只需对稀疏行做 Ax 与 A^T r，纯 Python 即可；没见过的模式取值权重为 0；
+- 结果按 WEIGHT_SCALE 量化为 int16，写成 ai_patterns 的权重文件。
+
+命令行：python3 -m src.ai_pattern_train --size 8 --saves saves --self-play 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+from array import array
+from typing import Iterable, List, Optional, Tuple
+
+from src.ai_othello import choose_othello_move
+from src.ai_patterns import (
+    BIAS_WEIGHT,
+    MOBILITY_WEIGHT,
+    PATTERN_STAGES,
+    STAGE_WEIGHTS,
+    WEIGHT_SCALE,
+    default_pattern_path,
+    pattern_set,
+    write_patterns,
+)
+from src.core.bitmask import popcount
+from src.core.move import Move
+from src.game.factory import GameFactory, finished_games
+from src.rules.othello_bitboard import bitboards_of, flip_mask, legal_mask
+
+DEFAULT_ITERATIONS = 60
+DEFAULT_RIDGE = 10.0
+DEFAULT_RANDOM_PLIES = 8
+DEFAULT_LEVEL = 3  # ai2 自对弈的胜负太依赖它自己的失误，拟合出的权重明显更弱
+
+# 稀疏的一行：(值为 1 的权重位置, 行动力权重位置, 行动力差)
+Row = Tuple[List[int], int, int]
+
+
+class PatternTrainer:
+    """
+    收集训练局面 (黑位棋盘, 白位棋盘, 行棋方是否白方, 最终子数差 黑 - 白) 并拟合权重。
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        self.patterns = pattern_set(size)
+        self.positions: List[Tuple[int, int, int, int]] = []
+        self.games = 0
+
+    def add_game(self, moves: Iterable[Move]) -> bool:
+        """
+        从标准开局在位棋盘上回放 moves；出现非法或无法还原（None）的着法、或没有下到终局（如认输）时
+        整局丢弃，返回 False。
+        """
+        size = self.size
+        black, white = bitboards_of(GameFactory.create("othello", size).board)
+        to_move = 0
+        pending = []
+        for move in moves:
+            if move is None:
+                return False
+            own, opp = (white, black) if to_move else (black, white)
+            legal = legal_mask(own, opp, size)
+            if move.is_pass:
+                if legal:
+                    return False
+            else:
+                index = move.y * size + move.x
+                if not 0 <= move.x < size or not 0 <= move.y < size or not (legal >> index) & 1:
+                    return False
+                pending.append((black, white, to_move))
+                flips = flip_mask(own, opp, index, size)
+                own, opp = own | flips | (1 << index), opp & ~flips
+                black, white = (opp, own) if to_move else (own, opp)
+            to_move ^= 1
+        if legal_mask(black, white, size) or legal_mask(white, black, size):
+            return False
+        diff = popcount(black) - popcount(white)
+        self.positions.extend((b, w, mover, diff) for b, w, mover in pending)
+        self.games += 1
+        return True
+
+    def add_saved_game(self, path: str) -> bool:
+        """
+        收录一个已结束的 Othello 存档对局（尺寸需一致）。
+        """
+        game = GameFactory.load_finished(path, "othello", self.size)
+        return game is not None and self.add_game(record.move for record in game.history.stack)
+
+    def add_saved_games(self, directory: str) -> int:
+        games = finished_games(directory, "othello", self.size)
+        return sum(1 for game in games if self.add_game(record.move for record in game.history.stack))
+
+    def add_self_play(
+        self, count: int, level: int = DEFAULT_LEVEL, rng: Optional[random.Random] = None, random_plies: int = DEFAULT_RANDOM_PLIES
+    ) -> int:
+        """
+        AI 自对弈 count 局并收录；前 random_plies 手随机落子，让训练局面覆盖更多开局。
+        """
+        rng = rng or random.Random()
+        added = 0
+        for _ in range(count):
+            game = GameFactory.create("othello", self.size)
+            moves = []
+            while not game.ended:
+                ply_level = 1 if len(moves) < random_plies else level
+                move = choose_othello_move(ply_level, game.board, game.to_move, game.rule_engine, rng=rng)
+                game.play_move(move)
+                moves.append(move)
+            if self.add_game(moves):
+                added += 1
+        return added
+
+    def rows(self) -> Tuple[List[Row], List[float]]:
+        """
+        训练局面 -> 稀疏行与目标（行棋方视角的最终子数差）。
+        """
+        patterns = self.patterns
+        size = self.size
+        rows: List[Row] = []
+        targets: List[float] = []
+        for black, white, mover, diff in self.positions:
+            own, opp = (white, black) if mover else (black, white)
+            base = patterns.stage_bases[popcount(black | white)]
+            columns = [base + feature for feature in patterns.features(patterns.indices(black, white), mover)]
+            columns.append(base + BIAS_WEIGHT)
+            mobility = popcount(legal_mask(own, opp, size)) - popcount(legal_mask(opp, own, size))
+            rows.append((columns, base + MOBILITY_WEIGHT, mobility))
+            targets.append(float(-diff if mover else diff))
+        return rows, targets
+
+    def fit(self, iterations: int = DEFAULT_ITERATIONS, ridge: float = DEFAULT_RIDGE) -> array:
+        """
+        拟合权重并量化为 int16（单位 1/WEIGHT_SCALE 子）。
+        """
+        rows, targets = self.rows()
+        solution = solve_least_squares(rows, targets, PATTERN_STAGES * STAGE_WEIGHTS, iterations, ridge)
+        return array("h", (max(-32767, min(32767, round(value * WEIGHT_SCALE))) for value in solution))
+
+
+def _multiply(rows: List[Row], x: List[float]) -> List[float]:
+    return [sum(x[column] for column in columns) + x[mobility_column] * mobility for columns, mobility_column, mobility in rows]
+
+
+def _multiply_transposed(rows: List[Row], r: List[float], width: int) -> List[float]:
+    out = [0.0] * width
+    for (columns, mobility_column, mobility), value in zip(rows, r):
+        for column in columns:
+            out[column] += value
+        out[mobility_column] += value * mobility
+    return out
+
+
+def solve_least_squares(
+    rows: List[Row], targets: List[float], width: int, iterations: int = DEFAULT_ITERATIONS, ridge: float = DEFAULT_RIDGE
+) -> List[float]:
+    """
+    CGLS 求解 min |Ax - b|^2 + ridge * |x|^2（A 为稀疏行，b 为 targets），从 x = 0 出发迭代 iterations 次。
+    """
+    x = [0.0] * width
+    residual = list(targets)
+    gradient = _multiply_transposed(rows, residual, width)
+    direction = list(gradient)
+    gamma = sum(value * value for value in gradient)
+    for _ in range(iterations):
+        if gamma <= 1e-12:
+            break
+        q = _multiply(rows, direction)
+        delta = sum(value * value for value in q) + ridge * sum(value * value for value in direction)
+        if delta <= 0:
+            break
+        alpha = gamma / delta
+        x = [a + alpha * d for a, d in zip(x, direction)]
+        residual = [r - alpha * v for r, v in zip(residual, q)]
+        gradient = [g - ridge * a for g, a in zip(_multiply_transposed(rows, residual, width), x)]
+        new_gamma = sum(value * value for value in gradient)
+        beta = new_gamma / gamma
+        direction = [g + beta * d for g, d in zip(gradient, direction)]
+        gamma = new_gamma
+    return x
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Fit Othello pattern weights from saved games and self-play")
+    parser.add_argument("--size", type=int, default=8)
+    parser.add_argument("--saves", default=None, help="directory of saved games (*.json)")
+    parser.add_argument("--self-play", type=int, default=0, help="number of AI self-play games")
+    parser.add_argument("--level", type=int, default=DEFAULT_LEVEL, help="AI level used for self-play")
+    parser.add_argument("--random-plies", type=int, default=DEFAULT_RANDOM_PLIES, help="random opening plies in self-play")
+    parser.add_argument("--iterations", type=int, default=DEFAULT_ITERATIONS, help="least-squares iterations")
+    parser.add_argument("--ridge", type=float, default=DEFAULT_RIDGE, help="ridge regularisation strength")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--out", default=None, help="output path (default weights/othello_<size>.pat)")
+    args = parser.parse_args(argv)
+
+    trainer = PatternTrainer(args.size)
+    if args.saves:
+        print(f"Saved games added: {trainer.add_saved_games(args.saves)}")
+    if args.self_play:
+        print(f"Self-play games added: {trainer.add_self_play(args.self_play, args.level, random.Random(args.seed), args.random_plies)}")
+    if not trainer.positions:
+        parser.error("no finished games to train on")
+    out = args.out or default_pattern_path(args.size)
+    write_patterns(out, args.size, trainer.fit(args.iterations, args.ridge))
+    print(f"Wrote pattern weights fitted on {len(trainer.positions)} positions from {trainer.games} games to {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+"""
+黑白棋 ai3+ 的模式表评估：以角 3x3、边与对角线上的格子状态为下标查权重表，取代手调的位置分。
+
+- 模式：每个角一个 3x3 块、两条从该角出发的 8 格边线、一条从该角出发的 8 格对角线，
+  共 16 个实例；同类实例按“从角出发”的统一朝向读格子，共用一张表（3^格数 项）；
+- 下标按黑白绝对颜色编码（空 0、黑 1、白 2，第 k 格乘 3^k），落子/翻子时增量更新，
+  搜索中 make/unmake 只改动受影响的几个下标；评估时白方行棋用黑白互换后的表；
+- 权重按对局阶段（已落子数）分 PATTERN_STAGES 段，每段另有行动力差与常数项两个权重，
+  单位为 1/WEIGHT_SCALE 子（行棋方视角的最终子数差），评估值为整数；
+- 权重文件为紧凑的 int16 数组（array 模块），按尺寸训练：weights/othello_<size>.pat。
+
+文件格式（小端）：
+- 文件头 12 字节：魔数 b"PAT1"、棋盘尺寸 u8、阶段数 u8、权重单位 u16、权重个数 u32；
+- 随后为 int16 权重，阶段依次排列，每段为 角表、边表、对角线表、行动力、常数项。
+
+训练见 src.ai_pattern_train（自对弈与存档对局上的最小二乘拟合）。
+"""
+
+from __future__ import annotations
+
+import os
+import struct
+import sys
+from array import array
+from functools import lru_cache
+from operator import getitem
+from typing import List, Tuple
+
+from src.core.bitmask import popcount
+from src.rules.othello_bitboard import legal_mask
+
+PATTERN_MAGIC = b"PAT1"
+PATTERN_DIR = "weights"
+PATTERN_STAGES = 4
+WEIGHT_SCALE = 32  # 权重以 1/32 子为单位存为 int16
+MIN_PATTERN_SIZE = 8
+
+_HEADER = struct.Struct("<4sBBHI")
+
+# (表名, 以左上角为原点的格子 (x, y) 列表, 是否另取一份转置)；其余三个角按镜像取格
+_SHAPES: Tuple[Tuple[str, Tuple[Tuple[int, int], ...], bool], ...] = (
+    ("corner", tuple((x, y) for y in range(3) for x in range(3)), False),
+    ("edge", tuple((x, 0) for x in range(8)), True),
+    ("diagonal", tuple((i, i) for i in range(8)), False),
+)
+_TABLE_OFFSETS: Tuple[int, ...] = tuple(
+    sum(3 ** len(cells) for _, cells, _ in _SHAPES[:i]) for i in range(len(_SHAPES))
+)
+MOBILITY_WEIGHT = sum(3 ** len(cells) for _, cells, _ in _SHAPES)  # 每段中行动力差权重的位置
+BIAS_WEIGHT = MOBILITY_WEIGHT + 1  # 每段中常数项的位置
+STAGE_WEIGHTS = BIAS_WEIGHT + 1  # 每段的权重个数
+
+
+def default_pattern_path(size: int) -> str:
+    return os.path.join(PATTERN_DIR, f"othello_{size}.pat")
+
+
+@lru_cache(maxsize=None)
+def _swap_table(length: int) -> Tuple[int, ...]:
+    """
+    长度为 length 的模式下标黑白互换（各位上的 1 与 2 对调）后的下标。
+    """
+    table = [0]
+    power = 1
+    for _ in range(length):
+        # 在已有的低位组合上追加一位：空、黑、白分别映射为空、白、黑
+        table = table + [index + 2 * power for index in table] + [index + power for index in table]
+        power *= 3
+    return tuple(table)
+
+
+class PatternSet:
+    """
+    某一尺寸下的模式实例表（每个尺寸只构建一次）：
+    - instances[i] = (表偏移, 格子下标元组)：第 k 个格子的权为 3^k；
+    - terms[index]：经过该格的 (实例编号, 3^k) 列表，用于增量更新；
+    - stage_bases[discs]：已落子数为 discs 时该阶段在权重数组中的起点。
+    """
+
+    def __init__(self, size: int):
+        if size < MIN_PATTERN_SIZE:
+            raise ValueError(f"Pattern evaluation needs a board of at least {MIN_PATTERN_SIZE}x{MIN_PATTERN_SIZE}")
+        self.size = size
+        last = size - 1
+        instances = []
+        for offset, (_, cells, transpose) in zip(_TABLE_OFFSETS, _SHAPES):
+            shapes = (cells, tuple((y, x) for x, y in cells)) if transpose else (cells,)
+            for flip_x, flip_y in ((False, False), (True, False), (False, True), (True, True)):
+                for shape in shapes:
+                    indices = tuple(
+                        (last - y if flip_y else y) * size + (last - x if flip_x else x) for x, y in shape
+                    )
+                    instances.append((offset, indices))
+        self.instances: Tuple[Tuple[int, Tuple[int, ...]], ...] = tuple(instances)
+        terms: List[List[Tuple[int, int]]] = [[] for _ in range(size * size)]
+        for number, (_, indices) in enumerate(instances):
+            for k, index in enumerate(indices):
+                terms[index].append((number, 3**k))
+        self.terms: Tuple[Tuple[Tuple[int, int], ...], ...] = tuple(tuple(cell) for cell in terms)
+        cells = size * size
+        # 开局 4 子到满盘均分为 PATTERN_STAGES 段
+        self.stage_bases: Tuple[int, ...] = tuple(
+            min(PATTERN_STAGES - 1, max(0, discs - 4) * PATTERN_STAGES // (cells - 3)) * STAGE_WEIGHTS
+            for discs in range(cells + 1)
+        )
+
+    def indices(self, black: int, white: int) -> List[int]:
+        """
+        从位棋盘从头计算各实例的下标（搜索根节点与训练时使用）。
+        """
+        result = []
+        for _, cells in self.instances:
+            index, power = 0, 1
+            for cell in cells:
+                if (black >> cell) & 1:
+                    index += power
+                elif (white >> cell) & 1:
+                    index += 2 * power
+                power *= 3
+            result.append(index)
+        return result
+
+    def features(self, indices: List[int], white: int) -> List[int]:
+        """
+        行棋方视角下各实例命中的权重位置（不含阶段起点）：白方行棋时取黑白互换后的下标。
+        """
+        if white:
+            return [
+                offset + _swap_table(len(cells))[index] for (offset, cells), index in zip(self.instances, indices)
+            ]
+        return [offset + index for (offset, _), index in zip(self.instances, indices)]
+
+
+@lru_cache(maxsize=None)
+def pattern_set(size: int) -> PatternSet:
+    return PatternSet(size)
+
+
+class PatternEvaluator:
+    """
+    载入的模式权重与增量评估。weights 为文件中的 int16 权重（行棋方视角）；
+    载入时另外展开一份黑白互换后的权重，白方行棋时直接用原下标查它，
+    并按 (行棋方, 阶段) 把各实例对应的表切出来，评估时一次 map 查完 16 个下标。
+    """
+
+    def __init__(self, size: int, weights: array, path: str = ""):
+        if len(weights) != PATTERN_STAGES * STAGE_WEIGHTS:
+            raise ValueError("Pattern weights do not match the pattern layout")
+        self.size = size
+        self.path = path
+        self.patterns = pattern_set(size)
+        self.weights = weights
+        swapped = array("h", weights)
+        for stage in range(PATTERN_STAGES):
+            base = stage * STAGE_WEIGHTS
+            for offset, (_, cells, _) in zip(_TABLE_OFFSETS, _SHAPES):
+                start = base + offset
+                swap = _swap_table(len(cells))
+                for index, other in enumerate(swap):
+                    swapped[start + index] = weights[start + other]
+        tables = []
+        for colored in (weights, swapped):
+            stages = []
+            for stage in range(PATTERN_STAGES):
+                base = stage * STAGE_WEIGHTS
+                by_offset = {
+                    offset: colored[base + offset : base + offset + 3 ** len(cells)]
+                    for offset, (_, cells, _) in zip(_TABLE_OFFSETS, _SHAPES)
+                }
+                stages.append(tuple(by_offset[offset] for offset, _ in self.patterns.instances))
+            tables.append(tuple(stages))
+        self._tables = tuple(tables)
+        self._mobility = tuple(weights[stage * STAGE_WEIGHTS + MOBILITY_WEIGHT] for stage in range(PATTERN_STAGES))
+        self._bias = tuple(weights[stage * STAGE_WEIGHTS + BIAS_WEIGHT] for stage in range(PATTERN_STAGES))
+        self._stages = tuple(base // STAGE_WEIGHTS for base in self.patterns.stage_bases)
+
+    def indices(self, own: int, opp: int, white: int) -> List[int]:
+        """
+        (own, opp) 局面的各实例下标；white 表示行棋方是否为白方（0/1）。
+        """
+        return self.patterns.indices(opp, own) if white else self.patterns.indices(own, opp)
+
+    def play(self, indices: List[int], index: int, white: int, flips: int) -> None:
+        """
+        行棋方在 index 落子并翻转 flips：就地更新下标（make）。
+        """
+        terms = self.patterns.terms
+        code = white + 1
+        for number, power in terms[index]:
+            indices[number] += code * power
+        # 翻子：黑 (1) 变白 (2) 加一个 3^k，白变黑减一个
+        sign = 1 if white else -1
+        while flips:
+            low = flips & -flips
+            for number, power in terms[low.bit_length() - 1]:
+                indices[number] += sign * power
+            flips ^= low
+
+    def undo(self, indices: List[int], index: int, white: int, flips: int) -> None:
+        """
+        撤销 play（unmake）。
+        """
+        terms = self.patterns.terms
+        code = white + 1
+        for number, power in terms[index]:
+            indices[number] -= code * power
+        sign = -1 if white else 1
+        while flips:
+            low = flips & -flips
+            for number, power in terms[low.bit_length() - 1]:
+                indices[number] += sign * power
+            flips ^= low
+
+    def score(self, indices: List[int], own: int, opp: int, white: int) -> int:
+        """
+        行棋方视角的评估（单位 1/WEIGHT_SCALE 子）；indices 须与 (own, opp) 一致。
+        """
+        stage = self._stages[popcount(own | opp)]
+        total = sum(map(getitem, self._tables[white][stage], indices))
+        size = self.size
+        mobility = popcount(legal_mask(own, opp, size)) - popcount(legal_mask(opp, own, size))
+        return total + self._mobility[stage] * mobility + self._bias[stage]
+
+    def evaluate(self, own: int, opp: int, white: int) -> int:
+        """
+        不依赖增量状态的评估：从头计算下标。
+        """
+        return self.score(self.indices(own, opp, white), own, opp, white)
+
+
+def load_patterns(path: str) -> PatternEvaluator:
+    """
+    读取权重文件；格式不对时抛 ValueError。
+    """
+    with open(path, "rb") as f:
+        header = f.read(_HEADER.size)
+        if len(header) != _HEADER.size:
+            raise ValueError("Pattern weights file is truncated")
+        magic, size, stages, scale, count = _HEADER.unpack(header)
+        if magic != PATTERN_MAGIC:
+            raise ValueError("Not a pattern weights file")
+        if stages != PATTERN_STAGES or scale != WEIGHT_SCALE or count != PATTERN_STAGES * STAGE_WEIGHTS:
+            raise ValueError("Pattern weights were written for a different layout")
+        if os.fstat(f.fileno()).st_size != _HEADER.size + count * 2:
+            raise ValueError("Pattern weights size does not match its weight count")
+        weights = array("h")
+        weights.fromfile(f, count)
+    if sys.byteorder == "big":
+        weights.byteswap()
+    return PatternEvaluator(size, weights, path)
+
+
+def write_patterns(path: str, size: int, weights: array) -> None:
+    """
+    写出权重文件，先写临时文件再替换。
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    data = array("h", weights)
+    if sys.byteorder == "big":
+        data.byteswap()
+    temp = path + ".tmp"
+    with open(temp, "wb") as f:
+        f.write(_HEADER.pack(PATTERN_MAGIC, size, PATTERN_STAGES, WEIGHT_SCALE, len(data)))
+        data.tofile(f)
+    os.replace(temp, path)
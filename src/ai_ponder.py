@@ -0,0 +1,138 @@
+"""
+ai3+ 的后台预想（pondering）：轮到人类思考时，AI 在后台线程里预先搜索对方的各个应着。
+
+- 先搜预测的应着（置换表中对方局面的最佳着法），再按静态位置分依次搜其余应着；
+  一轮搜完后深度加一再来一轮，直到 MAX_SEARCH_DEPTH 或被停下；
+- 每个搜完的应着按“应着后的规范局面键”（Board.canonical_key）保存结果，互为对称的应着只搜一次；
+  人类实际走出的着法若已预想过（或与预想过的着法对称），AI 把结果中的着法映射回实际棋盘后直接使用，
+  没预想到的着法至少也能用上置换表里已有的内容；
+- 与正式搜索共用该座位的置换表，整个预想算作一次搜索（不推进年代），正式搜索开始前必须先 stop()。
+
+用线程而不是进程：等待输入时主线程阻塞在 I/O 上，不占 GIL，后台线程能拿到几乎全部 CPU。
+"""
+
+from __future__ import annotations
+
+import random
+import threading
+from dataclasses import replace
+from typing import Dict, List, Optional, Tuple
+
+from src.ai_patterns import PatternEvaluator
+from src.ai_search import (
+    MAX_SEARCH_DEPTH,
+    OthelloSearch,
+    SearchLimits,
+    SearchResult,
+    index_to_move,
+    own_opp,
+    search_othello_move,
+)
+from src.ai_time import Deadline
+from src.ai_transposition import TranspositionTable
+from src.core.player import PlayerColor
+from src.rules.othello_bitboard import OthelloBoard, flip_mask
+
+
+class Ponderer:
+    """
+    一个人类待走局面上的预想：board 为人类行棋前的局面（调用方传入副本），
+    color 为 AI 执子方，limits 为该座位正式搜索的限制（预想时忽略其中的用时），patterns 为该座位的模式表评估。
+    """
+
+    def __init__(
+        self,
+        board: OthelloBoard,
+        color: PlayerColor,
+        limits: SearchLimits,
+        table: TranspositionTable,
+        patterns: Optional[PatternEvaluator] = None,
+    ):
+        self.board = board
+        self.color = color
+        self.opponent = color.opposite()
+        self.root_key = board.position_key(self.opponent)
+        self.limits = limits
+        self.table = table
+        self.patterns = patterns
+        # 应着后的规范局面键 -> (该局面下 AI 的搜索结果, 搜索时局面到规范朝向的变换)；只保存没被打断的搜索
+        self.results: Dict[int, Tuple[SearchResult, int]] = {}
+        self._rng = random.Random()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """
+        开始或继续预想（已有结果保留，继续从未完成的应着搜起）。
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="ponder", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def result_for(self, board: OthelloBoard) -> Optional[SearchResult]:
+        """
+        人类走完后的局面若已预想过（含对称的局面），返回 AI 在该局面下的搜索结果，着法已映射到 board 上。
+        """
+        key, transform = board.canonical_key(self.color)
+        known = self.results.get(key)
+        if known is None:
+            return None
+        result, searched = known
+        move = result.move
+        if move.is_pass or searched == transform:
+            return result
+        size = board.size
+        index = board.from_canonical(transform, board.to_canonical(searched, move.y * size + move.x))
+        move = index_to_move(index, size, self.color)
+        endgame = replace(result.endgame, move=move) if result.endgame is not None else None
+        return replace(result, move=move, endgame=endgame)
+
+    def _replies(self) -> List[int]:
+        own, opp = own_opp(self.board, self.opponent)
+        searcher = OthelloSearch(self.board.size, self.limits)
+        moves = searcher.root_moves(own, opp, self._rng)
+        white = 1 if self.opponent == PlayerColor.WHITE else 0
+        key, transform = searcher.table_key(own, opp, self.root_key, white)
+        entry = self.table.probe(key)
+        if entry is not None and entry[3] >= 0:
+            # 置换表里记录的对方最佳着法（规范朝向时先映射回来）就是最可能的应着，先搜它
+            predicted = searcher.tables.from_canonical[transform][entry[3]]
+            if predicted in moves:
+                moves.remove(predicted)
+                moves.insert(0, predicted)
+        return moves
+
+    def _run(self) -> None:
+        size = self.board.size
+        deadline = Deadline(stopped=self._stop.is_set)
+        depth = self.limits.depth
+        replies = self._replies()
+        while depth <= MAX_SEARCH_DEPTH and not self._stop.is_set():
+            heuristic = False  # 本轮是否还有没精确求解的应着
+            for index in replies:
+                child = self.board.clone()
+                own, opp = own_opp(child, self.opponent)
+                child.place(index, self.opponent, flip_mask(own, opp, index, size))
+                key, transform = child.canonical_key(self.color)
+                known = self.results.get(key)
+                if known is None or (known[0].endgame is None and known[0].depth < depth):
+                    limits = replace(self.limits, depth=depth, deadline=deadline)
+                    result = search_othello_move(
+                        child, self.color, limits, self._rng, self.table, new_search=False, patterns=self.patterns
+                    )
+                    if self._stop.is_set():
+                        return
+                    known = (result, transform)
+                    self.results[key] = known
+                heuristic = heuristic or known[0].endgame is None
+            if not heuristic or self.limits.nodes is not None:
+                return  # 全部应着都已精确求解，或受节点预算限制，加深没有意义
+            depth += 1
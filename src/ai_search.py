@@ -0,0 +1,475 @@
+"""
+黑白棋 ai3+：negamax + alpha-beta 搜索。
+
+- 迭代加深：从 1 层搜到目标深度，每层的最佳着法排到下一层最前；
+- 渴望窗口：以上一层分数为中心的窄窗口先搜，落到窗口外再用全窗口重搜；
+- 着法排序：杀手着法（每层两个）+ 历史启发 + 静态位置表；
+- 置换表：局面哈希随着法增量更新（与 Board.position_key 一致），
+  命中时复用深度足够的分数/边界，并把表中的最佳着法排到最前；
+  子数不超过 CANONICAL_DISCS 的开局节点改用对称规范化的键（与 Board.canonical_key 一致），
+  8 个对称像共用一个条目，表中着法按规范朝向存放、取出时映射回实际棋盘；
+- 限制：最大深度、节点预算或用时（ai_time.Deadline，也可随时取消）；
+  预算用完时返回最后一个完整深度的结果，若未完成的一层已证明了更好的着法则改用它；
+- 残局：空格数不超过 endgame 时改用 ai_endgame 精确求解（预算不够时退回启发式搜索）；
+- 评估：默认为手调的位置分 + 行动力差 + 子数差；传入 ai_patterns.PatternEvaluator 时改用模式表，
+  模式下标随着法增量更新（make 时加、unmake 时减）。
+
+搜索直接在 (own, opp) 两个位棋盘整数上进行，走法生成与翻转复用 othello_bitboard，
+不创建棋盘对象，8–18 的所有偶数尺寸通用。
+"""
+
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+from src.core.bitmask import iter_indices, popcount
+from src.core.board import BLACK, EMPTY, WHITE, Board
+from src.core.geometry import SYMMETRY_COUNT, geometry_for
+from src.core.move import Move
+from src.core.player import PlayerColor
+from src.core.zobrist import SIDE_TO_MOVE_KEY, symmetric_keys, zobrist_keys
+from src.ai_endgame import DEFAULT_ENDGAME_EMPTIES, EndgameAbort, EndgameResult, solve_othello
+from src.ai_patterns import PatternEvaluator
+from src.ai_time import CHECK_NODES, Deadline
+from src.ai_transposition import BOUND_EXACT, BOUND_LOWER, BOUND_UPPER, TableStats, TranspositionTable
+from src.rules.othello_bitboard import bitboards_of, flip_mask, legal_mask
+
+# 终局分：远大于任何启发式评分，再叠加最终子数差，保证“赢得多”优于“赢得少”
+WIN_SCORE = 1_000_000
+INFINITY = 10 * WIN_SCORE
+ASPIRATION_WINDOW = 60
+KILLER_BONUS = 1_000
+TT_MOVE_BONUS = 1_000_000
+MOBILITY_WEIGHT = 5
+# 座位等级：ai3 起为搜索型 AI，默认深度等于等级
+MIN_SEARCH_LEVEL = 3
+MAX_SEARCH_LEVEL = 9
+MAX_SEARCH_DEPTH = 20
+ENDGAME_TIME_SHARE = 0.5  # 限时下残局求解最多用掉剩余时间的一半，求不完还能退回启发式搜索
+# 对称的局面只在开局出现：子数不超过该值的节点才做规范化（每个节点要多算 8 个哈希）
+CANONICAL_DISCS = 12
+
+
+@dataclass
+class SearchLimits:
+    """
+    搜索限制：depth 为最大深度；nodes 为节点预算（None 表示不限）；
+    endgame 为改用精确求解的空格数阈值（0 表示不求解）；deadline 为用时与取消检查（None 表示不限）。
+    """
+
+    depth: int = 3
+    nodes: Optional[int] = None
+    endgame: int = DEFAULT_ENDGAME_EMPTIES
+    deadline: Optional[Deadline] = None
+
+
+@dataclass
+class SearchResult:
+    move: Move
+    score: int
+    depth: int  # 完整搜完的最大深度
+    nodes: int
+    table: Optional[TableStats] = None
+    endgame: Optional[EndgameResult] = None  # 精确求解时的胜负证明
+    workers: int = 1  # 并行搜索的工作进程数
+
+    def summary(self) -> str:
+        if self.endgame is not None:
+            return self.endgame.summary()
+        text = f"depth {self.depth}, {self.nodes} nodes, score {self.score}"
+        if self.table is not None:
+            text += f", {self.table.summary()}"
+        if self.workers > 1:
+            text += f", {self.workers} workers"
+        return text
+
+
+class SearchAbort(Exception):
+    """
+    节点预算或时间用完（或被取消），放弃当前迭代。
+    """
+
+
+@dataclass(frozen=True)
+class _Tables:
+    """
+    按尺寸缓存的评估与排序表（由 Geometry 的角、X/C 位与边线表派生）。
+    """
+
+    corners: int
+    edges: int  # 不含角
+    interior: int
+    corner_zones: Tuple[Tuple[int, int], ...]  # (角位, 该角的 X/C 位掩码)
+    weights: Tuple[int, ...]  # 静态位置分，用于着法排序
+    place_keys: Tuple[Tuple[int, ...], Tuple[int, ...]]  # (黑, 白) 每格的 Zobrist 键
+    toggle_keys: Tuple[int, ...]  # 黑白互换一格时哈希的变化（翻子用）
+    symmetric_keys: Tuple[Tuple[Tuple[int, ...], ...], ...]  # [编码][格][变换] 的 Zobrist 键
+    to_canonical: Tuple[Tuple[int, ...], ...]  # [变换][格]：实际格 -> 规范朝向
+    from_canonical: Tuple[Tuple[int, ...], ...]  # [变换][格]：规范朝向 -> 实际格
+
+
+@lru_cache(maxsize=None)
+def _tables_for(size: int) -> _Tables:
+    geometry = geometry_for(size)
+    corners = sum(1 << index for index in geometry.corners)
+    edges = sum(1 << index for index, edge in enumerate(geometry.is_edge) if edge) & ~corners
+    interior = geometry.full_mask & ~corners & ~edges
+    zones = tuple((1 << corner, sum(1 << cell for cell in danger)) for corner, danger in geometry.corner_zones)
+    danger_all = 0
+    for _, danger in zones:
+        danger_all |= danger
+    # 与 ai2 的位置权重一致：角 100，角旁危险区 -50，边 10，内部 1
+    weights = tuple(
+        100 if (corners >> i) & 1 else -50 if (danger_all >> i) & 1 else 10 if (edges >> i) & 1 else 1
+        for i in range(geometry.cell_count)
+    )
+    _, black_keys, white_keys = zobrist_keys(size)
+    toggles = tuple(b ^ w for b, w in zip(black_keys, white_keys))
+    inverse = tuple(geometry.symmetries[geometry.inverse_symmetries[t]] for t in range(SYMMETRY_COUNT))
+    return _Tables(
+        corners,
+        edges,
+        interior,
+        zones,
+        weights,
+        (black_keys, white_keys),
+        toggles,
+        symmetric_keys(size),
+        geometry.symmetries,
+        inverse,
+    )
+
+
+class OthelloSearch:
+    """
+    一次搜索的状态：节点计数、杀手着法与历史表（只在本次搜索内有效）。
+    """
+
+    def __init__(
+        self,
+        size: int,
+        limits: SearchLimits,
+        table: Optional[TranspositionTable] = None,
+        patterns: Optional[PatternEvaluator] = None,
+    ):
+        self.size = size
+        self.limits = limits
+        self.tables = _tables_for(size)
+        self.table = table
+        self.patterns = patterns
+        self.indices: List[int] = []  # 当前节点的模式下标（只在使用模式表时维护）
+        self.canonical_ply = 0  # 不超过该层数的节点子数不超过 CANONICAL_DISCS，置换表用规范键
+        self.deadline = limits.deadline
+        self.nodes = 0
+        self.partial: Optional[Tuple[int, int]] = None  # 当前迭代中已证明优于前面各着法的 (根着法, 分数)
+        self.killers: List[List[int]] = [[-1, -1] for _ in range(max(1, limits.depth) + 2)]
+        self.history = [0] * (size * size)
+
+    # --- 入口 ---
+
+    def search(
+        self, own: int, opp: int, key: int = 0, white: int = 0, rng: Optional[random.Random] = None
+    ) -> Tuple[Optional[int], int, int]:
+        """
+        返回 (最佳落子下标或 None 表示只能 pass, 分数, 完整搜完的深度)。
+        key 为根局面键（Board.position_key），white 表示行棋方是否为白方（0/1）。
+        """
+        moves = self.root_moves(own, opp, rng)
+        if not moves:
+            return None, self.evaluate(own, opp, white), 0
+
+        best_move, best_score, completed = moves[0], 0, 0
+        previous: Optional[int] = None
+        for depth in range(1, max(1, self.limits.depth) + 1):
+            try:
+                if previous is None:
+                    score, move = self.search_root(own, opp, key, white, moves, depth, -INFINITY, INFINITY)
+                else:
+                    alpha, beta = previous - ASPIRATION_WINDOW, previous + ASPIRATION_WINDOW
+                    score, move = self.search_root(own, opp, key, white, moves, depth, alpha, beta)
+                    if score <= alpha or score >= beta:
+                        score, move = self.search_root(own, opp, key, white, moves, depth, -INFINITY, INFINITY)
+            except SearchAbort:
+                if self.partial is not None:
+                    best_move, best_score = self.partial
+                break
+            best_move, best_score, completed, previous = move, score, depth, score
+            moves.remove(move)
+            moves.insert(0, move)
+            if abs(score) >= WIN_SCORE // 2:
+                break  # 已证明胜负，加深不会改变结论
+        return best_move, best_score, completed
+
+    # --- 搜索 ---
+
+    def search_root(
+        self, own: int, opp: int, key: int, white: int, moves: List[int], depth: int, alpha: int, beta: int
+    ) -> Tuple[int, int]:
+        self.partial = None
+        best_score, best_move = -INFINITY, moves[0]
+        for index in moves:
+            score = self.search_move(own, opp, key, white, index, depth, alpha, beta)
+            if score > best_score:
+                best_score, best_move = score, index
+                if alpha < score < beta:
+                    # 窗口内的分数是精确值，迭代中途被打断时它就是本层已知的最佳着法
+                    self.partial = (index, score)
+            if score > alpha:
+                alpha = score
+            if alpha >= beta:
+                break
+        return best_score, best_move
+
+    def search_move(self, own: int, opp: int, key: int, white: int, index: int, depth: int, alpha: int, beta: int) -> int:
+        """
+        在根局面走 index 后搜索 depth - 1 层，返回行棋方视角的分数（窗口外为边界值）。
+        """
+        flips = flip_mask(own, opp, index, self.size)
+        child = self._child_key(key, white, index, flips)
+        self.canonical_ply = CANONICAL_DISCS - popcount(own | opp)
+        own, opp = opp & ~flips, own | flips | (1 << index)
+        if self.patterns is not None:
+            # 每个根着法从头算一次模式下标，之后随着法增量更新
+            self.indices = self.patterns.indices(own, opp, white ^ 1)
+        return -self._negamax(own, opp, child, white ^ 1, depth - 1, -beta, -alpha, 1)
+
+    def root_moves(self, own: int, opp: int, rng: Optional[random.Random] = None) -> List[int]:
+        """
+        根节点着法：随机打乱后按静态位置分稳定排序，同分着法之间保留一点变化。
+        """
+        moves = list(iter_indices(legal_mask(own, opp, self.size)))
+        (rng or random.Random()).shuffle(moves)
+        weights = self.tables.weights
+        moves.sort(key=lambda index: weights[index], reverse=True)
+        return moves
+
+    def _negamax(self, own: int, opp: int, key: int, white: int, depth: int, alpha: int, beta: int, ply: int) -> int:
+        self.nodes += 1
+        if self.limits.nodes is not None and self.nodes > self.limits.nodes:
+            raise SearchAbort()
+        if self.deadline is not None and not self.nodes % CHECK_NODES and self.deadline.expired():
+            raise SearchAbort()
+        size = self.size
+        if depth <= 0:
+            if self.patterns is not None:
+                return self.patterns.score(self.indices, own, opp, white)
+            return self.evaluate(own, opp)
+
+        table = self.table
+        tt_move = -1
+        if table is not None:
+            tt_key, transform = self.table_key(own, opp, key, white) if ply <= self.canonical_ply else (key, 0)
+            entry = table.probe(tt_key)
+            if entry is not None:
+                entry_depth, bound, score, tt_move = entry
+                if transform and tt_move >= 0:
+                    tt_move = self.tables.from_canonical[transform][tt_move]
+                if entry_depth >= depth:
+                    if bound == BOUND_EXACT:
+                        return score
+                    if bound == BOUND_LOWER and score >= beta:
+                        return score
+                    if bound == BOUND_UPPER and score <= alpha:
+                        return score
+
+        mask = legal_mask(own, opp, size)
+        if not mask:
+            if not legal_mask(opp, own, size):
+                return self.final_score(own, opp)
+            # 被迫 pass：换对方走，深度照常递减
+            return -self._negamax(opp, own, key ^ SIDE_TO_MOVE_KEY, white ^ 1, depth - 1, -beta, -alpha, ply + 1)
+
+        original_alpha = alpha
+        best, best_move = -INFINITY, -1
+        patterns, indices = self.patterns, self.indices
+        for index in self._ordered(mask, ply, tt_move):
+            flips = flip_mask(own, opp, index, size)
+            # 叶子的子节点不查表，省去哈希更新
+            child = self._child_key(key, white, index, flips) if depth > 1 and table is not None else 0
+            if patterns is None:
+                score = -self._negamax(opp & ~flips, own | flips | (1 << index), child, white ^ 1, depth - 1, -beta, -alpha, ply + 1)
+            else:
+                patterns.play(indices, index, white, flips)
+                score = -self._negamax(opp & ~flips, own | flips | (1 << index), child, white ^ 1, depth - 1, -beta, -alpha, ply + 1)
+                patterns.undo(indices, index, white, flips)
+            if score > best:
+                best, best_move = score, index
+            if score > alpha:
+                alpha = score
+            if alpha >= beta:
+                self._record_cutoff(index, depth, ply)
+                break
+        if table is not None:
+            if best <= original_alpha:
+                bound = BOUND_UPPER
+            elif best >= beta:
+                bound = BOUND_LOWER
+            else:
+                bound = BOUND_EXACT
+            if transform and best_move >= 0:
+                best_move = self.tables.to_canonical[transform][best_move]
+            table.store(tt_key, depth, bound, best, best_move)
+        return best
+
+    def table_key(self, own: int, opp: int, key: int, white: int) -> Tuple[int, int]:
+        """
+        返回 (置换表键, 变换编号)：子数不超过 CANONICAL_DISCS 时为规范键及其变换，否则为 key 本身与 0。
+        """
+        if popcount(own | opp) > CANONICAL_DISCS:
+            return key, 0
+        keys = self.tables.symmetric_keys
+        black, white_bits = (opp, own) if white else (own, opp)
+        hashes = [0] * SYMMETRY_COUNT
+        for code, bits in ((BLACK, black), (WHITE, white_bits)):
+            cell_keys = keys[code]
+            while bits:
+                low = bits & -bits
+                for t, cell_key in enumerate(cell_keys[low.bit_length() - 1]):
+                    hashes[t] ^= cell_key
+                bits ^= low
+        low = min(hashes)
+        return low ^ (SIDE_TO_MOVE_KEY if white else 0), hashes.index(low)
+
+    def _child_key(self, key: int, white: int, index: int, flips: int) -> int:
+        tables = self.tables
+        key ^= SIDE_TO_MOVE_KEY ^ tables.place_keys[white][index]
+        toggles = tables.toggle_keys
+        while flips:
+            low = flips & -flips
+            key ^= toggles[low.bit_length() - 1]
+            flips ^= low
+        return key
+
+    def _ordered(self, mask: int, ply: int, tt_move: int = -1) -> List[int]:
+        killers = self.killers[ply]
+        history = self.history
+        weights = self.tables.weights
+        moves = list(iter_indices(mask))
+        moves.sort(
+            key=lambda index: history[index]
+            + weights[index]
+            + (KILLER_BONUS if index in killers else 0)
+            + (TT_MOVE_BONUS if index == tt_move else 0),
+            reverse=True,
+        )
+        return moves
+
+    def _record_cutoff(self, index: int, depth: int, ply: int) -> None:
+        killers = self.killers[ply]
+        if killers[0] != index:
+            killers[1] = killers[0]
+            killers[0] = index
+        self.history[index] += depth * depth
+
+    # --- 评估 ---
+
+    def evaluate(self, own: int, opp: int, white: int = 0) -> int:
+        """
+        从行棋方视角的启发式评分：位置分 + 行动力差 + 子数差；有模式表时改用模式表（white 为行棋方是否白方）。
+        """
+        if self.patterns is not None:
+            return self.patterns.evaluate(own, opp, white)
+        tables = self.tables
+        empty_corners_danger = 0
+        for corner, danger in tables.corner_zones:
+            if not (own | opp) & corner:
+                empty_corners_danger |= danger
+        score = self._positional(own, tables, empty_corners_danger) - self._positional(opp, tables, empty_corners_danger)
+        size = self.size
+        score += MOBILITY_WEIGHT * (popcount(legal_mask(own, opp, size)) - popcount(legal_mask(opp, own, size)))
+        score += popcount(own) - popcount(opp)
+        return score
+
+    @staticmethod
+    def _positional(bits: int, tables: _Tables, danger: int) -> int:
+        return (
+            100 * popcount(bits & tables.corners)
+            + 10 * popcount(bits & tables.edges & ~danger)
+            + popcount(bits & tables.interior & ~danger)
+            - 50 * popcount(bits & danger)
+        )
+
+    @staticmethod
+    def final_score(own: int, opp: int) -> int:
+        diff = popcount(own) - popcount(opp)
+        if diff > 0:
+            return WIN_SCORE + diff
+        if diff < 0:
+            return -WIN_SCORE + diff
+        return 0
+
+
+def limits_for_level(
+    level: int,
+    depth: Optional[int] = None,
+    nodes: Optional[int] = None,
+    endgame: Optional[int] = None,
+    deadline: Optional[Deadline] = None,
+) -> SearchLimits:
+    """
+    aiN（N >= 3）默认搜索 N 层；depth / nodes / endgame 可覆盖。
+    限时搜索（deadline 带截止时刻）未指定 depth 时放开到 MAX_SEARCH_DEPTH，由时间决定停在哪一层。
+    """
+    if endgame is None:
+        endgame = DEFAULT_ENDGAME_EMPTIES
+    if depth is None:
+        depth = MAX_SEARCH_DEPTH if deadline is not None and deadline.timed else level
+    return SearchLimits(depth=depth, nodes=nodes, endgame=endgame, deadline=deadline)
+
+
+def own_opp(board: Board, color: PlayerColor) -> Tuple[int, int]:
+    black, white = bitboards_of(board)
+    return (black, white) if color == PlayerColor.BLACK else (white, black)
+
+
+def index_to_move(index: Optional[int], size: int, color: PlayerColor) -> Move:
+    if index is None:
+        return Move.pass_move(color)
+    return Move(x=index % size, y=index // size, color=color)
+
+
+def solve_endgame(board: Board, color: PlayerColor, limits: SearchLimits) -> Optional[SearchResult]:
+    """
+    空格数在 limits.endgame 以内时精确求解；不适用或预算不够时返回 None。
+    """
+    empties = board.counts[EMPTY]
+    if not 0 < empties <= limits.endgame:
+        return None
+    deadline = limits.deadline.share(ENDGAME_TIME_SHARE) if limits.deadline is not None else None
+    try:
+        solved = solve_othello(board, color, limits.nodes, deadline)
+    except EndgameAbort:
+        return None
+    return SearchResult(move=solved.move, score=solved.score, depth=empties, nodes=solved.nodes, endgame=solved)
+
+
+def search_othello_move(
+    board: Board,
+    color: PlayerColor,
+    limits: SearchLimits,
+    rng: Optional[random.Random] = None,
+    table: Optional[TranspositionTable] = None,
+    new_search: bool = True,
+    patterns: Optional[PatternEvaluator] = None,
+) -> SearchResult:
+    """
+    在 board 上为 color 搜索一手棋；无合法落子时返回 pass。
+    table 为跨着法复用的置换表（None 表示不用置换表）；
+    new_search=False 时沿用置换表当前的年代（后台预想的多次搜索算作同一次，互不淘汰）；
+    patterns 为模式表评估（None 表示用手调的启发式评分）。
+    """
+    if table is not None and new_search:
+        table.new_search()
+    solved = solve_endgame(board, color, limits)
+    if solved is not None:
+        return solved
+    own, opp = own_opp(board, color)
+    searcher = OthelloSearch(board.size, limits, table, patterns)
+    is_white = 1 if color == PlayerColor.WHITE else 0
+    index, score, depth = searcher.search(own, opp, board.position_key(color), is_white, rng)
+    move = index_to_move(index, board.size, color)
+    stats = table.stats() if table is not None else None
+    return SearchResult(move=move, score=score, depth=depth, nodes=searcher.nodes, table=stats)
@@ -0,0 +1,133 @@
+"""
+AI 工作进程间共享的局面缓冲区（multiprocessing.shared_memory）。
+
+协调进程把待搜索的局面写进固定布局的共享内存槽位，工作进程按名字挂载后
+直接在内存视图上读局面、写结果；任务本身只传槽位号与着法等几个整数，不再 pickle 棋盘。
+多盘并发时每盘占一个槽位。槽位头里的停止标志由协调进程在到时或取消时置位，工作进程搜索中定期检查。
+
+布局（小端）：
+- 缓冲区头 8 字节：槽位数 u32、保留 4 字节；
+- 每个槽位：
+  - 槽位头 16 字节：代号 u32（每写入一次局面加一）、尺寸 u8、行棋方是否白方 u8、停止标志 u8、保留 1 字节、局面键 u64；
+  - 格子 MAX_CELLS 字节：与 Board.data 相同的编码（EMPTY/BLACK/WHITE），按行优先；
+  - 结果 MAX_CELLS 条，每条 12 字节：分数 i32、节点数 u32、状态 u8、填充 3 字节，按根着法下标存放。
+"""
+
+from __future__ import annotations
+
+import struct
+from multiprocessing import shared_memory
+from typing import List, Optional, Tuple
+
+MAX_CELLS = 19 * 19
+DEFAULT_SLOTS = 4
+
+RESULT_PENDING = 0
+RESULT_DONE = 1
+RESULT_ABORTED = 2
+
+_BUFFER_HEADER = struct.Struct("<I4x")
+_SLOT_HEADER = struct.Struct("<IBBBxQ")
+_STOP_OFFSET = 6
+_RESULT = struct.Struct("<iIB3x")
+_CELLS_OFFSET = _SLOT_HEADER.size
+_RESULTS_OFFSET = _CELLS_OFFSET + MAX_CELLS + (-MAX_CELLS % 8)
+SLOT_BYTES = _RESULTS_OFFSET + MAX_CELLS * _RESULT.size
+
+
+class PositionBuffer:
+    """
+    固定槽位数的共享局面缓冲区；create 由协调进程创建（负责 unlink），attach 由工作进程挂载。
+    """
+
+    def __init__(self, memory: shared_memory.SharedMemory, owner: bool):
+        self._memory = memory
+        self._owner = owner
+        self.buf = memory.buf
+        self.slots = _BUFFER_HEADER.unpack_from(self.buf, 0)[0]
+        self._free: List[int] = list(range(self.slots)) if owner else []
+
+    @classmethod
+    def create(cls, slots: int = DEFAULT_SLOTS) -> "PositionBuffer":
+        memory = shared_memory.SharedMemory(create=True, size=_BUFFER_HEADER.size + slots * SLOT_BYTES)
+        _BUFFER_HEADER.pack_into(memory.buf, 0, slots)
+        return cls(memory, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> "PositionBuffer":
+        return cls(shared_memory.SharedMemory(name=name), owner=False)
+
+    @property
+    def name(self) -> str:
+        return self._memory.name
+
+    def close(self) -> None:
+        self.buf = None
+        self._memory.close()
+        if self._owner:
+            self._memory.unlink()
+
+    # --- 槽位分配（只在协调进程中使用） ---
+
+    def allocate(self) -> Optional[int]:
+        return self._free.pop(0) if self._free else None
+
+    def release(self, slot: int) -> None:
+        if slot not in self._free:
+            self._free.append(slot)
+
+    # --- 局面 ---
+
+    def write_position(self, slot: int, cells: bytes, size: int, white: int, key: int) -> int:
+        """
+        写入局面、清空结果区与停止标志，返回新的代号（工作进程据此识别过期任务）。
+        """
+        base = self._base(slot)
+        generation = (_SLOT_HEADER.unpack_from(self.buf, base)[0] + 1) & 0xFFFFFFFF
+        count = size * size
+        self.buf[base + _CELLS_OFFSET : base + _CELLS_OFFSET + count] = cells
+        results = base + _RESULTS_OFFSET
+        self.buf[results : results + count * _RESULT.size] = bytes(count * _RESULT.size)
+        _SLOT_HEADER.pack_into(self.buf, base, generation, size, white, 0, key)
+        return generation
+
+    def read_header(self, slot: int) -> Tuple[int, int, int, int]:
+        """
+        返回 (代号, 尺寸, 行棋方是否白方, 局面键)。
+        """
+        generation, size, white, _, key = _SLOT_HEADER.unpack_from(self.buf, self._base(slot))
+        return generation, size, white, key
+
+    def stop(self, slot: int) -> None:
+        """
+        通知该槽位上的所有任务尽快放弃搜索。
+        """
+        self.buf[self._base(slot) + _STOP_OFFSET] = 1
+
+    def stopped(self, slot: int) -> bool:
+        return self.buf[self._base(slot) + _STOP_OFFSET] != 0
+
+    def cells(self, slot: int) -> memoryview:
+        """
+        槽位中局面格子的零拷贝视图。
+        """
+        base = self._base(slot)
+        size = _SLOT_HEADER.unpack_from(self.buf, base)[1]
+        return self.buf[base + _CELLS_OFFSET : base + _CELLS_OFFSET + size * size]
+
+    # --- 结果 ---
+
+    def write_result(self, slot: int, index: int, score: int, nodes: int, status: int) -> None:
+        _RESULT.pack_into(self.buf, self._base(slot) + _RESULTS_OFFSET + index * _RESULT.size, score, nodes, status)
+
+    def read_result(self, slot: int, index: int) -> Tuple[int, int, int]:
+        """
+        返回 (状态, 分数, 节点数)。
+        """
+        score, nodes, status = _RESULT.unpack_from(self.buf, self._base(slot) + _RESULTS_OFFSET + index * _RESULT.size)
+        return status, score, nodes
+
+    def _base(self, slot: int) -> int:
+        if not 0 <= slot < self.slots:
+            raise IndexError(f"Position buffer slot out of range: {slot}")
+        return _BUFFER_HEADER.size + slot * SLOT_BYTES
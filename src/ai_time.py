@@ -0,0 +1,59 @@
+"""
+ai3+ 的用时控制：每步固定毫秒数，或总时钟加每步加秒，统一用 time.monotonic 计时。
+
+- Deadline：一次搜索的截止时刻与取消检查；搜索每隔 CHECK_NODES 个节点问一次是否该停，
+  到点或被取消时放弃当前迭代，返回已有的最佳着法；
+- move_budget_ms：时钟模式下按剩余时间、加秒与剩余空格估算本步可用的时间。
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Callable, Optional
+
+CHECK_NODES = 256  # 每隔多少节点检查一次时间与取消标志（2 的幂）
+MAX_TIME_MS = 3_600_000  # 座位参数 time / clock / inc 的上限（一小时）
+MIN_MOVE_MS = 10  # 时钟快用完时每步至少给的时间
+CLOCK_RESERVE_MS = 50  # 时钟模式下每步都留出的余量
+MIN_MOVES_TO_GO = 4  # 估算剩余步数的下限，避免最后几步把时钟一次花光
+
+
+class Deadline:
+    """
+    截止时刻（time.monotonic 秒，None 表示不限时）与可选的取消检查 stopped()。
+    """
+
+    def __init__(self, at: Optional[float] = None, stopped: Optional[Callable[[], bool]] = None):
+        self.at = at
+        self.stopped = stopped
+
+    @classmethod
+    def after_ms(cls, ms: Optional[int], stopped: Optional[Callable[[], bool]] = None) -> "Deadline":
+        return cls(time.monotonic() + ms / 1000 if ms else None, stopped)
+
+    @property
+    def timed(self) -> bool:
+        return self.at is not None
+
+    def expired(self) -> bool:
+        if self.stopped is not None and self.stopped():
+            return True
+        return self.at is not None and time.monotonic() >= self.at
+
+    def share(self, fraction: float) -> "Deadline":
+        """
+        剩余时间的一部分（如残局求解先用一半，失败后启发式搜索还有时间）；取消检查不变。
+        """
+        if self.at is None:
+            return self
+        now = time.monotonic()
+        return Deadline(now + max(0.0, self.at - now) * fraction, self.stopped)
+
+
+def move_budget_ms(remaining_ms: float, increment_ms: int, empties: int) -> int:
+    """
+    时钟模式的单步预算：剩余时间按估算的剩余步数（空格数的一半）平分，再加上本步的加秒。
+    """
+    moves_to_go = max(MIN_MOVES_TO_GO, (empties + 1) // 2)
+    budget = min(remaining_ms / moves_to_go + increment_ms, remaining_ms - CLOCK_RESERVE_MS)
+    return max(MIN_MOVE_MS, int(budget))
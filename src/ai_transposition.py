@@ -0,0 +1,154 @@
+"""
+搜索用置换表：固定容量、按局面哈希寻址，内存上限以 MB 配置。
+
+每个槽位占两个 64 位整数（array('Q')）：
+- keys[i]：完整局面哈希（校验用，0 表示空槽）；
+- infos[i]：打包的 深度(8) | 边界类型(2) | 年代(6) | 最佳着法+1(16) | 分数+偏移(32)。
+
+替换策略：
+- depth：单槽，新条目深度不低于旧条目、或旧条目来自更早的搜索时替换；
+- two-tier：两槽一桶，第 0 槽按深度优先保留，第 1 槽总是替换。
+"""
+
+from __future__ import annotations
+
+from array import array
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+BOUND_EXACT = 0
+BOUND_LOWER = 1  # 分数至少为 score（发生 beta 截断）
+BOUND_UPPER = 2  # 分数至多为 score（所有着法都没超过 alpha）
+
+POLICY_DEPTH = "depth"
+POLICY_TWO_TIER = "two-tier"
+POLICIES = (POLICY_DEPTH, POLICY_TWO_TIER)
+
+DEFAULT_TT_MB = 16
+MAX_TT_MB = 1024
+ENTRY_BYTES = 16  # 键 + 打包信息，各 8 字节
+
+_SCORE_OFFSET = 1 << 31
+_SCORE_MASK = (1 << 32) - 1
+_AGE_MASK = 0x3F
+
+
+@dataclass
+class TableStats:
+    """
+    单次搜索的置换表统计。
+    """
+
+    probes: int
+    hits: int
+    stores: int
+    used: int
+    capacity: int
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.probes if self.probes else 0.0
+
+    @property
+    def fill(self) -> float:
+        return self.used / self.capacity if self.capacity else 0.0
+
+    def summary(self) -> str:
+        return f"tt hit {self.hit_rate:.0%}, fill {self.fill:.2%}"
+
+
+class TranspositionTable:
+    """
+    固定容量置换表；容量为不超过内存上限的 2 的幂，按哈希低位寻址。
+    """
+
+    def __init__(self, megabytes: float = DEFAULT_TT_MB, policy: str = POLICY_TWO_TIER):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown replacement policy: {policy}")
+        if megabytes <= 0:
+            raise ValueError("Transposition table size must be positive")
+        slots = max(2, int(megabytes * 1024 * 1024) // ENTRY_BYTES)
+        capacity = 1 << (slots.bit_length() - 1)
+        self.megabytes = megabytes
+        self.policy = policy
+        self.capacity = capacity
+        # two-tier 按桶（两槽）寻址，掩码作用在桶号上
+        self._mask = (capacity >> 1) - 1 if policy == POLICY_TWO_TIER else capacity - 1
+        self.keys = array("Q", bytes(8 * capacity))
+        self.infos = array("Q", bytes(8 * capacity))
+        self.used = 0
+        self.age = 0
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+
+    def new_search(self) -> None:
+        """
+        开始新一次搜索：年代加一（旧条目优先被替换），清零本次统计。
+        """
+        self.age = (self.age + 1) & _AGE_MASK
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+
+    def clear(self) -> None:
+        self.keys = array("Q", bytes(8 * self.capacity))
+        self.infos = array("Q", bytes(8 * self.capacity))
+        self.used = 0
+
+    def probe(self, key: int) -> Optional[Tuple[int, int, int, int]]:
+        """
+        查找 key，命中返回 (深度, 边界类型, 分数, 最佳着法下标或 -1)。
+        """
+        self.probes += 1
+        key = key or 1  # 0 表示空槽
+        keys = self.keys
+        if self.policy == POLICY_TWO_TIER:
+            slot = (key & self._mask) << 1
+            if keys[slot] != key:
+                slot += 1
+                if keys[slot] != key:
+                    return None
+        else:
+            slot = key & self._mask
+            if keys[slot] != key:
+                return None
+        self.hits += 1
+        info = self.infos[slot]
+        return (
+            info >> 56,
+            (info >> 54) & 0x3,
+            (info & _SCORE_MASK) - _SCORE_OFFSET,
+            ((info >> 32) & 0xFFFF) - 1,
+        )
+
+    def store(self, key: int, depth: int, bound: int, score: int, move: int) -> None:
+        key = key or 1
+        keys = self.keys
+        infos = self.infos
+        if self.policy == POLICY_TWO_TIER:
+            slot = (key & self._mask) << 1
+            # 第 0 槽：同一局面、更深或来自旧搜索时替换；否则落到总是替换的第 1 槽
+            if keys[slot] != key and keys[slot] and not self._replaceable(infos[slot], depth):
+                slot += 1
+        else:
+            slot = key & self._mask
+            if keys[slot] != key and keys[slot] and not self._replaceable(infos[slot], depth):
+                return
+        if not keys[slot]:
+            self.used += 1
+        self.stores += 1
+        keys[slot] = key
+        infos[slot] = (
+            (min(depth, 0xFF) << 56)
+            | (bound << 54)
+            | (self.age << 48)
+            | ((move + 1) << 32)
+            | (score + _SCORE_OFFSET)
+        )
+
+    def stats(self) -> TableStats:
+        return TableStats(self.probes, self.hits, self.stores, self.used, self.capacity)
+
+    def _replaceable(self, info: int, depth: int) -> bool:
+        return (info >> 48) & _AGE_MASK != self.age or depth >= info >> 56
@@ -1,11 +1,29 @@
 import os
 import random
+import threading
+import time
 from datetime import datetime, timezone
 from getpass import getpass
-from typing import Callable, Optional
+from typing import Callable, Dict, Optional, Tuple
 from src.accounts import AccountManager
 from src.command_parser import Command
 from src.ai_othello import choose_othello_move
+from src.ai_endgame import DEFAULT_ENDGAME_EMPTIES, MAX_SOLVE_EMPTIES, EndgameAbort, solve_othello
+from src.opening_book import GAME_CODES, OpeningBook, default_book_path
+from src.ai_transposition import DEFAULT_TT_MB, MAX_TT_MB, TranspositionTable
+from src.ai_parallel import MAX_WORKERS, parallel_search_othello_move
+from src.ai_time import MAX_TIME_MS, Deadline, move_budget_ms
+from src.ai_patterns import PatternEvaluator, default_pattern_path, load_patterns
+from src.ai_ponder import Ponderer
+from src.ai_search import (
+    MAX_SEARCH_DEPTH,
+    MAX_SEARCH_LEVEL,
+    MIN_SEARCH_LEVEL,
+    SearchResult,
+    limits_for_level,
+    search_othello_move,
+)
+from src.core.board import EMPTY
 from src.core.move import Move
 from src.core.player import PlayerColor
 from src.game.factory import GameFactory
@@ -13,12 +31,16 @@ from src.game.base_game import Game
 from src.game.go_game import GoGame
 from src.game.gomoku_game import GomokuGame
 from src.game.othello_game import OthelloGame
+from src.rules.othello_bitboard import OthelloBoard
 from src.renderer import CliRenderer
 from src.replay import ReplaySession
 from src.seat import Seat
 from src.serializer import JsonSerializer
 
 
+BOOK_LIST_LIMIT = 8
+
+
 class Controller:
     """
     协调命令解析、游戏逻辑与渲染。
@@ -28,6 +50,7 @@ class Controller:
         self,
         renderer: Optional[CliRenderer] = None,
         password_prompt: Optional[Callable[[str], Optional[str]]] = None,
+        poll: Optional[Callable[[], None]] = None,
     ):
         self.renderer = renderer or CliRenderer()
         self.game: Optional[Game] = None
@@ -40,6 +63,23 @@ class Controller:
             PlayerColor.WHITE: Seat(kind="human"),
         }
         self._rng = random.Random()
+        # 已打开的开局库（按游戏与尺寸；None 表示没有库文件）
+        self._books: Dict[Tuple[str, int], Optional[OpeningBook]] = {}
+        # 已载入的模式表权重（按尺寸；None 表示没有权重文件）
+        self._patterns: Dict[int, Optional[PatternEvaluator]] = {}
+        # ai3+ 的置换表：按执子方各一张，跨着法复用，座位的内存上限变化时重建
+        self._search_tables: Dict[PlayerColor, TranspositionTable] = {}
+        # 时钟模式下各方剩余的毫秒数（首次走棋时按座位的 clock 初始化，开局/读档/换座位时清空）
+        self._clocks: Dict[PlayerColor, float] = {}
+        # AI 思考中可被 cancel_thinking 打断（CLI 的 Ctrl+C、GUI 的停止按钮）；
+        # poll 在思考期间被定期调用，GUI 借此处理界面事件
+        self.thinking = False
+        self._cancel = threading.Event()
+        self._poll = poll
+        # 人类思考时 AI 的后台预想（座位开启 ponder 时），处理下一条命令前先停下
+        self._ponder: Optional[Ponderer] = None
+        # 限时座位上一次搜索达到的深度：预想结果至少这么深时直接使用，不再等满用时
+        self._reached: Dict[PlayerColor, int] = {}
         self.accounts = AccountManager()
         self._last_ended_state: bool = False
         self._applied_account_deltas: list[tuple[str, int, int]] = []
@@ -48,7 +88,16 @@ class Controller:
     def handle(self, cmd: Command) -> bool:
         """
         处理命令。返回 False 表示退出循环。
+        命令处理期间暂停后台预想，处理完若又轮到人类思考再继续。
         """
+        if self._ponder is not None:
+            self._ponder.stop()
+        running = self._dispatch(cmd)
+        if running:
+            self._start_pondering()
+        return running
+
+    def _dispatch(self, cmd: Command) -> bool:
         name = cmd.name
         args = cmd.args
 
@@ -126,6 +175,22 @@ class Controller:
             self._handle_moves()
             return True
 
+        if name == "ko":
+            self._handle_ko(args)
+            return True
+
+        if name == "score":
+            self._handle_score()
+            return True
+
+        if name == "solve":
+            self._handle_solve()
+            return True
+
+        if name == "book":
+            self._handle_book()
+            return True
+
         if name == "play" and len(args) == 2:
             if self._is_ai_turn():
                 side = "black" if self.game.to_move == PlayerColor.BLACK else "white"
@@ -177,6 +242,13 @@ class Controller:
             self._auto_advance()
             return True
 
+        if name == "redo":
+            result = self.game.redo()
+            self._render(self._decorate_result_message(result.message))
+            self._after_state_change()
+            self._auto_advance()
+            return True
+
         if name == "resign":
             result = self.game.resign()
             self._render(result.message)
@@ -244,12 +316,29 @@ class Controller:
                         "Enable AI:",
                         "  seat black|white ai1",
                         "  seat black|white ai2",
+                        "  seat black|white ai3 [depth N] [nodes N] [tt MB] [endgame N] [book on|off] [patterns on|off] [workers N]   # ai3..ai9: alpha-beta search",
+                        "  seat black|white ai5 time MS | clock MS [inc MS]   # time controls for ai3+",
                         "  seat black|white human   # take over from AI",
                         "",
                         "Behavior:",
                         "  - AI moves automatically on its turns (supports Human-AI and AI-AI).",
                         "  - ai1: random legal move",
                         "  - ai2: simple heuristic (usually beats ai1)",
+                        "  - aiN (N>=3): alpha-beta search, N plies deep by default (usually beats ai2)",
+                        "    depth N overrides the depth; nodes N caps the nodes searched per move",
+                        "    tt MB sets the transposition table size (default 16 MB)",
+                        "    book on|off: play from books/othello_<size>.book while the position is in it (default on)",
+                        "    patterns on|off: evaluate with pattern weights from weights/othello_<size>.pat when present",
+                        "      (default on; train with python3 -m src.ai_pattern_train --size 8 --self-play 2000)",
+                        "    workers N: opt-in parallel root-split search on N processes (default 1 = off)",
+                        "    endgame N: solve exactly once N or fewer empties remain (default 10, 0 = off)",
+                        "    time MS: search MS milliseconds per move (depth is then open-ended unless 'depth N' is given)",
+                        "    clock MS [inc MS]: total time per game plus an increment per move; the AI splits it over the",
+                        "      remaining empties (no loss on time; the clock restarts with start/load or a new seat)",
+                        "    Ctrl+C (CLI) or Stop AI (GUI) while the AI thinks: it plays the best move found so far",
+                        "    ponder on: while you think, the AI searches your likely replies in the background and",
+                        "      answers at once if you play one of them (default off)",
+                        "    each AI move reports depth reached, nodes searched and table hit rate/fill",
                         "",
                         "Tips:",
                         "  - Use 'moves' to see legal moves as '*' on the board.",
@@ -294,7 +383,9 @@ class Controller:
                         "",
                         "Useful commands:",
                         "  moves                  # shows legal moves as '*' on the board",
-                        "  seat black|white ai1|ai2|human",
+                        "  solve                  # exact win/loss/draw proof once <= 14 empties remain",
+                        "  book                   # opening book moves for this position (books/othello_<size>.book)",
+                        "  seat black|white ai1|ai2|ai3..ai9|human",
                     ]
                 )
             )
@@ -319,15 +410,20 @@ class Controller:
                     "  start othello [size]       # even size 8-18, default 8",
                     "",
                     "Play:",
-                    "  play x y | undo | resign | restart [size]",
+                    "  play x y | undo | redo | resign | restart [size]",
                     "  pass                       # go only (othello uses forced pass)",
+                    "  moves                      # all games: show legal moves as '*'",
+                    "  ko [none|simple|superko]   # go only: show/set ko rule (default simple)",
+                    "  score                      # go only: live area score (stones + territory)",
+                    "  solve                      # othello only: exact endgame result (<= 14 empties)",
+                    "  book                       # othello/gomoku: opening book moves and stats",
                     "",
                     "Accounts (all games):",
                     "  register/login/logout black|white <username>   # password is not echoed",
                     "  who",
                     "",
                     "AI (Othello only):",
-                    "  seat black|white human|ai1|ai2",
+                    "  seat black|white human|ai1|ai2|ai3..ai9 [depth N] [nodes N] [tt MB] [endgame N] [book on|off] [patterns on|off] [workers N]",
                     "",
                     "Replay:",
                     "  save name | load [name] | replay [name]",
@@ -343,8 +439,9 @@ class Controller:
         )
 
     def _handle_seat(self, args):
-        if len(args) != 2:
-            self._render("Usage: seat black|white human|ai1|ai2")
+        usage = "Usage: seat black|white human|ai1|ai2|ai3..ai9 [depth N] [nodes N] [tt MB] [endgame N] [book on|off] [patterns on|off] [workers N] [time MS | clock MS [inc MS]] [ponder on|off]"
+        if len(args) < 2:
+            self._render(usage)
             return
         side_raw, kind_raw = args[0].lower(), args[1].lower()
         color = self._parse_side(side_raw)
@@ -356,15 +453,53 @@ class Controller:
         if kind_raw == "human":
             current = self.seats[color]
             self.seats[color] = Seat(kind="human", username=current.username)
+            self._clocks.pop(color, None)
+            self._reached.pop(color, None)
             lines = [f"{color.name} set to human"]
             if self.game and self.game.name == "othello":
-                lines.append("Tip: enable AI: seat black|white ai1|ai2")
+                lines.append("Tip: enable AI: seat black|white ai1|ai2|ai3")
             self._render("\n".join(lines))
             return
-        if kind_raw in ("ai1", "ai2"):
-            level = 1 if kind_raw == "ai1" else 2
-            self.seats[color] = Seat(kind="ai", ai_level=level, username=None)
+        level = self._parse_ai_level(kind_raw)
+        if level is not None:
+            # depth / nodes 只对搜索型 AI（ai3+）有意义
+            limits = self._parse_search_limits(args[2:])
+            if limits is None or (limits and level < MIN_SEARCH_LEVEL):
+                self._render(usage)
+                return
+            seat = Seat(kind="ai", ai_level=level, username=None, **limits)
+            if seat.ai_patterns != self.seats[color].ai_patterns:
+                # 两种评估的分数量纲不同，置换表里的旧分数不能再用
+                self._search_tables.pop(color, None)
+            self.seats[color] = seat
+            self._clocks.pop(color, None)
+            self._reached.pop(color, None)
             lines = [f"{color.name} set to AI{level}"]
+            if level >= MIN_SEARCH_LEVEL:
+                depth = limits.get("ai_depth") or level
+                nodes = limits.get("ai_nodes")
+                tt_mb = limits.get("ai_tt_mb") or DEFAULT_TT_MB
+                endgame = limits.get("ai_endgame", DEFAULT_ENDGAME_EMPTIES)
+                workers = limits.get("ai_workers", 1)
+                move_ms = limits.get("ai_time_ms")
+                clock_ms = limits.get("ai_clock_ms")
+                if (move_ms or clock_ms) and not limits.get("ai_depth"):
+                    depth = MAX_SEARCH_DEPTH
+                if move_ms:
+                    timing = f", {move_ms} ms per move"
+                elif clock_ms:
+                    timing = f", clock {clock_ms} ms + {limits.get('ai_increment_ms') or 0} ms"
+                else:
+                    timing = ""
+                lines[0] += (
+                    f" (alpha-beta, depth {depth}"
+                    + (f", {nodes} nodes max" if nodes else "")
+                    + timing
+                    + f", tt {tt_mb} MB, exact at <= {endgame} empties"
+                    + (", patterns off" if limits.get("ai_patterns") is False else "")
+                    + (f", {workers} workers" if workers > 1 else "")
+                    + (", ponders on your time)" if limits.get("ai_ponder") else ")")
+                )
             if not self.game:
                 lines.append("Tip: start othello 8 to play with AI (AI is Othello-only)")
             elif self.game.name != "othello":
@@ -376,7 +511,57 @@ class Controller:
             self._render("\n".join(lines))
             return
 
-        self._render("Seat failed: kind must be human|ai1|ai2")
+        self._render(f"Seat failed: kind must be human|ai1..ai{MAX_SEARCH_LEVEL}")
+
+    def _parse_ai_level(self, raw: str) -> Optional[int]:
+        if not raw.startswith("ai") or not raw[2:].isdigit():
+            return None
+        level = int(raw[2:])
+        if 1 <= level <= MAX_SEARCH_LEVEL:
+            return level
+        return None
+
+    def _parse_search_limits(self, args) -> Optional[dict]:
+        """
+        解析 ai3+ 的可选参数：depth N / nodes N / tt MB / endgame N / book on|off / patterns on|off / workers N /
+        time MS（每步固定用时）/ clock MS [inc MS]（总时钟与每步加秒）/ ponder on|off，返回 Seat 字段；格式错误返回 None。
+        """
+        if len(args) % 2:
+            return None
+        limits: dict = {}
+        for key, value in zip(args[::2], args[1::2]):
+            key = key.lower()
+            if key in ("book", "patterns", "ponder") and value.lower() in ("on", "off"):
+                limits["ai_" + key] = value.lower() == "on"
+                continue
+            if key not in ("depth", "nodes", "tt", "endgame", "workers", "time", "clock", "inc") or not value.isdigit():
+                return None
+            if key == "endgame":
+                # endgame 0 关闭精确求解
+                if int(value) > MAX_SOLVE_EMPTIES:
+                    return None
+                limits["ai_endgame"] = int(value)
+                continue
+            if int(value) <= 0:
+                return None
+            if key == "depth" and int(value) > MAX_SEARCH_DEPTH:
+                return None
+            if key == "tt" and int(value) > MAX_TT_MB:
+                return None
+            if key == "workers" and int(value) > MAX_WORKERS:
+                return None
+            if key in ("time", "clock", "inc"):
+                if int(value) > MAX_TIME_MS:
+                    return None
+                limits[{"time": "ai_time_ms", "clock": "ai_clock_ms", "inc": "ai_increment_ms"}[key]] = int(value)
+                continue
+            limits["ai_tt_mb" if key == "tt" else "ai_" + key] = int(value)
+        # 每步固定用时与时钟二选一；加秒只跟时钟一起用
+        if "ai_time_ms" in limits and "ai_clock_ms" in limits:
+            return None
+        if "ai_increment_ms" in limits and "ai_clock_ms" not in limits:
+            return None
+        return limits
 
     def _decorate_result_message(self, message: str) -> str:
         """
@@ -515,6 +700,7 @@ class Controller:
             lines.append("Tip: save name  (then)  replay [name]")
             self._render("\n".join(lines))
             self._reset_end_tracking()
+            self._clocks.clear()
         except Exception as e:
             self._render(f"Start failed: {e}")
 
@@ -562,6 +748,7 @@ class Controller:
                 suffix = ""
             self._render(f"Loaded {game_type} from {path}{suffix}")
             self._reset_end_tracking()
+            self._clocks.clear()
         except Exception as e:
             self._render(f"Load failed: {e}")
 
@@ -588,20 +775,93 @@ class Controller:
             if message:
                 print(message)
 
-    def _handle_moves(self) -> None:
-        # 仅 Othello 支持“合法落子点”提示
-        if not self.game or self.game.name != "othello":
-            self._render("Legal moves visualization is only available in Othello")
+    def _handle_ko(self, args) -> None:
+        if not isinstance(self.game, GoGame):
+            self._render("Ko rule is only available in Go")
             return
-        engine = self.game.rule_engine
-        if not hasattr(engine, "legal_moves"):
-            self._render("Legal moves not available")
+        if not args:
+            self._render(f"Ko rule: {self.game.ko_rule}  (usage: ko none|simple|superko)")
+            return
+        try:
+            self.game.set_ko_rule(args[0].lower())
+        except ValueError as e:
+            self._render(f"{e}. Usage: ko none|simple|superko")
+            return
+        self._render(f"Ko rule set to {self.game.ko_rule}")
+
+    def _handle_score(self) -> None:
+        if not isinstance(self.game, GoGame):
+            self._render("Live score is only available in Go")
+            return
+        black, white = self.game.rule_engine.score(self.game.board)
+        if black == white:
+            lead = "even"
+        else:
+            lead = f"{'Black' if black > white else 'White'} leads by {abs(black - white)}"
+        self._render(f"Score (area): Black {black} vs White {white}  ({lead})")
+
+    def _handle_solve(self) -> None:
+        # 残局分析：只读求解当前局面，不落子
+        if self.game.name != "othello":
+            self._render("Solve is only available in Othello")
+            return
+        if self.game.ended:
+            self._render("Game is over; nothing to solve")
+            return
+        empties = self.game.board.counts[EMPTY]
+        if empties > MAX_SOLVE_EMPTIES:
+            self._render(f"Solve: {empties} empties left; exact solving needs at most {MAX_SOLVE_EMPTIES}")
+            return
+        color = self.game.to_move
+        # 与 AI 思考相同：求解期间 Ctrl+C（GUI 为停止）经 cancel_thinking 取消
+        self._cancel.clear()
+        self.thinking = True
+        try:
+            result = solve_othello(self.game.board, color, deadline=Deadline(stopped=self._should_stop))
+        except EndgameAbort:
+            self._render("Solve cancelled")
+            return
+        finally:
+            self.thinking = False
+        if result.score == 0:
+            proof = "perfect play ends in a draw"
+        else:
+            winner = color if result.score > 0 else color.opposite()
+            proof = f"{winner.name} wins by {abs(result.score)} with perfect play"
+        if result.move.is_pass:
+            best = "pass"
+        else:
+            best = f"({result.move.x},{result.move.y})"
+        self._render(f"Solve ({color.name} to move): {proof}; best move {best}  [{result.summary()}]")
+
+    def _handle_book(self) -> None:
+        if self.game.name not in GAME_CODES:
+            self._render("Opening books are available for Othello and Gomoku")
+            return
+        path = default_book_path(self.game.name, self.game.board.size)
+        book = self._opening_book()
+        if book is None:
+            self._render(
+                f"No opening book at {path}\n"
+                f"Build one: python3 -m src.opening_book --game {self.game.name} --size {self.game.board.size} --saves saves"
+            )
+            return
+        moves = book.lookup(self.game)
+        if not moves:
+            self._render(f"Book ({len(book)} entries): position not in book")
+            return
+        lines = [f"Book ({len(book)} entries): {len(moves)} move(s) for {self.game.to_move.name}"]
+        lines.extend(f"  {move.summary()}" for move in moves[:BOOK_LIST_LIMIT])
+        self._render("\n".join(lines))
+
+    def _handle_moves(self) -> None:
+        # 合法点由各规则引擎的 legal_move_mask 整盘计算，三种棋都可用
+        if not self.game:
             return
-        legal = engine.legal_moves(self.game.board, self.game.to_move)  # type: ignore[attr-defined]
         snapshot = self.game.get_snapshot()
         snapshot["players"] = self._players_snapshot()
-        snapshot["legal_moves"] = legal
         snapshot["show_legal_moves"] = True
+        legal = snapshot["legal_moves"]
         self.renderer.render(
             snapshot,
             "\n".join(
@@ -687,16 +947,14 @@ class Controller:
             return
 
         while self.game and not self.game.ended:
-            # 1) Othello forced pass（人类与 AI 都一样处理）
+            # 1) Othello forced pass（人类与 AI 都一样处理；只需判断“是否存在”合法点）
             if self.game.name == "othello":
                 engine = self.game.rule_engine
-                if hasattr(engine, "legal_moves"):
-                    legal = engine.legal_moves(self.game.board, self.game.to_move)  # type: ignore[attr-defined]
-                    if not legal:
-                        result = self.game.pass_move()
-                        self._render(result.message)
-                        self._after_state_change()
-                        continue
+                if not engine.has_legal_move(self.game.board, self.game.to_move, self.game.history):
+                    result = self.game.pass_move()
+                    self._render(result.message)
+                    self._after_state_change()
+                    continue
 
             # 2) AI 自动走子
             if not self._is_ai_turn():
@@ -710,11 +968,182 @@ class Controller:
                 break
 
             level = seat.ai_level or 1
-            move = choose_othello_move(level, self.game.board, self.game.to_move, engine, rng=self._rng)  # type: ignore[arg-type]
-            result = self.game.play_move(move)
-            self._render(result.message)
+            if level >= MIN_SEARCH_LEVEL:
+                move, report = self._think(self.game, seat, level)
+                result = self.game.play_move(move)
+                self._render(f"{result.message}\nAI{level}: {report}")
+            else:
+                move = choose_othello_move(level, self.game.board, self.game.to_move, engine, rng=self._rng)  # type: ignore[arg-type]
+                result = self.game.play_move(move)
+                self._render(result.message)
             self._after_state_change()
 
+    def cancel_thinking(self) -> bool:
+        """
+        让正在思考的 AI 立即停下并走出目前的最佳着法；没有在思考时返回 False。
+        """
+        if not self.thinking:
+            return False
+        self._cancel.set()
+        return True
+
+    def _think(self, game: Game, seat: Seat, level: int) -> Tuple[Move, str]:
+        """
+        ai3+ 选一手棋：开局先查开局库，库里没有再按座位的限制（深度/节点/用时）搜索。
+        返回 (着法, 报告文本)；时钟模式下扣除本步用时并加上加秒。
+        """
+        color = game.to_move
+        started = time.monotonic()
+        budget_ms = seat.ai_time_ms
+        if seat.ai_clock_ms:
+            left = self._clocks.setdefault(color, float(seat.ai_clock_ms))
+            budget_ms = move_budget_ms(left, seat.ai_increment_ms or 0, game.board.counts[EMPTY])
+        self._cancel.clear()
+        self.thinking = True
+        try:
+            book = self._opening_book() if seat.ai_book else None
+            book_move = book.choose(game, rng=self._rng) if book else None
+            if book_move is not None:
+                move = Move(x=book_move.x, y=book_move.y, color=color)
+                report = f"book move {book_move.summary()}"
+            else:
+                pondered = self._pondered(game, color)
+                if pondered is not None and (
+                    pondered.endgame is not None
+                    or not budget_ms
+                    or pondered.depth >= self._reached.get(color, MAX_SEARCH_DEPTH + 1)
+                ):
+                    # 预想过这一应着：精确解、同样限制下搜完的结果，或不浅于限时搜索通常能达到的深度，直接使用
+                    search = pondered
+                else:
+                    deadline = Deadline.after_ms(budget_ms, self._should_stop)
+                    limits = limits_for_level(level, seat.ai_depth, seat.ai_nodes, seat.ai_endgame, deadline)
+                    patterns = self._pattern_evaluator(seat)
+                    if seat.ai_workers and seat.ai_workers > 1:
+                        # 并行模式：工作进程各自持有置换表
+                        tt_mb = seat.ai_tt_mb or DEFAULT_TT_MB
+                        search = parallel_search_othello_move(
+                            game.board, color, limits, seat.ai_workers, rng=self._rng, tt_mb=tt_mb, patterns=patterns
+                        )
+                    else:
+                        table = self._search_table(color, seat)
+                        search = search_othello_move(
+                            game.board, color, limits, rng=self._rng, table=table, patterns=patterns
+                        )
+                    if budget_ms and search.endgame is None:
+                        self._reached[color] = search.depth
+                    if pondered is not None and search.endgame is None and pondered.depth > search.depth:
+                        # 限时搜索没有预想搜得深：用预想结果
+                        search = pondered
+                move, report = search.move, search.summary()
+                if search is pondered:
+                    report = f"ponder hit, {report}"
+        finally:
+            self.thinking = False
+        elapsed_ms = (time.monotonic() - started) * 1000
+        report += f", {game.rule_engine.legal_cache.summary()}"
+        if budget_ms:
+            report += f", {elapsed_ms:.0f} ms"
+        if self._cancel.is_set():
+            report += ", stopped"
+        if seat.ai_clock_ms:
+            # AI 超时不判负，时钟最低扣到 0
+            left = max(0.0, self._clocks[color] - elapsed_ms) + (seat.ai_increment_ms or 0)
+            self._clocks[color] = left
+            report += f", clock {left / 1000:.1f} s left"
+        return move, report
+
+    def _pondered(self, game: Game, color: PlayerColor) -> Optional[SearchResult]:
+        """
+        取出上一次后台预想里当前局面的结果（预想随之作废）；没有预想或没预想到时返回 None。
+        """
+        ponder, self._ponder = self._ponder, None
+        if ponder is None or ponder.color != color or not isinstance(game.board, OthelloBoard):
+            return None
+        return ponder.result_for(game.board)
+
+    def _start_pondering(self) -> None:
+        """
+        轮到人类、且对方是开启 ponder 的 ai3+ 时，在后台预想人类的应着；
+        同一局面上已有的预想继续进行，不从头开始。
+        """
+        game = self.game
+        if not game or game.ended or self.replay or game.name != "othello" or not isinstance(game.board, OthelloBoard):
+            self._ponder = None
+            return
+        human = self.seats[game.to_move]
+        color = game.to_move.opposite()
+        seat = self.seats[color]
+        if human.kind != "human" or seat.kind != "ai" or (seat.ai_level or 1) < MIN_SEARCH_LEVEL or not seat.ai_ponder:
+            self._ponder = None
+            return
+        table = self._search_table(color, seat)
+        limits = limits_for_level(seat.ai_level or 1, seat.ai_depth, seat.ai_nodes, seat.ai_endgame)
+        patterns = self._pattern_evaluator(seat)
+        ponder = self._ponder
+        if (
+            ponder is None
+            or ponder.color != color
+            or ponder.table is not table
+            or ponder.limits != limits
+            or ponder.patterns is not patterns
+            or ponder.root_key != game.board.position_key(game.to_move)
+        ):
+            ponder = Ponderer(game.board.clone(), color, limits, table, patterns)
+            self._ponder = ponder
+        ponder.start()
+
+    def _should_stop(self) -> bool:
+        if self._poll is not None:
+            self._poll()
+        return self._cancel.is_set()
+
+    def _opening_book(self) -> Optional[OpeningBook]:
+        """
+        当前游戏与尺寸的开局库（books/<game>_<size>.book），首次使用时打开并缓存。
+        """
+        if not self.game or self.game.name not in GAME_CODES:
+            return None
+        key = (self.game.name, self.game.board.size)
+        if key not in self._books:
+            path = default_book_path(*key)
+            book = None
+            if os.path.exists(path):
+                try:
+                    book = OpeningBook(path)
+                except (OSError, ValueError):
+                    book = None
+            self._books[key] = book
+        return self._books[key]
+
+    def _pattern_evaluator(self, seat: Seat) -> Optional[PatternEvaluator]:
+        """
+        座位开启 patterns 且当前尺寸有权重文件（weights/othello_<size>.pat）时返回模式表评估，首次使用时载入并缓存。
+        """
+        if not seat.ai_patterns or not self.game or self.game.name != "othello":
+            return None
+        size = self.game.board.size
+        if size not in self._patterns:
+            path = default_pattern_path(size)
+            patterns = None
+            if os.path.exists(path):
+                try:
+                    patterns = load_patterns(path)
+                except (OSError, ValueError):
+                    patterns = None
+            if patterns is not None and patterns.size != size:
+                patterns = None
+            self._patterns[size] = patterns
+        return self._patterns[size]
+
+    def _search_table(self, color: PlayerColor, seat: Seat) -> TranspositionTable:
+        megabytes = seat.ai_tt_mb or DEFAULT_TT_MB
+        table = self._search_tables.get(color)
+        if table is None or table.megabytes != megabytes:
+            table = TranspositionTable(megabytes)
+            self._search_tables[color] = table
+        return table
+
     def _is_ai_turn(self) -> bool:
         if not self.game:
             return False
@@ -0,0 +1,44 @@
+"""
+整盘位掩码工具：第 index（= y * size + x）位为 1 表示该格被选中。
+
+各规则引擎的 legal_move_mask、黑白棋位棋盘与围棋区域计分共用这些函数。
+"""
+
+from __future__ import annotations
+
+from typing import Iterator, List, Tuple
+
+# 把格子编码 EMPTY/BLACK/WHITE 翻译成 "0"/"1" 字符，整串交给 int(..., 2) 在 C 层完成转换
+_CODE_BITS = (
+    bytes.maketrans(b"\x00\x01\x02", b"100"),
+    bytes.maketrans(b"\x00\x01\x02", b"010"),
+    bytes.maketrans(b"\x00\x01\x02", b"001"),
+)
+
+
+def cells_mask(data: bytes, code: int) -> int:
+    """
+    扁平格子数组中所有等于 code 的格子组成的位掩码。
+    """
+    if not data:
+        return 0
+    # 反转后下标 0 落在最低位
+    return int(bytes(data)[::-1].translate(_CODE_BITS[code]), 2)
+
+
+def popcount(bits: int) -> int:
+    return bin(bits).count("1")
+
+
+def iter_indices(bits: int) -> Iterator[int]:
+    """
+    按从低到高的顺序遍历置位的格子下标（即按行优先的 y, x 顺序）。
+    """
+    while bits:
+        low = bits & -bits
+        yield low.bit_length() - 1
+        bits ^= low
+
+
+def mask_to_coords(bits: int, size: int) -> List[Tuple[int, int]]:
+    return [(index % size, index // size) for index in iter_indices(bits)]
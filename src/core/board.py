@@ -1,41 +1,191 @@
 from __future__ import annotations
 
-import copy
-from typing import List, Optional, Tuple
+from typing import List, Optional, Sequence, Tuple
 
+from .geometry import SYMMETRY_COUNT, Geometry, geometry_for
 from .player import PlayerColor
+from .zobrist import side_key, symmetric_keys, zobrist_keys
+
+
+# 格子编码：棋盘内部用单字节整数存储，避免每格保存 Enum 对象
+EMPTY = 0
+BLACK = 1
+WHITE = 2
+
+# 一次格子改动：(下标, 原编码, 新编码)
+Change = Tuple[int, int, int]
+
+CODE_TO_COLOR: Tuple[Optional[PlayerColor], ...] = (None, PlayerColor.BLACK, PlayerColor.WHITE)
+_CODE_TO_VALUE: Tuple[Optional[str], ...] = (None, PlayerColor.BLACK.value, PlayerColor.WHITE.value)
+
+
+def color_code(color: Optional[PlayerColor]) -> int:
+    if color is None:
+        return EMPTY
+    return BLACK if color == PlayerColor.BLACK else WHITE
 
 
 class Board:
     """
     棋盘负责维护格子状态和基本操作，不参与规则判定。
+
+    格子按行优先存放在一个 bytearray 中（下标 y * size + x，取值 EMPTY/BLACK/WHITE），
+    clone 只需复制这一段连续内存；geometry 为该尺寸共享的只读查找表。
+    zobrist 为盘面的 64 位 Zobrist 哈希，在 set_at 中增量维护（不含行棋方，见 position_key）。
+    journal 不为 None 时，set_at 会把每次改动记为 (index, old, new)，供 History 生成增量记录。
+    counts[code] 为空点/黑子/白子的数量，同样在 set_at 中增量维护，终局与计数判断无需扫盘。
+    canonical_key 等方法给出 8 种对称像中的规范局面键与对应变换，供开局库、置换表等按对称合并局面。
     """
 
+    __slots__ = ("size", "data", "geometry", "zobrist", "journal", "counts", "_keys", "_symmetric")
+
     def __init__(self, size: int):
         if size < 1:
             raise ValueError("Board size must be positive")
         self.size = size
-        self.cells: List[List[Optional[PlayerColor]]] = [
-            [None for _ in range(size)] for _ in range(size)
-        ]
+        self.data = bytearray(size * size)
+        self.geometry: Geometry = geometry_for(size)
+        self.zobrist: int = 0
+        self.journal: Optional[List[Change]] = None
+        self.counts: List[int] = [size * size, 0, 0]
+        self._keys = zobrist_keys(size)
+        # (zobrist, 8 个对称像的哈希)：最近一次计算的结果，盘面未变时直接复用
+        self._symmetric: Optional[Tuple[int, Tuple[int, ...]]] = None
+
+    @property
+    def cells(self) -> List[List[Optional[PlayerColor]]]:
+        # 兼容旧接口的二维视图（每次调用都会新建列表，热点代码请直接使用 data）
+        size = self.size
+        return [[self.get(x, y) for x in range(size)] for y in range(size)]
 
     def in_bounds(self, x: int, y: int) -> bool:
         return 0 <= x < self.size and 0 <= y < self.size
 
     def get(self, x: int, y: int) -> Optional[PlayerColor]:
-        return self.cells[y][x]
+        return CODE_TO_COLOR[self.data[y * self.size + x]]
 
     def set(self, x: int, y: int, color: Optional[PlayerColor]) -> None:
-        self.cells[y][x] = color
+        self.set_at(y * self.size + x, color_code(color))
+
+    def set_at(self, index: int, code: int) -> None:
+        """
+        按下标与格子编码修改棋盘；所有落子/提子/翻转最终都经过这里。
+        """
+        data = self.data
+        old = data[index]
+        keys = self._keys
+        self.zobrist ^= keys[old][index] ^ keys[code][index]
+        self.counts[old] -= 1
+        self.counts[code] += 1
+        data[index] = code
+        if self.journal is not None:
+            self.journal.append((index, old, code))
+
+    def begin_journal(self) -> None:
+        self.journal = []
+
+    def end_journal(self) -> List[Change]:
+        changes = self.journal or []
+        self.journal = None
+        return changes
+
+    def apply_changes(self, changes: Sequence[Change]) -> None:
+        for index, _, new in changes:
+            self.set_at(index, new)
+
+    def revert_changes(self, changes: Sequence[Change]) -> None:
+        # 逆序恢复，保证同一格多次改动时回到最初状态
+        for index, old, _ in reversed(changes):
+            self.set_at(index, old)
+
+    def count(self, color: Optional[PlayerColor]) -> int:
+        """
+        某方棋子数（color 为 None 时为空点数），O(1)。
+        """
+        return self.counts[color_code(color)]
+
+    def is_full(self) -> bool:
+        return self.counts[EMPTY] == 0
+
+    def position_key(self, to_move: PlayerColor) -> int:
+        """
+        局面键：盘面哈希再叠加行棋方，可作为置换表、重复局面检测等的键。
+        """
+        return self.zobrist ^ side_key(to_move)
+
+    # --- 对称规范化 ---
+
+    def symmetric_hashes(self) -> Tuple[int, ...]:
+        """
+        8 种对称变换下的盘面哈希（不含行棋方），下标即变换编号，hashes[0] 就是 zobrist。
+        """
+        cached = self._symmetric
+        if cached is not None and cached[0] == self.zobrist:
+            return cached[1]
+        keys = symmetric_keys(self.size)
+        hashes = [0] * SYMMETRY_COUNT
+        for index, code in enumerate(self.data):
+            if code:
+                for t, key in enumerate(keys[code][index]):
+                    hashes[t] ^= key
+        result = tuple(hashes)
+        self._symmetric = (self.zobrist, result)
+        return result
+
+    def canonical_key(self, to_move: PlayerColor) -> Tuple[int, int]:
+        """
+        返回 (规范局面键, 变换编号)：8 个对称像中哈希最小者再叠加行棋方，与 position_key 同一量纲；
+        按该变换把实际棋盘上的格子映射到规范朝向（to_canonical），查到的着法用 from_canonical 映射回来。
+        """
+        hashes = self.symmetric_hashes()
+        transform = min(range(SYMMETRY_COUNT), key=hashes.__getitem__)
+        return hashes[transform] ^ side_key(to_move), transform
+
+    def canonical_transforms(self, to_move: PlayerColor) -> Tuple[int, Tuple[int, ...]]:
+        """
+        返回 (规范局面键, 所有得到该键的变换)：局面本身对称时不止一个（如标准开局）。
+        """
+        hashes = self.symmetric_hashes()
+        low = min(hashes)
+        return low ^ side_key(to_move), tuple(t for t in range(SYMMETRY_COUNT) if hashes[t] == low)
+
+    def to_canonical(self, transform: int, index: int) -> int:
+        """
+        实际棋盘上的格子 -> 变换 transform 下（规范朝向）的格子。
+        """
+        return self.geometry.symmetries[transform][index]
+
+    def from_canonical(self, transform: int, index: int) -> int:
+        """
+        规范朝向下的格子 -> 实际棋盘上的格子（to_canonical 的逆）。
+        """
+        geometry = self.geometry
+        return geometry.symmetries[geometry.inverse_symmetries[transform]][index]
 
     def is_empty(self, x: int, y: int) -> bool:
         return self.get(x, y) is None
 
-    def neighbors(self, x: int, y: int) -> List[Tuple[int, int]]:
-        # 上下左右相邻点
-        deltas = [(1, 0), (-1, 0), (0, 1), (0, -1)]
-        return [(x + dx, y + dy) for dx, dy in deltas if self.in_bounds(x + dx, y + dy)]
+    def neighbors(self, x: int, y: int) -> Sequence[Tuple[int, int]]:
+        # 上下左右相邻点（来自按尺寸预计算的几何表，调用方不应修改）
+        return self.geometry.neighbor_coords[y * self.size + x]
+
+    def to_rows(self) -> List[List[Optional[str]]]:
+        """
+        转为 "B"/"W"/None 的二维列表，供快照与存档使用。
+        """
+        size = self.size
+        values = [_CODE_TO_VALUE[code] for code in self.data]
+        return [values[y * size : (y + 1) * size] for y in range(size)]
 
     def clone(self) -> "Board":
-        # 深拷贝棋盘，用于快照
-        return copy.deepcopy(self)
+        # 只复制尺寸与底层字节数组，用于快照
+        other = object.__new__(type(self))
+        other.size = self.size
+        other.data = self.data[:]
+        other.geometry = self.geometry
+        other.zobrist = self.zobrist
+        other.journal = None
+        other.counts = self.counts[:]
+        other._keys = self._keys
+        other._symmetric = self._symmetric
+        return other
@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Tuple
+
+
+# 8 个方向 (dx, dy)；前 4 个与后 4 个两两相反，便于按“轴”成对使用
+DIRECTIONS_8: Tuple[Tuple[int, int], ...] = (
+    (1, 0),
+    (0, 1),
+    (1, 1),
+    (1, -1),
+    (-1, 0),
+    (0, -1),
+    (-1, -1),
+    (-1, 1),
+)
+# 四条轴：(正方向下标, 反方向下标)，对应横、竖、主对角、副对角
+AXES: Tuple[Tuple[int, int], ...] = ((0, 4), (1, 5), (2, 6), (3, 7))
+
+WINDOW_LENGTH = 5
+
+
+class Geometry:
+    """
+    某一棋盘尺寸下的几何查找表（每个尺寸只构建一次，被所有规则引擎和 AI 共享）。
+
+    所有表都以格子下标 index = y * size + x 为键：
+    - neighbors[index]：上下左右相邻格下标；neighbor_coords 为对应的 (x, y)；
+    - rays[index][d]：沿 DIRECTIONS_8[d] 方向、由近到远的格子下标；
+    - neighbors8[index] / neighbor_masks8[index]：八方向相邻格的下标与位掩码；
+    - windows / windows_through[index]：所有长度为 5 的连线窗口及经过某格的窗口编号；
+      window_slices[w] 为窗口 w 在扁平格子数组上的切片（步长为正，data[window_slices[w]] 取出 5 格）；
+    - corners / corner_zones / is_edge：黑白棋 AI 使用的角、角旁的 C 位与 X 位、边线表；
+    - full_mask / bit_directions：位棋盘的全盘掩码与 8 方向 (移位量, 掩码)；
+    - symmetries[t][index] / inverse_symmetries[t]：8 种二面体对称变换下格子的去向及其逆变换编号。
+    """
+
+    __slots__ = (
+        "size",
+        "cell_count",
+        "neighbors",
+        "neighbor_coords",
+        "rays",
+        "neighbors8",
+        "neighbor_masks8",
+        "windows",
+        "windows_through",
+        "window_slices",
+        "corners",
+        "corner_zones",
+        "is_edge",
+        "full_mask",
+        "bit_directions",
+        "symmetries",
+        "inverse_symmetries",
+    )
+
+    def __init__(self, size: int):
+        self.size = size
+        self.cell_count = size * size
+        self._build_neighbors()
+        self._build_rays()
+        self._build_windows()
+        self._build_corners()
+        self._build_bit_masks()
+        self._build_symmetries()
+
+    def index(self, x: int, y: int) -> int:
+        return y * self.size + x
+
+    def coords(self, index: int) -> Tuple[int, int]:
+        return index % self.size, index // self.size
+
+    # --- builders ---
+
+    def _build_neighbors(self) -> None:
+        size = self.size
+        neighbors = []
+        coords = []
+        for y in range(size):
+            for x in range(size):
+                points = [
+                    (x + dx, y + dy)
+                    for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1))
+                    if 0 <= x + dx < size and 0 <= y + dy < size
+                ]
+                coords.append(tuple(points))
+                neighbors.append(tuple(py * size + px for px, py in points))
+        self.neighbors = tuple(neighbors)
+        self.neighbor_coords = tuple(coords)
+
+    def _build_rays(self) -> None:
+        size = self.size
+        rays = []
+        for y in range(size):
+            for x in range(size):
+                per_dir = []
+                for dx, dy in DIRECTIONS_8:
+                    ray = []
+                    cx, cy = x + dx, y + dy
+                    while 0 <= cx < size and 0 <= cy < size:
+                        ray.append(cy * size + cx)
+                        cx += dx
+                        cy += dy
+                    per_dir.append(tuple(ray))
+                rays.append(tuple(per_dir))
+        self.rays = tuple(rays)
+        self.neighbors8 = tuple(tuple(ray[0] for ray in per_dir if ray) for per_dir in rays)
+        self.neighbor_masks8 = tuple(sum(1 << cell for cell in cells) for cells in self.neighbors8)
+
+    def _build_windows(self) -> None:
+        windows = []
+        through = [[] for _ in range(self.cell_count)]
+        for index in range(self.cell_count):
+            # 只沿每条轴的正方向展开，避免重复
+            for forward, _ in AXES:
+                ray = self.rays[index][forward]
+                if len(ray) < WINDOW_LENGTH - 1:
+                    continue
+                window = (index,) + ray[: WINDOW_LENGTH - 1]
+                for cell in window:
+                    through[cell].append(len(windows))
+                windows.append(window)
+        self.windows = tuple(windows)
+        self.windows_through = tuple(tuple(ids) for ids in through)
+        # 窗口内格子等距，可表示为一个切片；反向的对角线按下标从小到大取
+        self.window_slices = tuple(
+            slice(min(window), max(window) + 1, abs(window[1] - window[0])) for window in windows
+        )
+
+    def _build_corners(self) -> None:
+        size = self.size
+        last = size - 1
+        idx = self.index
+        # 每个角：(角, (C 位, C 位, X 位))
+        zones = (
+            (idx(0, 0), (idx(0, 1), idx(1, 0), idx(1, 1))),
+            (idx(0, last), (idx(0, last - 1), idx(1, last), idx(1, last - 1))),
+            (idx(last, 0), (idx(last - 1, 0), idx(last, 1), idx(last - 1, 1))),
+            (idx(last, last), (idx(last - 1, last), idx(last, last - 1), idx(last - 1, last - 1))),
+        )
+        self.corner_zones = zones
+        self.corners = tuple(corner for corner, _ in zones)
+        self.is_edge = tuple(
+            x == 0 or y == 0 or x == last or y == last for y in range(size) for x in range(size)
+        )
+
+    def _build_bit_masks(self) -> None:
+        size = self.size
+        full = (1 << self.cell_count) - 1
+        col_first = 0
+        col_last = 0
+        for y in range(size):
+            col_first |= 1 << (y * size)
+            col_last |= 1 << (y * size + size - 1)
+        not_first = full & ~col_first  # 向右移动（x+1）后不可能落在第 0 列
+        not_last = full & ~col_last  # 向左移动（x-1）后不可能落在最后一列
+        self.full_mask = full
+        # 与 DIRECTIONS_8 同序：正数左移、负数右移
+        self.bit_directions = tuple(
+            (dy * size + dx, not_first if dx > 0 else not_last if dx < 0 else full) for dx, dy in DIRECTIONS_8
+        )
+
+    def _build_symmetries(self) -> None:
+        size = self.size
+        last = size - 1
+        # 与 SYMMETRY_NAMES 同序；0 为恒等变换
+        maps = (
+            lambda x, y: (x, y),
+            lambda x, y: (last - y, x),
+            lambda x, y: (last - x, last - y),
+            lambda x, y: (y, last - x),
+            lambda x, y: (last - x, y),
+            lambda x, y: (x, last - y),
+            lambda x, y: (y, x),
+            lambda x, y: (last - y, last - x),
+        )
+        perms = []
+        for transform in maps:
+            perm = []
+            for y in range(size):
+                for x in range(size):
+                    tx, ty = transform(x, y)
+                    perm.append(ty * size + tx)
+            perms.append(tuple(perm))
+        self.symmetries = tuple(perms)
+        # 逆变换：先做 t 再做 inverse_symmetries[t] 回到原位
+        identity = perms[0]
+        self.inverse_symmetries = tuple(
+            next(u for u, other in enumerate(perms) if tuple(other[perm[i]] for i in range(self.cell_count)) == identity)
+            for perm in perms
+        )
+
+
+SYMMETRY_COUNT = 8
+SYMMETRY_NAMES = ("identity", "rot90", "rot180", "rot270", "flip-x", "flip-y", "transpose", "anti-transpose")
+
+
+@lru_cache(maxsize=None)
+def geometry_for(size: int) -> Geometry:
+    return Geometry(size)
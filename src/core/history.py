@@ -1,62 +1,187 @@
 from __future__ import annotations
 
+from collections import Counter
 from dataclasses import dataclass
-from typing import List
+from typing import Any, Dict, List, Optional
 
-from .board import Board
+from .board import Board, Change, color_code
+from .move import Move
 from .player import PlayerColor
+from .zobrist import zobrist_keys
 
 
 @dataclass
-class Memento:
-    board_snapshot: Board
+class MoveRecord:
+    """
+    一步棋的增量记录（备忘录）：只保存这一步改动过的格子，而不是整盘快照。
+
+    - move：落子（pass 为 pass_move；旧存档无法还原时为 None）；
+    - to_move：落子前的行棋方；
+    - changes：(index, old, new) 列表，含落子、翻转、提子；
+    - passes：落子前的连续 pass 计数；
+    - zobrist_before / zobrist_after：落子前后的盘面哈希（不含行棋方），用于重复局面检测；
+    - next_to_move / ended / result：落子后的状态，仅用于 redo，不写入存档。
+    """
+
+    move: Optional[Move]
     to_move: PlayerColor
+    changes: List[Change]
+    passes: int = 0
+    zobrist_before: int = 0
+    zobrist_after: int = 0
+    next_to_move: Optional[PlayerColor] = None
+    ended: bool = False
+    result: Any = None  # Optional[GameResult]，避免 core 依赖 rules
 
 
 class History:
     """
-    维护悔棋/存档所需的快照栈。
+    维护悔棋/重做与存档所需的增量记录栈，内存占用为 O(步数)。
+
+    同时维护一个局面哈希的多重集合（每步落子前的盘面），随 push/pop 同步增减，
+    供打劫/全局同形判断以 O(1) 查询“某局面是否出现过”。
     """
 
     def __init__(self):
-        self.stack: List[Memento] = []
+        self.stack: List[MoveRecord] = []
+        self.redo_stack: List[MoveRecord] = []
+        self.position_counts: Counter = Counter()
 
-    def push(self, board: Board, to_move: PlayerColor) -> None:
-        self.stack.append(Memento(board_snapshot=board.clone(), to_move=to_move))
+    def push(self, record: MoveRecord, keep_redo: bool = False) -> None:
+        # 新的一手会让之前撤销的分支失效；redo 自身重新压栈时保留剩余分支
+        self.stack.append(record)
+        self.position_counts[record.zobrist_before] += 1
+        if not keep_redo:
+            self.redo_stack.clear()
 
-    def pop(self) -> Memento:
+    def pop(self) -> MoveRecord:
         if not self.stack:
             raise IndexError("No history to undo")
-        return self.stack.pop()
+        record = self.stack.pop()
+        self.position_counts[record.zobrist_before] -= 1
+        if self.position_counts[record.zobrist_before] <= 0:
+            del self.position_counts[record.zobrist_before]
+        return record
+
+    def has_position(self, zobrist: int) -> bool:
+        """
+        zobrist 对应的盘面是否在本局中出现过（不含当前局面）。
+        """
+        return zobrist in self.position_counts
+
+    def previous_position(self) -> Optional[int]:
+        """
+        上一手落子前的盘面哈希（简单劫：不能立即回到这个局面）。
+        """
+        return self.stack[-1].zobrist_before if self.stack else None
 
     def can_undo(self) -> bool:
         return len(self.stack) > 0
 
+    def push_redo(self, record: MoveRecord) -> None:
+        self.redo_stack.append(record)
+
+    def pop_redo(self) -> MoveRecord:
+        if not self.redo_stack:
+            raise IndexError("No history to redo")
+        return self.redo_stack.pop()
+
+    def can_redo(self) -> bool:
+        return len(self.redo_stack) > 0
+
     def to_serializable(self):
         """
-        转为可序列化的结构，包含每步的棋盘状态和待行棋方。
+        转为可序列化的结构：每步记录待行棋方、落子坐标（pass 为 None）与改动格子。
         """
         return [
             {
-                "to_move": m.to_move.value,
-                "board": [[cell.value if cell else None for cell in row] for row in m.board_snapshot.cells],
+                "to_move": r.to_move.value,
+                "move": _move_to_data(r.move),
+                "changes": [list(change) for change in r.changes],
             }
-            for m in self.stack
+            for r in self.stack
         ]
 
     @staticmethod
-    def from_serializable(data, size: int) -> "History":
+    def from_serializable(data, current: Board) -> "History":
         """
-        从序列化数据重建快照栈。
+        从序列化数据重建增量记录栈，current 为存档中的当前局面。
+
+        兼容旧存档：旧格式每步保存整盘 "board"（落子前局面），
+        这里与下一步（或当前局面）逐格比较，转换为增量记录。
         """
         history = History()
-        for entry in data:
-            board = Board(size)
-            for y, row in enumerate(entry["board"]):
-                for x, cell in enumerate(row):
-                    if cell is None:
-                        board.set(x, y, None)
-                    else:
-                        board.set(x, y, PlayerColor(cell))
-            history.stack.append(Memento(board_snapshot=board, to_move=PlayerColor(entry["to_move"])))
+        entries = [entry for entry in data if isinstance(entry, dict)]
+        size = current.size
+        records: List[MoveRecord] = []
+        for i, entry in enumerate(entries):
+            to_move = PlayerColor(entry["to_move"])
+            if "changes" in entry:
+                changes = [(int(c[0]), int(c[1]), int(c[2])) for c in entry["changes"]]
+                move = _move_from_data(entry.get("move"), to_move, changes, size)
+            else:
+                before = _rows_to_codes(entry["board"])
+                if i + 1 < len(entries) and "board" in entries[i + 1]:
+                    after = _rows_to_codes(entries[i + 1]["board"])
+                else:
+                    after = bytes(current.data)
+                changes = [(index, old, new) for index, (old, new) in enumerate(zip(before, after)) if old != new]
+                move = _infer_move(to_move, changes, size)
+            records.append(MoveRecord(move=move, to_move=to_move, changes=changes))
+
+        # 从当前局面的哈希倒推每步前后的盘面哈希
+        keys = zobrist_keys(size)
+        zobrist = current.zobrist
+        for record in reversed(records):
+            record.zobrist_after = zobrist
+            for index, old, new in record.changes:
+                zobrist ^= keys[old][index] ^ keys[new][index]
+            record.zobrist_before = zobrist
+
+        # 回填 redo 所需的“落子后行棋方”（最后一步由调用方按当前局面补齐）
+        for record, following in zip(records, records[1:]):
+            record.next_to_move = following.to_move
+        for record in records:
+            history.push(record)
         return history
+
+
+def _move_to_data(move: Optional[Move]):
+    if move is None or move.is_pass:
+        return None
+    return [move.x, move.y]
+
+
+def _move_from_data(raw, to_move: PlayerColor, changes: List[Change], size: int) -> Optional[Move]:
+    if isinstance(raw, list) and len(raw) == 2:
+        return Move(x=int(raw[0]), y=int(raw[1]), color=to_move)
+    if not changes:
+        return Move.pass_move(to_move)
+    return _infer_move(to_move, changes, size)
+
+
+def _infer_move(to_move: PlayerColor, changes: List[Change], size: int) -> Optional[Move]:
+    if not changes:
+        return Move.pass_move(to_move)
+    code = color_code(to_move)
+    placed = [index for index, old, new in changes if old == 0 and new == code]
+    if len(placed) != 1:
+        return None
+    return Move(x=placed[0] % size, y=placed[0] // size, color=to_move)
+
+
+def _rows_to_codes(rows: List[List[Optional[str]]]) -> bytes:
+    return bytes(color_code(PlayerColor(cell)) if cell else 0 for row in rows for cell in row)
+
+
+def rows_from_changes(rows: List[List[Optional[str]]], changes: List[Change], reverse: bool) -> List[List[Optional[str]]]:
+    """
+    在 "B"/"W"/None 二维列表上应用（或逆向应用）一组改动，返回新的二维列表，供回放使用。
+    """
+    size = len(rows)
+    values: Dict[int, Optional[str]] = {0: None, 1: PlayerColor.BLACK.value, 2: PlayerColor.WHITE.value}
+    result = [list(row) for row in rows]
+    ordered = reversed(changes) if reverse else changes
+    for index, old, new in ordered:
+        result[index // size][index % size] = values[old if reverse else new]
+    return result
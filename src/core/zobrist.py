@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import random
+from functools import lru_cache
+from typing import Iterable, Tuple
+
+from .geometry import SYMMETRY_COUNT, geometry_for
+from .player import PlayerColor
+
+
+# 固定种子：同一尺寸的键表在每次运行中都相同，哈希值可以写入存档/开局库等持久化数据
+_SEED = 0x5EED_2B0A
+HASH_BITS = 64
+HASH_MASK = (1 << HASH_BITS) - 1
+
+# 轮到白方行棋时额外异或的键（黑方行棋为 0）
+SIDE_TO_MOVE_KEY = random.Random(_SEED).getrandbits(HASH_BITS)
+
+
+@lru_cache(maxsize=None)
+def zobrist_keys(size: int) -> Tuple[Tuple[int, ...], Tuple[int, ...], Tuple[int, ...]]:
+    """
+    返回按格子编码索引的键表 keys[code][index]：
+    keys[EMPTY] 全为 0，keys[BLACK] / keys[WHITE] 为每格的 64 位随机键。
+    这样“把 index 从 old 改为 new”只需 hash ^= keys[old][index] ^ keys[new][index]。
+    """
+    rng = random.Random(_SEED * 31 + size)
+    count = size * size
+    black = tuple(rng.getrandbits(HASH_BITS) for _ in range(count))
+    white = tuple(rng.getrandbits(HASH_BITS) for _ in range(count))
+    return (0,) * count, black, white
+
+
+@lru_cache(maxsize=None)
+def symmetric_keys(size: int) -> Tuple[Tuple[Tuple[int, ...], ...], ...]:
+    """
+    返回 keys[code][index][t]：格子 index 经对称变换 t（见 Geometry.symmetries）后所在格的键。
+    盘面在变换 t 下的哈希即所有棋子的 keys[code][index][t] 之异或；t = 0 时与 zobrist_keys 一致。
+    """
+    perms = geometry_for(size).symmetries
+    return tuple(
+        tuple(tuple(table[perms[t][index]] for t in range(SYMMETRY_COUNT)) for index in range(size * size))
+        for table in zobrist_keys(size)
+    )
+
+
+def side_key(to_move: PlayerColor) -> int:
+    return SIDE_TO_MOVE_KEY if to_move == PlayerColor.WHITE else 0
+
+
+def compute_hash(codes: Iterable[int], size: int) -> int:
+    """
+    从头计算一组格子编码的哈希（用于初始化与校验增量结果）。
+    """
+    keys = zobrist_keys(size)
+    value = 0
+    for index, code in enumerate(codes):
+        value ^= keys[code][index]
+    return value
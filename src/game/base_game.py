@@ -1,10 +1,11 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Optional
+from typing import List, Optional, Tuple
 
+from src.core.bitmask import mask_to_coords
 from src.core.board import Board
-from src.core.history import History
+from src.core.history import History, MoveRecord
 from src.core.move import Move
 from src.core.player import PlayerColor
 from src.core.snapshot import GameSnapshot
@@ -28,7 +29,7 @@ class Game:
         self.name = name
         self.serializer = JsonSerializer()
 
-        self.board: Board = Board(default_size)
+        self.board: Board = self._create_board(default_size)
         self.history = History()
         self.to_move: PlayerColor = PlayerColor.BLACK
         self.ended: bool = False
@@ -37,7 +38,7 @@ class Game:
 
     def start(self, config: Optional[GameConfig] = None) -> None:
         size = config.size if config else self.default_size
-        self.board = Board(size)
+        self.board = self._create_board(size)
         self.history = History()
         self.to_move = PlayerColor.BLACK
         self.ended = False
@@ -51,15 +52,22 @@ class Game:
             return ApplyResult(ended=False, message="Move out of bounds")
         if not move.is_pass and not self.board.is_empty(move.x, move.y):
             return ApplyResult(ended=False, message="Position already occupied")
-        if not self.rule_engine.is_legal(self.board, move, self.history):
+        # 校验与翻子/提子计算只做一次：prepare_move 给出的方案直接交给 apply_move
+        plan = self.rule_engine.prepare_move(self.board, move, self.history)
+        if plan is None:
             # 允许规则引擎提供更具体的错误信息（例如自杀禁手）
             message = getattr(self.rule_engine, "last_error_message", "Illegal move by rule")
             return ApplyResult(ended=False, message=message)
 
-        # 保存当前局面以支持悔棋
-        self.history.push(self.board, self.to_move)
-
-        result = self.rule_engine.apply_move(self.board, move, self.history)
+        # 记录本步改动的格子（增量备忘录），以支持悔棋/重做
+        to_move_before = self.to_move
+        passes_before = self.consecutive_passes
+        zobrist_before = self.board.zobrist
+        self.board.begin_journal()
+        try:
+            result = self.rule_engine.apply_move(self.board, move, self.history, plan)
+        finally:
+            changes = self.board.end_journal()
 
         # pass 计数只对围棋有用；其他游戏视为不允许 pass
         if move.is_pass:
@@ -84,6 +92,19 @@ class Game:
         self.ended = result.ended
         self.last_result = result.result
 
+        self.history.push(
+            MoveRecord(
+                move=move,
+                to_move=to_move_before,
+                changes=changes,
+                passes=passes_before,
+                zobrist_before=zobrist_before,
+                zobrist_after=self.board.zobrist,
+                next_to_move=self.to_move,
+                ended=self.ended,
+                result=self.last_result,
+            )
+        )
         return result
 
     def pass_move(self) -> ApplyResult:
@@ -91,17 +112,39 @@ class Game:
         move = Move.pass_move(self.to_move)
         return self.play_move(move)
 
+    def position_key(self) -> int:
+        """
+        当前局面的 64 位 Zobrist 键（盘面 + 行棋方），悔棋/读档后依然一致。
+        """
+        return self.board.position_key(self.to_move)
+
     def undo(self) -> ApplyResult:
         if not self.history.can_undo():
             return ApplyResult(ended=self.ended, message="No move to undo")
-        memento = self.history.pop()
-        self.board = memento.board_snapshot
-        self.to_move = memento.to_move
+        record = self.history.pop()
+        self.board.revert_changes(record.changes)
+        self.to_move = record.to_move
         self.ended = False
         self.last_result = None
-        self.consecutive_passes = 0
+        self.consecutive_passes = record.passes
+        self.history.push_redo(record)
         return ApplyResult(ended=self.ended, message="Undone")
 
+    def redo(self) -> ApplyResult:
+        if not self.history.can_redo():
+            return ApplyResult(ended=self.ended, message="No move to redo")
+        record = self.history.pop_redo()
+        self.board.apply_changes(record.changes)
+        self.to_move = record.next_to_move or record.to_move.opposite()
+        self.ended = record.ended
+        self.last_result = record.result
+        if record.move is not None and record.move.is_pass:
+            self.consecutive_passes = record.passes + 1
+        else:
+            self.consecutive_passes = 0
+        self.history.push(record, keep_redo=True)
+        return ApplyResult(ended=self.ended, message="Redone", result=self.last_result)
+
     def resign(self) -> ApplyResult:
         if self.ended:
             return ApplyResult(ended=True, message="Game already ended", result=self.last_result)
@@ -125,14 +168,32 @@ class Game:
         self._load_snapshot(snapshot)
 
     def get_snapshot(self) -> GameSnapshot:
-        return self._build_snapshot(include_history=False)
+        snapshot = self._build_snapshot(include_history=False)
+        # 整盘合法点由规则引擎批量计算，每次渲染都可刷新；是否高亮由渲染端的 show_legal_moves 决定
+        snapshot["legal_moves"] = self.legal_moves()
+        return snapshot
+
+    def legal_moves(self) -> List[Tuple[int, int]]:
+        """
+        当前行棋方的所有合法落子点（按行优先排序，不含 pass），终局后为空。
+        """
+        if self.ended:
+            return []
+        mask = self.rule_engine.legal_move_mask(self.board, self.to_move, self.history)
+        return mask_to_coords(mask, self.board.size)
 
     # 内部方法
+    def _create_board(self, size: int) -> Board:
+        """
+        工厂方法：子类可返回专用的棋盘实现（例如 Othello 的位棋盘）。
+        """
+        return Board(size)
+
     def _build_snapshot(self, include_history: bool) -> dict:
         return {
             "game": self.name,
             "size": self.board.size,
-            "board": [[cell.value if cell else None for cell in row] for row in self.board.cells],
+            "board": self.board.to_rows(),
             "to_move": self.to_move.value,
             "ended": self.ended,
             "history": self.history.to_serializable() if include_history else [],
@@ -142,7 +203,7 @@ class Game:
 
     def _load_snapshot(self, data: dict) -> None:
         size = data["size"]
-        self.board = Board(size)
+        self.board = self._create_board(size)
         for y, row in enumerate(data["board"]):
             for x, cell in enumerate(row):
                 self.board.set(x, y, PlayerColor(cell) if cell else None)
@@ -157,5 +218,10 @@ class Game:
             self.last_result = GameResult(winner=None, message=last_msg)
         else:
             self.last_result = None
-        self.history = History.from_serializable(data.get("history", []), size)
+        self.history = History.from_serializable(data.get("history", []), self.board)
+        if self.history.stack:
+            last = self.history.stack[-1]
+            last.next_to_move = self.to_move
+            last.ended = self.ended
+            last.result = self.last_result
         self.consecutive_passes = 0  # 存档恢复后重新统计 pass
@@ -1,9 +1,15 @@
-from typing import Optional
+import glob
+import os
+from typing import Iterator, Optional
 
 from src.game.base_game import Game, GameConfig
 from src.game.go_game import GoGame
 from src.game.gomoku_game import GomokuGame
 from src.game.othello_game import OthelloGame
+from src.serializer import JsonSerializer
+
+# 读存档时可预期的失败：文件读不出、不是合法 JSON（JSONDecodeError 属于 ValueError）、缺字段或取值不对
+SAVE_ERRORS = (OSError, ValueError, KeyError)
 
 
 class GameFactory:
@@ -34,3 +40,30 @@ class GameFactory:
 
         game.start(GameConfig(size=size if size else game.default_size))
         return game
+
+    @staticmethod
+    def load_finished(path: str, game_type: str, size: int) -> Optional[Game]:
+        """
+        读取一个已结束的存档对局；游戏类型、尺寸不符或未结束时返回 None，存档损坏时抛出 SAVE_ERRORS 中的异常。
+        """
+        data = JsonSerializer().load(path)
+        if not isinstance(data, dict):
+            return None
+        if data.get("game") != game_type or data.get("size") != size or not data.get("ended"):
+            return None
+        game = GameFactory.create(game_type, size)
+        game._load_snapshot(data)
+        return game
+
+
+def finished_games(directory: str, game_type: str, size: int) -> Iterator[Game]:
+    """
+    按文件名顺序产出目录下（*.json）所有可用的已结束对局；读不出或格式不对的存档跳过，不影响其余文件。
+    """
+    for path in sorted(glob.glob(os.path.join(directory, "*.json"))):
+        try:
+            game = GameFactory.load_finished(path, game_type, size)
+        except SAVE_ERRORS:
+            continue
+        if game is not None:
+            yield game
@@ -1,12 +1,20 @@
 from src.core.move import Move
 from src.core.player import PlayerColor
 from src.game.base_game import Game, GameConfig
-from src.rules.go_rule import GoRuleEngine
+from src.rules.go_rule import KO_SIMPLE, GoRuleEngine
 
 
 class GoGame(Game):
-    def __init__(self, default_size: int = 19):
-        super().__init__(default_size=default_size, rule_engine=GoRuleEngine(), name="go")
+    def __init__(self, default_size: int = 19, ko_rule: str = KO_SIMPLE):
+        super().__init__(default_size=default_size, rule_engine=GoRuleEngine(ko_rule), name="go")
+
+    @property
+    def ko_rule(self) -> str:
+        return self.rule_engine.ko_rule
+
+    def set_ko_rule(self, ko_rule: str) -> None:
+        # 构造一次以复用参数校验；局面哈希集合在 History 中，切换规则无需重建
+        self.rule_engine.ko_rule = GoRuleEngine(ko_rule).ko_rule
 
     def create_move(self, x: int, y: int) -> Move:
         return Move(x=x, y=y, color=self.to_move, is_pass=False)
@@ -14,3 +22,17 @@ class GoGame(Game):
     def pass_move(self):
         # 围棋允许 pass，沿用基类逻辑
         return super().pass_move()
+
+    def _build_snapshot(self, include_history: bool) -> dict:
+        snapshot = super()._build_snapshot(include_history)
+        snapshot["ko_rule"] = self.ko_rule
+        # 实时区域计分（按盘面哈希缓存，每步刷新也很便宜）
+        black, white = self.rule_engine.score(self.board)
+        snapshot["score"] = {PlayerColor.BLACK.value: black, PlayerColor.WHITE.value: white}
+        return snapshot
+
+    def _load_snapshot(self, data: dict) -> None:
+        super()._load_snapshot(data)
+        # 旧存档没有该字段，沿用当前设置
+        if data.get("ko_rule"):
+            self.set_ko_rule(data["ko_rule"])
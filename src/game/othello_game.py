@@ -2,8 +2,10 @@ from __future__ import annotations
 
 from typing import Optional
 
+from src.core.board import Board
 from src.core.player import PlayerColor
 from src.game.base_game import Game, GameConfig
+from src.rules.othello_bitboard import OthelloBoard
 from src.rules.othello_rule import OthelloRuleEngine
 
 
@@ -15,6 +17,10 @@ class OthelloGame(Game):
         super().start(config)
         self._place_initial_discs()
 
+    def _create_board(self, size: int) -> Board:
+        # 以位棋盘作为真实状态，list-of-lists 仅作为渲染/存档视图
+        return OthelloBoard(size)
+
     def _place_initial_discs(self) -> None:
         mid = self.board.size // 2
         # 标准开局：白白对角、黑黑对角
@@ -1,3 +1,4 @@
+import time
 import tkinter as tk
 from tkinter import messagebox, simpledialog
 
@@ -8,6 +9,7 @@ from src.gui_renderer import GuiRenderer
 
 
 MAX_BOARD_SIZE = 19
+PUMP_INTERVAL = 0.05  # AI 思考期间刷新界面的最小间隔（秒）
 
 
 class GuiApp:
@@ -55,16 +57,23 @@ class GuiApp:
             turn_label=self.turn_label,
             players_label=self.players_label,
         )
-        self.controller = Controller(renderer=self.renderer, password_prompt=self._prompt_password)
+        # AI 思考期间 Controller 定期回调 _pump_events，界面保持响应，Stop AI 按钮可打断搜索
+        self._last_pump = 0.0
+        self._close_requested = False
+        self.controller = Controller(
+            renderer=self.renderer, password_prompt=self._prompt_password, poll=self._pump_events
+        )
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
         self.renderer.render_message(
             "\n".join(
                 [
                     "Welcome to Board Game Platform (GUI).",
                     "1) Choose a game type and board size, then click Start.",
-                    "2) Seats: Human / AI1 / AI2 (AI is Othello-only).",
+                    "2) Seats: Human / AI1-AI5 (AI is Othello-only; AI3+ searches ahead).",
+                    "   Set 'AI ms/move' before choosing AI3+ to give it a time budget; Stop AI makes it move now.",
                     "3) Accounts: Register/Login per side; click Who to view players.",
                     "4) Save/Load/Replay use names stored in saves/ (e.g. game1).",
-                    "Tip: in Othello, click Moves to highlight legal moves ('*').",
+                    "Tip: click Moves to highlight legal moves ('*') in any game.",
                 ]
             )
         )
@@ -132,13 +141,17 @@ class GuiApp:
         row += 1
         self.undo_btn = tk.Button(self.controls_frame, text="Undo", command=self.on_undo)
         self.pass_btn = tk.Button(self.controls_frame, text="Pass (Go)", command=self.on_pass)
+        self.redo_btn = tk.Button(self.controls_frame, text="Redo", command=self.on_redo)
         self.undo_btn.grid(row=row, column=0, sticky="we", pady=2)
         self.pass_btn.grid(row=row, column=1, sticky="we", pady=2)
+        self.redo_btn.grid(row=row, column=2, sticky="we", pady=2)
         row += 1
         self.resign_btn = tk.Button(self.controls_frame, text="Resign", command=self.on_resign)
-        self.moves_btn = tk.Button(self.controls_frame, text="Moves (Othello)", command=self.on_moves)
+        self.moves_btn = tk.Button(self.controls_frame, text="Moves", command=self.on_moves)
+        self.stop_btn = tk.Button(self.controls_frame, text="Stop AI", command=self.on_stop, state=tk.DISABLED)
         self.resign_btn.grid(row=row, column=0, sticky="we", pady=2)
         self.moves_btn.grid(row=row, column=1, sticky="we", pady=2)
+        self.stop_btn.grid(row=row, column=2, sticky="we", pady=2)
         row += 1
         self.save_btn = tk.Button(self.controls_frame, text="Save", command=self.on_save)
         self.load_btn = tk.Button(self.controls_frame, text="Load", command=self.on_load)
@@ -167,6 +180,9 @@ class GuiApp:
             "Human",
             "AI1",
             "AI2",
+            "AI3",
+            "AI4",
+            "AI5",
             command=lambda _v: self.on_seat_change("black"),
         )
         self.white_seat_menu = tk.OptionMenu(
@@ -175,10 +191,18 @@ class GuiApp:
             "Human",
             "AI1",
             "AI2",
+            "AI3",
+            "AI4",
+            "AI5",
             command=lambda _v: self.on_seat_change("white"),
         )
         self.black_seat_menu.grid(row=row, column=0, sticky="we", pady=2)
         self.white_seat_menu.grid(row=row, column=1, sticky="we", pady=2)
+        row += 1
+        # AI3+ 的每步用时（毫秒，留空表示按深度搜索），选择座位时生效
+        tk.Label(self.controls_frame, text="AI ms/move:").grid(row=row, column=0, sticky="w")
+        self.ai_time_entry = tk.Entry(self.controls_frame, width=7)
+        self.ai_time_entry.grid(row=row, column=1, sticky="w")
 
         row += 1
         self.black_register_btn = tk.Button(
@@ -289,6 +313,14 @@ class GuiApp:
         self.controller.handle(cmd)
         self._sync_after_command()
 
+    def on_redo(self) -> None:
+        if not self.controller.game:
+            messagebox.showinfo("Info", "No game in progress.")
+            return
+        cmd = Command(name="redo", args=[])
+        self.controller.handle(cmd)
+        self._sync_after_command()
+
     def on_resign(self) -> None:
         if not self.controller.game:
             messagebox.showinfo("Info", "No game in progress.")
@@ -365,9 +397,40 @@ class GuiApp:
         value = self.black_seat_var.get() if side == "black" else self.white_seat_var.get()
         kind = value.lower()
         cmd_kind = "human" if kind == "human" else kind
-        self.controller.handle(Command(name="seat", args=[side, cmd_kind]))
+        args = [side, cmd_kind]
+        time_ms = self.ai_time_entry.get().strip()
+        if time_ms and kind not in ("human", "ai1", "ai2"):
+            args += ["time", time_ms]
+        self.controller.handle(Command(name="seat", args=args))
         self._sync_after_command()
 
+    def on_stop(self) -> None:
+        self.controller.cancel_thinking()
+
+    def on_close(self) -> None:
+        # 思考中先让 AI 停下，等当前命令处理完（_sync_after_command）再关闭窗口
+        if self.controller.cancel_thinking():
+            self._close_requested = True
+            return
+        self.root.destroy()
+
+    def _pump_events(self) -> None:
+        """
+        AI 思考期间由 Controller 定期调用：刷新界面并处理点击。
+        输入限定在 Stop AI 按钮上（grab），避免思考中途重入其他命令。
+        """
+        if self._close_requested:
+            self.controller.cancel_thinking()
+            return
+        now = time.monotonic()
+        if now - self._last_pump < PUMP_INTERVAL:
+            return
+        self._last_pump = now
+        if self.root.grab_current() is not self.stop_btn:
+            self.stop_btn.configure(state=tk.NORMAL)
+            self.stop_btn.grab_set()
+        self.root.update()
+
     def on_register(self, side: str) -> None:
         username = simpledialog.askstring("Register", f"Username for {side}:")
         if not username:
@@ -411,6 +474,12 @@ class GuiApp:
             self.size_entry.insert(0, new_default)
 
     def _sync_after_command(self) -> None:
+        # AI 思考结束：释放 Stop AI 按钮的输入独占
+        self.stop_btn.grab_release()
+        self.stop_btn.configure(state=tk.DISABLED)
+        if self._close_requested:
+            self.root.destroy()
+            return
         # 同步 board 可用区域与控件状态
         if self.controller.game and not self.controller.replay:
             self._enable_board(self.controller.game.board.size)
@@ -431,6 +500,7 @@ class GuiApp:
             self.start_btn,
             self.restart_btn,
             self.undo_btn,
+            self.redo_btn,
             self.pass_btn,
             self.resign_btn,
             self.moves_btn,
@@ -498,10 +568,10 @@ class GuiApp:
         for widget in [self.white_register_btn, self.white_login_btn, self.white_logout_btn]:
             widget.configure(state=white_accounts_state)
 
-        # Pass/Moves 仅对特定游戏启用
+        # Pass 仅围棋可用；Moves 对所有游戏启用
         if self.controller.game and not self.controller.replay:
             self.pass_btn.configure(state=tk.NORMAL if self.controller.game.name == "go" else tk.DISABLED)
-            self.moves_btn.configure(state=tk.NORMAL if self.controller.game.name == "othello" else tk.DISABLED)
+            self.moves_btn.configure(state=tk.NORMAL)
         else:
             self.pass_btn.configure(state=tk.DISABLED)
             self.moves_btn.configure(state=tk.DISABLED)
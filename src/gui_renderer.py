@@ -104,7 +104,11 @@ class GuiRenderer:
                 entry = players.get(to_move) or {}
                 label = entry.get("label")
                 suffix = f" ({label})" if isinstance(label, str) and label and label != "Guest" else ""
-                self.turn_label.config(text=f"{player}{suffix} to move")
+                text = f"{player}{suffix} to move"
+                score = snapshot.get("score")
+                if score:
+                    text += f"  |  Score B {score.get(PlayerColor.BLACK.value)} : W {score.get(PlayerColor.WHITE.value)}"
+                self.turn_label.config(text=text)
             else:
                 self.turn_label.config(text="")
 
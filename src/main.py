@@ -1,3 +1,4 @@
+import signal
 import sys
 
 from src.command_parser import CommandParser
@@ -7,6 +8,14 @@ from src.controller import Controller
 def main():
     parser = CommandParser()
     controller = Controller()
+
+    def on_interrupt(signum, frame):
+        # AI 思考中按 Ctrl+C：停止搜索并走出目前的最佳着法；solve 求解中则取消求解；其余时候照常中断
+        if not controller.cancel_thinking():
+            signal.default_int_handler(signum, frame)
+
+    signal.signal(signal.SIGINT, on_interrupt)
+
     print(
         "\n".join(
             [
@@ -17,6 +26,7 @@ def main():
                 "  start othello 8          # Othello size: even 8-18",
                 "  moves                    # show legal moves as '*'",
                 "  seat white ai1           # AI is supported only in Othello",
+                "  seat white ai5 time 1000 # search for 1 s per move (Ctrl+C: move now)",
                 "  play 2 3",
                 "  save game1",
                 "  replay game1",
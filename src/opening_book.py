@@ -0,0 +1,291 @@
+"""
+二进制开局库（Othello / Gomoku）：按对称规范化的局面键存放着法统计。
+
+文件格式（小端）：
+- 文件头 12 字节：魔数 b"OBK1"、游戏编号、棋盘尺寸、保留 2 字节、条目数；
+- 条目 24 字节，按 (局面键, 着法) 升序排列：
+  局面键 u64、对局数 u32、行棋方胜局 u32、和局 u32、规范朝向的着法下标 u16、填充 2 字节。
+
+读取时用 mmap 映射整个文件，查找为条目数组上的二分，不需要把库读进内存，
+上百万条目的库打开也是瞬间完成。
+
+构建：BookBuilder 回放存档对局与自对弈对局的前若干手，统计每个规范局面下各着法的结果。
+命令行：python3 -m src.opening_book --game othello --size 8 --saves saves --self-play 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import mmap
+import os
+import random
+import struct
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from src.ai_othello import choose_othello_move
+from src.core.move import Move
+from src.core.player import PlayerColor
+from src.game.base_game import Game
+from src.game.factory import GameFactory, finished_games
+
+BOOK_MAGIC = b"OBK1"
+BOOK_DIR = "books"
+GAME_CODES = {"othello": 1, "gomoku": 2}
+
+_HEADER = struct.Struct("<4sBBHI")
+_ENTRY = struct.Struct("<QIIIH2x")
+_KEY = struct.Struct("<Q")
+
+DEFAULT_BOOK_PLIES = 16  # 每局只收录前若干手
+DEFAULT_MIN_PLAYS = 2  # 选书着时要求的最少对局数
+
+
+@dataclass
+class BookMove:
+    """
+    某局面下的一个书着（实际棋盘坐标）与统计。
+    """
+
+    x: int
+    y: int
+    plays: int
+    wins: int
+    draws: int
+
+    @property
+    def score(self) -> float:
+        # 行棋方视角的得分率：胜 1、和 0.5
+        return (self.wins + 0.5 * self.draws) / self.plays if self.plays else 0.0
+
+    def summary(self) -> str:
+        return f"({self.x},{self.y}) {self.plays} games, {self.score:.0%}"
+
+
+def default_book_path(game: str, size: int) -> str:
+    return os.path.join(BOOK_DIR, f"{game}_{size}.book")
+
+
+class OpeningBook:
+    """
+    只读开局库：mmap 映射文件，按规范局面键二分查找。
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            header = self._file.read(_HEADER.size)
+            if len(header) != _HEADER.size:
+                raise ValueError("Opening book is truncated")
+            magic, game_code, size, _, count = _HEADER.unpack(header)
+            if magic != BOOK_MAGIC:
+                raise ValueError("Not an opening book file")
+            games = {code: name for name, code in GAME_CODES.items()}
+            if game_code not in games:
+                raise ValueError(f"Unknown game code in opening book: {game_code}")
+            if os.fstat(self._file.fileno()).st_size != _HEADER.size + count * _ENTRY.size:
+                raise ValueError("Opening book size does not match its entry count")
+            self.game = games[game_code]
+            self.size = size
+            self.count = count
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            self._file.close()
+            raise
+
+    def close(self) -> None:
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self) -> "OpeningBook":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.count
+
+    def entries(self, key: int) -> List[Tuple[int, int, int, int]]:
+        """
+        规范局面键下的所有条目：(规范着法下标, 对局数, 胜局, 和局)。
+        """
+        index = self._lower_bound(key)
+        found = []
+        while index < self.count:
+            entry_key, plays, wins, draws, move = _ENTRY.unpack_from(self._map, _HEADER.size + index * _ENTRY.size)
+            if entry_key != key:
+                break
+            found.append((move, plays, wins, draws))
+            index += 1
+        return found
+
+    def lookup(self, game: Game) -> List[BookMove]:
+        """
+        当前局面的书着（已映射回实际棋盘坐标），按对局数从多到少排序。
+        """
+        if game.name != self.game or game.board.size != self.size:
+            return []
+        board = game.board
+        key, transforms = board.canonical_transforms(game.to_move)
+        size = self.size
+        moves = []
+        for move, plays, wins, draws in self.entries(key):
+            # 对称局面里一个规范着法对应多个等价的实际着法，逐一列出
+            for index in sorted({board.from_canonical(t, move) for t in transforms}):
+                moves.append(BookMove(index % size, index // size, plays, wins, draws))
+        moves.sort(key=lambda book_move: book_move.plays, reverse=True)
+        return moves
+
+    def choose(
+        self, game: Game, rng: Optional[random.Random] = None, min_plays: int = DEFAULT_MIN_PLAYS
+    ) -> Optional[BookMove]:
+        """
+        选一个书着：对局数达到 min_plays 的着法中得分率最高者（同分随机）；库中没有时返回 None。
+        """
+        candidates = [move for move in self.lookup(game) if move.plays >= min_plays]
+        if not candidates:
+            return None
+        best = max(move.score for move in candidates)
+        top = [move for move in candidates if move.score == best]
+        return (rng or random.Random()).choice(top)
+
+    def _lower_bound(self, key: int) -> int:
+        low, high = 0, self.count
+        data = self._map
+        while low < high:
+            middle = (low + high) // 2
+            if _KEY.unpack_from(data, _HEADER.size + middle * _ENTRY.size)[0] < key:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+
+class BookBuilder:
+    """
+    汇总对局的前 plies 手，统计 (规范局面键, 规范着法) -> [对局数, 胜局, 和局]。
+    """
+
+    def __init__(self, game: str, size: int, plies: int = DEFAULT_BOOK_PLIES):
+        if game not in GAME_CODES:
+            raise ValueError(f"Opening books support {', '.join(GAME_CODES)} only")
+        self.game = game
+        self.size = size
+        self.plies = plies
+        self.games = 0
+        self.stats: Dict[Tuple[int, int], List[int]] = defaultdict(lambda: [0, 0, 0])
+
+    def add_game(self, moves: Iterable[Move], winner: Optional[PlayerColor]) -> bool:
+        """
+        从标准开局回放 moves 并记录；出现非法或无法还原（None）的着法时整局丢弃，返回 False。
+        """
+        game = GameFactory.create(self.game, self.size)
+        pending = []
+        for ply, move in enumerate(moves):
+            if ply >= self.plies:
+                break
+            if move is None:
+                return False
+            played = len(game.history.stack)
+            if move.is_pass:
+                game.pass_move()
+            else:
+                # 局面自身对称时，等价着法取规范朝向下标最小者，统计合并到同一条目
+                key, transforms = game.board.canonical_transforms(game.to_move)
+                index = min(game.board.to_canonical(t, move.y * self.size + move.x) for t in transforms)
+                pending.append((key, index, game.to_move))
+                game.play_move(Move(x=move.x, y=move.y, color=game.to_move))
+            # 非法着法不会写入历史
+            if len(game.history.stack) == played:
+                return False
+        for key, index, mover in pending:
+            entry = self.stats[(key, index)]
+            entry[0] += 1
+            if winner is None:
+                entry[2] += 1
+            elif winner == mover:
+                entry[1] += 1
+        self.games += 1
+        return True
+
+    def add_saved_game(self, path: str) -> bool:
+        """
+        收录一个已结束的存档对局（游戏类型与尺寸需与本库一致）。
+        """
+        game = GameFactory.load_finished(path, self.game, self.size)
+        return game is not None and self._add_finished(game)
+
+    def add_saved_games(self, directory: str) -> int:
+        return sum(1 for game in finished_games(directory, self.game, self.size) if self._add_finished(game))
+
+    def _add_finished(self, game: Game) -> bool:
+        winner = game.last_result.winner if game.last_result else None
+        return self.add_game((record.move for record in game.history.stack), winner)
+
+    def add_self_play(
+        self, count: int, level: int = 2, rng: Optional[random.Random] = None, random_plies: int = 4
+    ) -> int:
+        """
+        AI 自对弈 count 局并收录（AI 目前只支持 Othello）；前 random_plies 手随机落子以覆盖更多开局。
+        """
+        if self.game != "othello":
+            raise ValueError("Self-play needs an AI; only Othello has one")
+        rng = rng or random.Random()
+        added = 0
+        for _ in range(count):
+            game = GameFactory.create(self.game, self.size)
+            moves = []
+            while not game.ended:
+                ply_level = 1 if len(moves) < random_plies else level
+                move = choose_othello_move(ply_level, game.board, game.to_move, game.rule_engine, rng=rng)
+                game.play_move(move)
+                moves.append(move)
+            winner = game.last_result.winner if game.last_result else None
+            if self.add_game(moves, winner):
+                added += 1
+        return added
+
+    def write(self, path: str) -> int:
+        """
+        按 (局面键, 着法) 排序写出，先写临时文件再替换，返回条目数。
+        """
+        items = sorted(self.stats.items())
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp = path + ".tmp"
+        with open(temp, "wb") as f:
+            f.write(_HEADER.pack(BOOK_MAGIC, GAME_CODES[self.game], self.size, 0, len(items)))
+            for (key, move), (plays, wins, draws) in items:
+                f.write(_ENTRY.pack(key, plays, wins, draws, move))
+        os.replace(temp, path)
+        return len(items)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Build an opening book from saved games and self-play")
+    parser.add_argument("--game", choices=sorted(GAME_CODES), default="othello")
+    parser.add_argument("--size", type=int, default=8)
+    parser.add_argument("--saves", default=None, help="directory of saved games (*.json)")
+    parser.add_argument("--self-play", type=int, default=0, help="number of AI self-play games (Othello)")
+    parser.add_argument("--level", type=int, default=2, help="AI level used for self-play")
+    parser.add_argument("--random-plies", type=int, default=4, help="random opening plies in self-play")
+    parser.add_argument("--plies", type=int, default=DEFAULT_BOOK_PLIES)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--out", default=None, help="output path (default books/<game>_<size>.book)")
+    args = parser.parse_args(argv)
+
+    builder = BookBuilder(args.game, args.size, args.plies)
+    if args.saves:
+        print(f"Saved games added: {builder.add_saved_games(args.saves)}")
+    if args.self_play:
+        print(f"Self-play games added: {builder.add_self_play(args.self_play, args.level, random.Random(args.seed), args.random_plies)}")
+    out = args.out or default_book_path(args.game, args.size)
+    print(f"Wrote {builder.write(out)} entries from {builder.games} games to {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -45,6 +45,10 @@ class CliRenderer:
             white_label = _format_player_entry(white_entry, fallback="Guest")
             print(f"Players: Black={black_label} | White={white_label}")
 
+        score = snapshot.get("score")
+        if score and not ended:
+            print(f"[score] Black {score.get(PlayerColor.BLACK.value)} | White {score.get(PlayerColor.WHITE.value)} (area)")
+
         if message:
             for line in str(message).splitlines():
                 if line.strip() == "":
@@ -92,18 +96,18 @@ def _print_hints(snapshot: Dict) -> None:
     if ended:
         print("  Game ended: save name | replay [name] | start go|gomoku|othello [size] | restart [size]")
     else:
-        print("  Play: play x y | undo | resign | restart [size]")
+        print("  Play: play x y | undo | redo | resign | restart [size]")
         print("  Save/Load: save name | load [name] | replay [name]")
 
     print("  Accounts (all games): register/login/logout black|white <username> | who")
 
     if game == "othello":
-        print("  Othello: moves (shows '*' legal) | size must be even 8-18 | forced pass is automatic")
-        print("  AI (Othello only): seat black|white ai1|ai2 (AI moves automatically) | seat <side> human to take over")
+        print("  Othello: moves (shows '*' legal) | solve (exact result, <= 14 empties) | book (opening book) | size must be even 8-18 | forced pass is automatic")
+        print("  AI (Othello only): seat black|white ai1|ai2|ai3..ai9 [time MS] (AI moves automatically; Ctrl+C: move now) | seat <side> human to take over")
     elif game == "go":
-        print("  Go: pass (go only) | game ends after two consecutive passes")
+        print("  Go: pass (go only) | moves (shows '*' legal, respects suicide/ko) | score (live area score) | ko none|simple|superko | game ends after two consecutive passes")
     elif game == "gomoku":
-        print("  Gomoku: pass is not allowed | win by five in a row")
+        print("  Gomoku: pass is not allowed | win by five in a row | moves (shows '*' legal) | book (opening book)")
 
     print("  Help: help [topic]  topics: accounts, ai, othello, replay")
     print("  Hide hints: hint off")
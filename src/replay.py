@@ -3,6 +3,7 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Any, Dict, List, Optional, Tuple
 
+from src.core.history import rows_from_changes
 from src.core.player import PlayerColor
 
 
@@ -17,7 +18,8 @@ class ReplaySession:
     回放会话：基于存档中的 history + 当前局面构建时间线。
 
     timeline 规则（兼容旧存档）：
-    - history[i] 保存的是“第 i+1 手落子前”的局面（Game.play_move 里 push 的 memento）；
+    - 新存档 history[i] 保存第 i+1 手的改动格子，从当前 board 逆向应用即可得到“落子前”的局面；
+    - 旧存档 history[i] 直接保存“第 i+1 手落子前”的整盘局面；
     - 最后追加当前 board，形成 len(history)+1 个状态。
     """
 
@@ -89,21 +91,31 @@ class ReplaySession:
 
     def _build_timeline(self, data: Dict[str, Any]) -> List[ReplayState]:
         history = data.get("history") or []
+        entries = [entry for entry in history if isinstance(entry, dict)] if isinstance(history, list) else []
         timeline: List[ReplayState] = []
 
-        if isinstance(history, list):
-            for entry in history:
-                if not isinstance(entry, dict):
-                    continue
-                board = entry.get("board")
-                to_move = entry.get("to_move")
-                if isinstance(board, list) and to_move in (PlayerColor.BLACK.value, PlayerColor.WHITE.value):
-                    timeline.append(ReplayState(board=board, to_move=to_move))
-
-        # 当前局面作为最后一帧
         board = data.get("board")
         to_move = data.get("to_move")
-        if isinstance(board, list) and to_move in (PlayerColor.BLACK.value, PlayerColor.WHITE.value):
+        has_current = isinstance(board, list) and to_move in (PlayerColor.BLACK.value, PlayerColor.WHITE.value)
+
+        if entries and all("changes" in entry for entry in entries):
+            # 增量存档：从当前局面出发逆向应用每步改动，还原出每手落子前的局面
+            if not has_current:
+                return timeline
+            rows = board
+            for entry in reversed(entries):
+                rows = rows_from_changes(rows, entry["changes"], reverse=True)
+                timeline.append(ReplayState(board=rows, to_move=entry.get("to_move")))
+            timeline.reverse()
+        else:
+            for entry in entries:
+                board_entry = entry.get("board")
+                to_move_entry = entry.get("to_move")
+                if isinstance(board_entry, list) and to_move_entry in (PlayerColor.BLACK.value, PlayerColor.WHITE.value):
+                    timeline.append(ReplayState(board=board_entry, to_move=to_move_entry))
+
+        # 当前局面作为最后一帧
+        if has_current:
             timeline.append(ReplayState(board=board, to_move=to_move))
 
         # 若存档没有 history，也没有 board，则退化为一个空 timeline
@@ -1,12 +1,13 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Optional
+from dataclasses import dataclass, field
+from typing import Any, Iterator, List, Optional, Tuple
 
-from src.core.board import Board
+from src.core.board import EMPTY, Board
 from src.core.history import History
 from src.core.move import Move
 from src.core.player import PlayerColor
+from src.rules.legal_cache import LegalMoveCache
 
 
 @dataclass
@@ -15,6 +16,22 @@ class GameResult:
     message: str
 
 
+@dataclass
+class MovePlan:
+    """
+    校验通过的落子方案：prepare_move 算出，apply_move / make_move 直接使用，避免重复计算。
+
+    - flips：黑白棋将被翻转的棋子位掩码；
+    - captures：围棋将被提走的对方棋串；
+    - zobrist_after：落子后的盘面哈希（未计算时为 None）。
+    """
+
+    move: Move
+    flips: int = 0
+    captures: List[Any] = field(default_factory=list)
+    zobrist_after: Optional[int] = None
+
+
 @dataclass
 class ApplyResult:
     ended: bool
@@ -25,12 +42,30 @@ class ApplyResult:
 class RuleEngine:
     """
     规则策略接口。
+
+    legal_cache 为按局面键缓存合法落子掩码的 LRU 表，同一引擎的所有调用方（控制器、规则、AI）共用。
     """
 
+    def __init__(self) -> None:
+        self.legal_cache = LegalMoveCache()
+
     def is_legal(self, board: Board, move: Move, history: History) -> bool:
         raise NotImplementedError
 
-    def apply_move(self, board: Board, move: Move, history: History) -> ApplyResult:
+    def prepare_move(self, board: Board, move: Move, history: Optional[History]) -> Optional[MovePlan]:
+        """
+        校验并预先算好落子方案；非法时返回 None（具体原因见 last_error_message）。
+
+        通用实现只调用 is_legal；需要翻子/提子计算的规则引擎应覆盖它，
+        让 Game.play_move 每步只做一次规则计算。
+        """
+        if not self.is_legal(board, move, history):
+            return None
+        return MovePlan(move=move)
+
+    def apply_move(
+        self, board: Board, move: Move, history: History, plan: Optional[MovePlan] = None
+    ) -> ApplyResult:
         raise NotImplementedError
 
     def is_end(self, board: Board, history: History) -> bool:
@@ -38,3 +73,60 @@ class RuleEngine:
 
     def result(self, board: Board, history: History) -> GameResult:
         raise NotImplementedError
+
+    def iter_legal_moves(
+        self, board: Board, color: PlayerColor, history: Optional[History] = None
+    ) -> Iterator[Tuple[int, int]]:
+        """
+        按行优先顺序惰性产出 color 方的合法落子点 (x, y)（不含 pass），调用方可随时停止。
+        """
+        size = board.size
+        for index, code in enumerate(board.data):
+            if code == EMPTY:
+                x, y = index % size, index // size
+                if self.is_legal(board, Move(x=x, y=y, color=color), history):
+                    yield x, y
+
+    def has_legal_move(self, board: Board, color: PlayerColor, history: Optional[History] = None) -> bool:
+        """
+        color 方是否存在至少一个合法落子点（找到第一个即返回）。
+        """
+        return next(self.iter_legal_moves(board, color, history), None) is not None
+
+    def make_move(self, board: Board, move: Move, plan: Optional[MovePlan] = None) -> Any:
+        """
+        就地落子并返回撤销令牌，交给 unmake_move 精确还原（调用方需保证 move 合法）。
+
+        供搜索与试走使用，避免每次尝试都复制棋盘。通用实现借助 Board 的改动日志，
+        令牌即本步的 (index, old, new) 列表；各规则引擎可覆盖为更轻量的实现。
+        """
+        outer = board.journal
+        board.journal = []
+        try:
+            self.apply_move(board, move, None, plan)
+        finally:
+            changes = board.journal
+            board.journal = outer
+            if outer is not None:
+                outer.extend(changes)
+        return changes
+
+    def unmake_move(self, board: Board, token: Any) -> None:
+        """
+        撤销 make_move（必须按 make_move 的逆序调用）。
+        """
+        board.revert_changes(token)
+
+    def legal_move_mask(self, board: Board, color: PlayerColor, history: Optional[History] = None) -> int:
+        """
+        color 方所有合法落子点的位掩码（第 y * size + x 位），不含 pass。
+
+        通用实现逐点调用 is_legal；各规则引擎应覆盖为整盘批量计算。
+        """
+        mask = 0
+        for index, code in enumerate(board.data):
+            if code == EMPTY:
+                move = Move(x=index % board.size, y=index // board.size, color=color)
+                if self.is_legal(board, move, history):
+                    mask |= 1 << index
+        return mask
@@ -0,0 +1,274 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import List, Optional, Set, Tuple
+
+from src.core.board import EMPTY, Board
+from src.core.zobrist import zobrist_keys
+
+
+class GoGroup:
+    """
+    一串同色相连的棋子：成员列表 + 气的集合。
+    """
+
+    __slots__ = ("code", "stones", "liberties")
+
+    def __init__(self, code: int, stones: List[int], liberties: Set[int]):
+        self.code = code
+        self.stones = stones
+        self.liberties = liberties
+
+
+@dataclass
+class GoPlayUndo:
+    """
+    GoPosition.play 的回滚信息，交给 GoPosition.undo 精确还原。
+    """
+
+    index: int
+    code: int
+    zobrist_before: int
+    extended: Optional[GoGroup]  # 被扩展的最大己方棋串；None 表示新建了棋串
+    extended_stone_count: int
+    extended_liberties: Set[int]
+    absorbed: List[GoGroup]  # 被并入 extended 的其他己方棋串（对象本身未被修改）
+    enemies: List[GoGroup]  # 相邻的对方棋串（均被去掉了 index 这口气）
+    captured: List[GoGroup] = field(default_factory=list)
+    liberty_gains: List[Tuple[GoGroup, int]] = field(default_factory=list)
+
+    @property
+    def captured_count(self) -> int:
+        return sum(len(group.stones) for group in self.captured)
+
+
+class GoPosition:
+    """
+    围棋增量局面：在 Board 之上维护每个点所属的棋串及其气。
+
+    - play/undo 只触及落子点周围的棋串，合法性、提子与叫吃查询都近似 O(1)；
+    - 棋盘被外部改动（悔棋、读档、重做）后用 sync 对齐：
+      若当前盘面哈希等于某一步之前的哈希，则逐步 undo 回去，否则整盘重建。
+    """
+
+    def __init__(self, board: Board):
+        self.board = board
+        self.neighbors = board.geometry.neighbors
+        self.keys = zobrist_keys(board.size)
+        self.group_of: List[Optional[GoGroup]] = []
+        self.undo_stack: List[GoPlayUndo] = []
+        self.zobrist = 0
+        self.rebuild()
+
+    # --- 查询 ---
+
+    def analyze(self, index: int, code: int) -> Tuple[bool, List[GoGroup]]:
+        """
+        不落子即判断在空点 index 落 code 是否合法，返回 (合法?, 将被提走的对方棋串)。
+        """
+        data = self.board.data
+        group_of = self.group_of
+        breathes = False
+        captures: List[GoGroup] = []
+        for neighbor in self.neighbors[index]:
+            neighbor_code = data[neighbor]
+            if neighbor_code == EMPTY:
+                breathes = True
+                continue
+            group = group_of[neighbor]
+            if neighbor_code == code:
+                # 己方棋串除了 index 之外还有气，连上后就不会无气
+                if len(group.liberties) > 1:
+                    breathes = True
+            elif len(group.liberties) == 1 and group not in captures:
+                captures.append(group)
+        return breathes or bool(captures), captures
+
+    def hash_after(self, index: int, code: int, captures: List[GoGroup]) -> int:
+        """
+        不落子即算出“落子并提走 captures 后”的盘面哈希，供打劫判断 O(1) 查表。
+        """
+        keys = self.keys
+        zobrist = self.board.zobrist ^ keys[code][index]
+        for group in captures:
+            enemy_keys = keys[group.code]
+            for stone in group.stones:
+                zobrist ^= enemy_keys[stone]
+        return zobrist
+
+    def liberty_count(self, index: int) -> int:
+        group = self.group_of[index]
+        return len(group.liberties) if group is not None else 0
+
+    def groups_in_atari(self, code: int) -> List[GoGroup]:
+        found: List[GoGroup] = []
+        seen: Set[int] = set()
+        for group in self.group_of:
+            if group is None or group.code != code or len(group.liberties) != 1 or id(group) in seen:
+                continue
+            seen.add(id(group))
+            found.append(group)
+        return found
+
+    # --- 修改 ---
+
+    def play(self, index: int, code: int, captures: Optional[List[GoGroup]] = None) -> GoPlayUndo:
+        """
+        在 index 落 code 并提走无气的对方棋串（调用方应先用 analyze 确认合法）。
+        captures 为 analyze 已算出的提子结果，给出时直接使用。
+        """
+        board = self.board
+        data = board.data
+        group_of = self.group_of
+        neighbors = self.neighbors
+
+        friends: List[GoGroup] = []
+        enemies: List[GoGroup] = []
+        empties: List[int] = []
+        for neighbor in neighbors[index]:
+            neighbor_code = data[neighbor]
+            if neighbor_code == EMPTY:
+                empties.append(neighbor)
+                continue
+            group = group_of[neighbor]
+            if neighbor_code == code:
+                if group not in friends:
+                    friends.append(group)
+            elif group not in enemies:
+                enemies.append(group)
+
+        zobrist_before = board.zobrist
+        board.set_at(index, code)
+
+        # 与相邻己方棋串合并：把较小的棋串并入最大的那个
+        if friends:
+            extended = max(friends, key=lambda g: len(g.stones))
+            record = GoPlayUndo(
+                index=index,
+                code=code,
+                zobrist_before=zobrist_before,
+                extended=extended,
+                extended_stone_count=len(extended.stones),
+                extended_liberties=set(extended.liberties),
+                absorbed=[g for g in friends if g is not extended],
+                enemies=enemies,
+            )
+            for other in record.absorbed:
+                for stone in other.stones:
+                    group_of[stone] = extended
+                extended.stones.extend(other.stones)
+                extended.liberties |= other.liberties
+            extended.stones.append(index)
+            extended.liberties.update(empties)
+            extended.liberties.discard(index)
+            group_of[index] = extended
+        else:
+            record = GoPlayUndo(
+                index=index,
+                code=code,
+                zobrist_before=zobrist_before,
+                extended=None,
+                extended_stone_count=0,
+                extended_liberties=set(),
+                absorbed=[],
+                enemies=enemies,
+            )
+            group_of[index] = GoGroup(code, [index], set(empties))
+
+        # 对方棋串失去这口气，气尽者被提走
+        for group in enemies:
+            group.liberties.discard(index)
+        if captures is not None:
+            record.captured = list(captures)
+        else:
+            record.captured = [group for group in enemies if not group.liberties]
+        for group in record.captured:
+            for stone in group.stones:
+                board.set_at(stone, EMPTY)
+                group_of[stone] = None
+            for stone in group.stones:
+                for neighbor in neighbors[stone]:
+                    gainer = group_of[neighbor]
+                    if gainer is not None and stone not in gainer.liberties:
+                        gainer.liberties.add(stone)
+                        record.liberty_gains.append((gainer, stone))
+
+        self.undo_stack.append(record)
+        self.zobrist = board.zobrist
+        return record
+
+    def undo(self, record: GoPlayUndo) -> None:
+        """
+        精确撤销一次 play（必须按 play 的逆序调用）。
+        """
+        board = self.board
+        group_of = self.group_of
+        if self.undo_stack and self.undo_stack[-1] is record:
+            self.undo_stack.pop()
+
+        for gainer, stone in reversed(record.liberty_gains):
+            gainer.liberties.discard(stone)
+        for group in record.captured:
+            for stone in group.stones:
+                board.set_at(stone, group.code)
+                group_of[stone] = group
+        for group in record.enemies:
+            group.liberties.add(record.index)
+
+        extended = record.extended
+        if extended is not None:
+            del extended.stones[record.extended_stone_count :]
+            extended.liberties = record.extended_liberties
+            for other in record.absorbed:
+                for stone in other.stones:
+                    group_of[stone] = other
+        group_of[record.index] = None
+        board.set_at(record.index, EMPTY)
+        self.zobrist = board.zobrist
+
+    def sync(self) -> None:
+        """
+        棋盘被外部改动后重新对齐：优先沿 undo_stack 回退，找不到对应局面时整盘重建。
+        """
+        board = self.board
+        target = board.zobrist
+        if target == self.zobrist:
+            return
+        depth = len(self.undo_stack) - 1
+        while depth >= 0 and self.undo_stack[depth].zobrist_before != target:
+            depth -= 1
+        if depth < 0:
+            self.rebuild()
+            return
+        # 盘面已被还原，这里的 set_at 只是重写同样的值；暂停 journal 避免记入当前这一步
+        journal = board.journal
+        board.journal = None
+        try:
+            while len(self.undo_stack) > depth:
+                self.undo(self.undo_stack[-1])
+        finally:
+            board.journal = journal
+
+    def rebuild(self) -> None:
+        board = self.board
+        data = board.data
+        neighbors = self.neighbors
+        group_of: List[Optional[GoGroup]] = [None] * len(data)
+        for start, code in enumerate(data):
+            if code == EMPTY or group_of[start] is not None:
+                continue
+            group = GoGroup(code, [start], set())
+            group_of[start] = group
+            cursor = 0
+            while cursor < len(group.stones):
+                for neighbor in neighbors[group.stones[cursor]]:
+                    neighbor_code = data[neighbor]
+                    if neighbor_code == EMPTY:
+                        group.liberties.add(neighbor)
+                    elif neighbor_code == code and group_of[neighbor] is None:
+                        group_of[neighbor] = group
+                        group.stones.append(neighbor)
+                cursor += 1
+        self.group_of = group_of
+        self.undo_stack = []
+        self.zobrist = board.zobrist
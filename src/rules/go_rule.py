@@ -1,161 +1,263 @@
 from __future__ import annotations
 
-from collections import deque
-from typing import List, Optional, Set, Tuple
+from typing import Iterator, List, Optional, Tuple
 
-from src.core.board import Board
+from src.core.bitmask import cells_mask, iter_indices, popcount
+from src.core.board import BLACK, EMPTY, WHITE, Board, color_code
 from src.core.history import History
 from src.core.move import Move
 from src.core.player import PlayerColor
-from src.rules.base_rule import RuleEngine, ApplyResult, GameResult
+from src.rules.base_rule import RuleEngine, ApplyResult, GameResult, MovePlan
+from src.rules.go_position import GoGroup, GoPlayUndo, GoPosition
+
+
+KO_NONE = "none"
+KO_SIMPLE = "simple"
+KO_SUPERKO = "superko"
+KO_RULES = (KO_NONE, KO_SIMPLE, KO_SUPERKO)
 
 
 class GoRuleEngine(RuleEngine):
     """
-    简化的围棋规则：支持提子、pass、数子计分，不考虑劫与自杀禁手。
+    简化的围棋规则：支持提子、pass、数子计分、自杀禁手与劫。
+
+    棋串与气由 GoPosition 增量维护，合法性与提子判断只看落子点周围。
+    劫由 ko_rule 控制：
+    - none：不限制；
+    - simple：简单劫，不能立即回到上一手之前的局面；
+    - superko：全局同形禁止，不能回到本局出现过的任何局面。
+    两者都只比较“落子后的盘面哈希”与 History 中的局面哈希集合，查询为 O(1)。
     """
 
+    def __init__(self, ko_rule: str = KO_SIMPLE) -> None:
+        if ko_rule not in KO_RULES:
+            raise ValueError(f"Unknown ko rule: {ko_rule}")
+        super().__init__()
+        self.ko_rule = ko_rule
+        self.last_error_message: str = ""
+        self._position: Optional[GoPosition] = None
+        self._score_cache: Optional[Tuple[Tuple[int, int], Tuple[int, int]]] = None
+
     def is_legal(self, board: Board, move: Move, history: History) -> bool:
+        return self.prepare_move(board, move, history) is not None
+
+    def prepare_move(self, board: Board, move: Move, history: Optional[History]) -> Optional[MovePlan]:
+        """
+        校验落子并给出将被提走的棋串与落子后的盘面哈希，apply_move 直接按方案提子。
+        """
         if move.is_pass:
             # pass 一定合法
             self.last_error_message = ""
-            return True
+            return MovePlan(move=move, zobrist_after=board.zobrist)
         if not board.in_bounds(move.x, move.y):
             self.last_error_message = ""
-            return False
+            return None
         if not board.is_empty(move.x, move.y):
             self.last_error_message = ""
-            return False
+            return None
 
-        # 自杀禁手：如果本方落子后没有气，且没有提到对方棋子，则判为非法
-        # 使用临时棋盘模拟落子和提子，不影响真实局面
-        temp = board.clone()
-        temp.set(move.x, move.y, move.color)
-
-        captured = 0
-        for nx, ny in temp.neighbors(move.x, move.y):
-            neighbor_color = temp.get(nx, ny)
-            if neighbor_color is None or neighbor_color == move.color:
-                continue
-            chain, liberties = self._collect_chain(temp, nx, ny)
-            if liberties == 0:
-                for cx, cy in chain:
-                    temp.set(cx, cy, None)
-                captured += len(chain)
-
-        # 重新计算己方落子后的气
-        _, liberties_after = self._collect_chain(temp, move.x, move.y)
-        if liberties_after == 0 and captured == 0:
-            # 没有提子且自己无气，属于自杀
-            self.last_error_message = "Suicide move is not allowed in Go"
-            return False
-
-        self.last_error_message = ""
-        return True
-
-    def apply_move(self, board: Board, move: Move, history: History) -> ApplyResult:
+        position = self.position(board)
+        index = move.y * board.size + move.x
+        code = color_code(move.color)
+        error, captures, zobrist_after = self._check_point(position, index, code, history)
+        self.last_error_message = error
+        if error:
+            return None
+        if zobrist_after is None:
+            zobrist_after = position.hash_after(index, code, captures)
+        return MovePlan(move=move, captures=captures, zobrist_after=zobrist_after)
+
+    def apply_move(
+        self, board: Board, move: Move, history: History, plan: Optional[MovePlan] = None
+    ) -> ApplyResult:
         if move.is_pass:
             return ApplyResult(ended=False, message="Pass")
 
-        board.set(move.x, move.y, move.color)
-        captured = 0
-
-        # 尝试提取对方无气的链
-        for nx, ny in board.neighbors(move.x, move.y):
-            neighbor_color = board.get(nx, ny)
-            if neighbor_color is None or neighbor_color == move.color:
-                continue
-            chain, liberties = self._collect_chain(board, nx, ny)
-            if liberties == 0:
-                for cx, cy in chain:
-                    board.set(cx, cy, None)
-                captured += len(chain)
-
-        message = f"Move ({move.x},{move.y}); captured {captured}"
+        position = self.position(board)
+        captures = plan.captures if plan is not None else None
+        record = position.play(move.y * board.size + move.x, color_code(move.color), captures)
+        message = f"Move ({move.x},{move.y}); captured {record.captured_count}"
         return ApplyResult(ended=False, message=message)
 
     def is_end(self, board: Board, history: History) -> bool:
-        # 预防极端情况：棋盘满视为结束
-        for row in board.cells:
-            for cell in row:
-                if cell is None:
-                    return False
-        return True
+        # 预防极端情况：棋盘满视为结束（空点数由 Board 增量维护）
+        return board.is_full()
 
     def result(self, board: Board, history: History) -> GameResult:
-        black_score, white_score = self._score(board)
+        black_score, white_score = self.score(board)
         if black_score > white_score:
             return GameResult(winner=PlayerColor.BLACK, message=f"Black wins {black_score} vs {white_score}")
         if white_score > black_score:
             return GameResult(winner=PlayerColor.WHITE, message=f"White wins {white_score} vs {black_score}")
         return GameResult(winner=None, message=f"Draw {black_score} : {white_score}")
 
-    # 内部工具
-    def _collect_chain(self, board: Board, x: int, y: int) -> Tuple[Set[Tuple[int, int]], int]:
-        color = board.get(x, y)
-        visited: Set[Tuple[int, int]] = set()
-        liberties = 0
-        queue = deque([(x, y)])
-        while queue:
-            cx, cy = queue.popleft()
-            if (cx, cy) in visited:
-                continue
-            visited.add((cx, cy))
-            for nx, ny in board.neighbors(cx, cy):
-                neighbor = board.get(nx, ny)
-                if neighbor is None:
-                    liberties += 1
-                elif neighbor == color and (nx, ny) not in visited:
-                    queue.append((nx, ny))
-        return visited, liberties
-
-    def _score(self, board: Board) -> Tuple[int, int]:
-        black = 0
-        white = 0
+    # --- Go helpers (public) ---
+
+    def position(self, board: Board) -> GoPosition:
+        """
+        取得与 board 对齐的增量棋串结构（同一棋盘复用，悔棋/读档后自动同步）。
+        """
+        position = self._position
+        if position is None or position.board is not board:
+            position = GoPosition(board)
+            self._position = position
+        else:
+            position.sync()
+        return position
+
+    def liberties_at(self, board: Board, x: int, y: int) -> int:
+        return self.position(board).liberty_count(y * board.size + x)
+
+    def atari_points(self, board: Board, color: PlayerColor) -> List[Tuple[int, int]]:
+        """
+        color 方被叫吃（只剩一口气）的棋串的唯一气点。
+        """
+        groups = self.position(board).groups_in_atari(color_code(color))
+        return sorted({board.geometry.coords(next(iter(group.liberties))) for group in groups})
+
+    def iter_legal_moves(
+        self, board: Board, color: PlayerColor, history: Optional[History] = None
+    ) -> Iterator[Tuple[int, int]]:
+        """
+        惰性逐点判断：有空邻点的空点直接合法（全局同形规则除外），其余交给增量棋串结构。
+        """
+        position = self.position(board)
+        code = color_code(color)
+        data = board.data
         size = board.size
-        visited = [[False] * size for _ in range(size)]
-
-        # 先加上盘面实子
-        for y in range(size):
-            for x in range(size):
-                stone = board.get(x, y)
-                if stone == PlayerColor.BLACK:
-                    black += 1
-                elif stone == PlayerColor.WHITE:
-                    white += 1
-
-        # 计算空地归属
-        for y in range(size):
-            for x in range(size):
-                if visited[y][x]:
-                    continue
-                if board.get(x, y) is not None:
-                    continue
-                region, owners = self._empty_region_owner(board, x, y, visited)
-                if len(owners) == 1:
-                    owner = owners.pop()
-                    if owner == PlayerColor.BLACK:
-                        black += region
-                    elif owner == PlayerColor.WHITE:
-                        white += region
-        return black, white
-
-    def _empty_region_owner(
-        self, board: Board, x: int, y: int, visited: List[List[bool]]
-    ) -> Tuple[int, Set[PlayerColor]]:
-        queue = deque([(x, y)])
-        visited[y][x] = True
-        count = 0
-        owners: Set[PlayerColor] = set()
-        while queue:
-            cx, cy = queue.popleft()
-            count += 1
-            for nx, ny in board.neighbors(cx, cy):
-                if board.get(nx, ny) is None and not visited[ny][nx]:
-                    visited[ny][nx] = True
-                    queue.append((nx, ny))
-                else:
-                    neighbor = board.get(nx, ny)
-                    if neighbor is not None:
-                        owners.add(neighbor)
-        return count, owners
+        neighbors = board.geometry.neighbors
+        check_all = history is not None and self.ko_rule == KO_SUPERKO
+        index = data.find(EMPTY)
+        while index != -1:
+            breathes = not check_all and any(data[n] == EMPTY for n in neighbors[index])
+            if breathes or not self._check_point(position, index, code, history)[0]:
+                yield index % size, index // size
+            index = data.find(EMPTY, index + 1)
+
+    def make_move(self, board: Board, move: Move, plan: Optional[MovePlan] = None) -> Optional[GoPlayUndo]:
+        # 令牌即 GoPosition 的回滚记录；pass 不改动棋盘
+        if move.is_pass:
+            return None
+        captures = plan.captures if plan is not None else None
+        return self.position(board).play(move.y * board.size + move.x, color_code(move.color), captures)
+
+    def unmake_move(self, board: Board, token: Optional[GoPlayUndo]) -> None:
+        if token is not None:
+            self.position(board).undo(token)
+
+    def legal_move_mask(self, board: Board, color: PlayerColor, history: Optional[History] = None) -> int:
+        """
+        整盘合法点位掩码（考虑自杀与劫）。
+
+        有空邻点的空点既不可能自杀，也不可能构成简单劫，用位运算一次性判为合法；
+        其余空点（以及全局同形规则下的所有空点）才逐点交给增量棋串结构判断。
+        """
+        # 缓存键：局面 + 劫的上下文（简单劫只取决于上一手之前的局面；全局同形取决于整段历史，不缓存）
+        key = None
+        if history is None or self.ko_rule == KO_NONE:
+            key = (board.size, board.position_key(color))
+        elif self.ko_rule == KO_SIMPLE:
+            key = (board.size, board.position_key(color), history.previous_position())
+        if key is not None:
+            cached = self.legal_cache.get(key)
+            if cached is not None:
+                return cached
+
+        position = self.position(board)
+        code = color_code(color)
+        empty = cells_mask(board.data, EMPTY)
+        if history is not None and self.ko_rule == KO_SUPERKO:
+            mask = 0
+            candidates = empty
+        else:
+            mask = empty & _grow(empty, board)
+            candidates = empty & ~mask
+        for index in iter_indices(candidates):
+            if not self._check_point(position, index, code, history)[0]:
+                mask |= 1 << index
+        if key is not None:
+            self.legal_cache.put(key, mask)
+        return mask
+
+    def score(self, board: Board) -> Tuple[int, int]:
+        """
+        区域计分 (黑, 白)：实子 + 只接触单一颜色的空地。
+
+        按盘面哈希缓存最近一次结果，同一局面重复渲染不会重新计算。
+        """
+        key = (board.size, board.zobrist)
+        if self._score_cache is not None and self._score_cache[0] == key:
+            return self._score_cache[1]
+        score = area_score(board)
+        self._score_cache = (key, score)
+        return score
+
+    # 内部工具
+    def _check_point(
+        self, position: GoPosition, index: int, code: int, history: Optional[History]
+    ) -> Tuple[str, List[GoGroup], Optional[int]]:
+        """
+        判断在空点 index 落 code 是否合法，返回 (错误原因或空串, 将被提走的棋串, 落子后哈希或 None)。
+        """
+        # 自杀禁手：如果本方落子后没有气，且没有提到对方棋子，则判为非法
+        # 由增量棋串结构直接判断，只看落子点周围的棋串，不需要复制棋盘模拟
+        legal, captures = position.analyze(index, code)
+        if not legal:
+            return "Suicide move is not allowed in Go", captures, None
+
+        # 劫：落子后的局面不能重复
+        # 简单劫只可能发生在提子时（要回到上一手之前，必须提走对方刚下的子）
+        zobrist_after = None
+        if history is not None and self.ko_rule == KO_SIMPLE and captures:
+            zobrist_after = position.hash_after(index, code, captures)
+            if zobrist_after == history.previous_position():
+                return "Ko: cannot retake immediately; play elsewhere first", captures, zobrist_after
+        if history is not None and self.ko_rule == KO_SUPERKO:
+            zobrist_after = position.hash_after(index, code, captures)
+            if history.has_position(zobrist_after):
+                return "Superko: move would repeat an earlier position", captures, zobrist_after
+        return "", captures, zobrist_after
+
+
+def area_score(board: Board) -> Tuple[int, int]:
+    """
+    位棋盘区域计分：把扁平数组一次转换为黑、白、空三个整数位掩码，
+    分别从黑子、白子出发在空点内做位并行的膨胀填充。
+    只被黑方填到的空点归黑，只被白方填到的归白，两者都到达的是中立点。
+    每轮膨胀是几次整数移位，19 路整盘计分只需几十微秒。
+    """
+    data = board.data
+    black = cells_mask(data, BLACK)
+    white = cells_mask(data, WHITE)
+    empty = cells_mask(data, EMPTY)
+    reach_black = _flood(black, empty, board)
+    reach_white = _flood(white, empty, board)
+    return (
+        popcount(black) + popcount(reach_black & ~reach_white),
+        popcount(white) + popcount(reach_white & ~reach_black),
+    )
+
+
+def _grow(bits: int, board: Board) -> int:
+    """
+    bits 向上下左右各扩张一格（不含 bits 本身，结果可能超出棋盘，由调用方与掩码相与）。
+    """
+    size = board.size
+    # bit_directions 与 DIRECTIONS_8 同序：0 为向右、4 为向左
+    right_mask = board.geometry.bit_directions[0][1]
+    left_mask = board.geometry.bit_directions[4][1]
+    return ((bits << 1) & right_mask) | ((bits >> 1) & left_mask) | (bits << size) | (bits >> size)
+
+
+def _flood(seed: int, empty: int, board: Board) -> int:
+    """
+    从 seed 的相邻空点出发，在 empty 内反复向上下左右膨胀直到不再变化。
+    """
+    reached = 0
+    frontier = seed
+    while True:
+        grown = _grow(frontier, board) & empty
+        if grown == reached:
+            return reached
+        reached = grown
+        frontier = seed | reached
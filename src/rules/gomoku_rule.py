@@ -1,12 +1,14 @@
 from __future__ import annotations
 
-from typing import List, Tuple
+from typing import Iterator, Optional, Tuple
 
-from src.core.board import Board
+from src.core.bitmask import cells_mask
+from src.core.board import EMPTY, Board, color_code
+from src.core.geometry import WINDOW_LENGTH
 from src.core.history import History
 from src.core.move import Move
 from src.core.player import PlayerColor
-from src.rules.base_rule import RuleEngine, ApplyResult, GameResult
+from src.rules.base_rule import RuleEngine, ApplyResult, GameResult, MovePlan
 
 
 class GomokuRuleEngine(RuleEngine):
@@ -19,7 +21,9 @@ class GomokuRuleEngine(RuleEngine):
             return False
         return board.in_bounds(move.x, move.y) and board.is_empty(move.x, move.y)
 
-    def apply_move(self, board: Board, move: Move, history: History) -> ApplyResult:
+    def apply_move(
+        self, board: Board, move: Move, history: History, plan: Optional[MovePlan] = None
+    ) -> ApplyResult:
         board.set(move.x, move.y, move.color)
         if self._is_win(board, move.x, move.y, move.color):
             result = GameResult(winner=move.color, message=f"{move.color.name} wins by five in a row")
@@ -37,25 +41,42 @@ class GomokuRuleEngine(RuleEngine):
         # 仅在满盘平局时调用
         return GameResult(winner=None, message="Draw: board is full")
 
+    def make_move(self, board: Board, move: Move, plan: Optional[MovePlan] = None) -> int:
+        index = move.y * board.size + move.x
+        board.set_at(index, color_code(move.color))
+        return index
+
+    def unmake_move(self, board: Board, token: int) -> None:
+        board.set_at(token, EMPTY)
+
+    def legal_move_mask(self, board: Board, color: PlayerColor, history: Optional[History] = None) -> int:
+        # 五子棋没有禁手：所有空点都可落子
+        return cells_mask(board.data, EMPTY)
+
+    def iter_legal_moves(
+        self, board: Board, color: PlayerColor, history: Optional[History] = None
+    ) -> Iterator[Tuple[int, int]]:
+        data = board.data
+        size = board.size
+        index = data.find(EMPTY)
+        while index != -1:
+            yield index % size, index // size
+            index = data.find(EMPTY, index + 1)
+
+    def has_legal_move(self, board: Board, color: PlayerColor, history: Optional[History] = None) -> bool:
+        return not board.is_full()
+
     # 内部工具
     def _is_board_full(self, board: Board) -> bool:
-        return all(cell is not None for row in board.cells for cell in row)
+        return board.is_full()
 
     def _is_win(self, board: Board, x: int, y: int, color: PlayerColor) -> bool:
-        directions: List[Tuple[int, int]] = [(1, 0), (0, 1), (1, 1), (1, -1)]
-        for dx, dy in directions:
-            count = 1
-            count += self._count_dir(board, x, y, dx, dy, color)
-            count += self._count_dir(board, x, y, -dx, -dy, color)
-            if count >= 5:
+        data = board.data
+        geometry = board.geometry
+        five = bytes((color_code(color),)) * WINDOW_LENGTH
+        slices = geometry.window_slices
+        # 只需检查经过新落子的长度为 5 的窗口（来自预计算的几何表），每个窗口一次切片比较
+        for window in geometry.windows_through[y * board.size + x]:
+            if data[slices[window]] == five:
                 return True
         return False
-
-    def _count_dir(self, board: Board, x: int, y: int, dx: int, dy: int, color: PlayerColor) -> int:
-        cx, cy = x + dx, y + dy
-        count = 0
-        while board.in_bounds(cx, cy) and board.get(cx, cy) == color:
-            count += 1
-            cx += dx
-            cy += dy
-        return count
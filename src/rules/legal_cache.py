@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional
+
+DEFAULT_CAPACITY = 4096
+
+
+class LegalMoveCache:
+    """
+    合法落子掩码的有界 LRU 缓存，由规则引擎持有，控制器、规则判断与 AI 共用同一份。
+
+    键包含盘面 Zobrist 哈希与行棋方（见 Board.position_key）：棋盘一旦改动，键随之改变，
+    旧条目不会再被命中，因此无需显式失效；超出容量时淘汰最久未用的条目。
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        if capacity < 1:
+            raise ValueError("Cache capacity must be positive")
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, int]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[int]:
+        mask = self._entries.get(key)
+        if mask is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return mask
+
+    def put(self, key: Hashable, mask: int) -> None:
+        entries = self._entries
+        entries[key] = mask
+        entries.move_to_end(key)
+        if len(entries) > self.capacity:
+            entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._entries),
+            "capacity": self.capacity,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def summary(self) -> str:
+        # 自引擎创建（或 clear）以来的累计命中，附在 AI 每步的报告后
+        stats = self.stats()
+        return f"legal cache hit {stats['hit_rate']:.0%} ({self.hits}/{self.hits + self.misses})"
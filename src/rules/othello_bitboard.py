@@ -0,0 +1,296 @@
+"""
+黑白棋位棋盘后端：
+
+- 黑/白棋子各用一个 Python 整数表示，第 y*size+x 位为 1 表示该格有子；
+- Python 整数无位宽限制，8–18 的所有偶数尺寸都可直接使用；
+- 走法生成与翻转计算都基于“移位 + 掩码”，避免逐格调用 board.get。
+"""
+
+from __future__ import annotations
+
+from operator import add
+from typing import Optional, Set, Tuple
+
+from src.core.bitmask import cells_mask, iter_indices
+from src.core.board import BLACK, EMPTY, WHITE, Board
+from src.core.geometry import SYMMETRY_COUNT, geometry_for
+from src.core.player import PlayerColor
+from src.core.zobrist import symmetric_keys, zobrist_keys
+
+# 位串（"0"/"1"）-> 格子编码，黑白两张位棋盘各自翻译后逐字节相加即为 Board.data 的编码
+_BLACK_CELLS = bytes.maketrans(b"01", bytes((EMPTY, BLACK)))
+_WHITE_CELLS = bytes.maketrans(b"01", bytes((EMPTY, WHITE)))
+
+
+def board_masks(size: int) -> Tuple[int, Tuple[Tuple[int, int], ...]]:
+    """
+    返回 (full, directions)：
+    - full：全盘掩码；
+    - directions：8 个方向的 (移位量, 移位后掩码)，正数左移、负数右移，
+      掩码用于去掉跨行“绕回”的位。
+    两者都取自按尺寸缓存的 Geometry 表。
+    """
+    geometry = geometry_for(size)
+    return geometry.full_mask, geometry.bit_directions
+
+
+def _shift(bits: int, amount: int, mask: int) -> int:
+    if amount > 0:
+        return (bits << amount) & mask
+    return (bits >> -amount) & mask
+
+
+def legal_mask(own: int, opp: int, size: int) -> int:
+    """
+    计算 own 一方的全部合法落子位（一次性对 8 个方向做移位填充）。
+    """
+    full, directions = board_masks(size)
+    empty = full & ~(own | opp)
+    moves = 0
+    for amount, mask in directions:
+        run = _shift(own, amount, mask) & opp
+        while run:
+            nxt = _shift(run, amount, mask)
+            moves |= nxt & empty
+            run = nxt & opp
+    return moves
+
+
+def has_legal(own: int, opp: int, size: int) -> bool:
+    """
+    own 一方是否至少有一个合法落子：与 legal_mask 相同的填充，但某个方向一出现落子位就返回。
+    """
+    full, directions = board_masks(size)
+    empty = full & ~(own | opp)
+    for amount, mask in directions:
+        run = _shift(own, amount, mask) & opp
+        while run:
+            nxt = _shift(run, amount, mask)
+            if nxt & empty:
+                return True
+            run = nxt & opp
+    return False
+
+
+def flip_mask(own: int, opp: int, index: int, size: int) -> int:
+    """
+    计算 own 一方在 index 处落子会翻转的对方棋子位；返回 0 表示不能翻转。
+    """
+    _, directions = board_masks(size)
+    move = 1 << index
+    flips = 0
+    for amount, mask in directions:
+        ray = 0
+        cur = _shift(move, amount, mask)
+        while cur & opp:
+            ray |= cur
+            cur = _shift(cur, amount, mask)
+        if cur & own:
+            flips |= ray
+    return flips
+
+
+def bitboards_of(board: Board) -> Tuple[int, int]:
+    """
+    取得 (black, white) 位棋盘：OthelloBoard 直接返回，普通 Board 则逐格转换。
+    """
+    if isinstance(board, OthelloBoard):
+        return board.black, board.white
+    data = board.data
+    return cells_mask(data, BLACK), cells_mask(data, WHITE)
+
+
+class OthelloBoard(Board):
+    """
+    黑白棋棋盘：真实状态是 black / white 两个位棋盘，
+    get/set/cells/data 只是提供给渲染、存档与通用代码的视图；
+    data 为只读的 bytes，按 (black, white) 缓存，局面不变时重复读取不再重建。
+
+    frontier 为“与任一棋子八方向相邻的空格”集合，随落子/悔棋增量维护：
+    合法落子点一定在其中，不在 frontier 内的空格可直接判为非法。
+    """
+
+    __slots__ = ("black", "white", "frontier", "_cells")
+
+    def __init__(self, size: int):
+        if size < 1:
+            raise ValueError("Board size must be positive")
+        self.size = size
+        self.geometry = geometry_for(size)
+        self.zobrist = 0
+        self.journal = None
+        self.counts = [size * size, 0, 0]
+        self._keys = zobrist_keys(size)
+        self._symmetric = None
+        self.black = 0
+        self.white = 0
+        self.frontier: Set[int] = set()
+        self._cells: Tuple[int, int, bytes] = (-1, -1, b"")
+
+    def get(self, x: int, y: int) -> Optional[PlayerColor]:
+        bit = 1 << (y * self.size + x)
+        if self.black & bit:
+            return PlayerColor.BLACK
+        if self.white & bit:
+            return PlayerColor.WHITE
+        return None
+
+    def set_at(self, index: int, code: int) -> None:
+        bit = 1 << index
+        old = BLACK if self.black & bit else WHITE if self.white & bit else EMPTY
+        self.zobrist ^= self._keys[old][index] ^ self._keys[code][index]
+        self.counts[old] -= 1
+        self.counts[code] += 1
+        if self.journal is not None:
+            self.journal.append((index, old, code))
+        self.black &= ~bit
+        self.white &= ~bit
+        if code == BLACK:
+            self.black |= bit
+        elif code == WHITE:
+            self.white |= bit
+        if old == EMPTY and code != EMPTY:
+            self._occupy(index)
+        elif old != EMPTY and code == EMPTY:
+            self._vacate(index)
+
+    @property
+    def data(self) -> bytes:  # type: ignore[override]
+        # 与 Board.data 相同编码的只读 bytes（写入会直接报错，而不是静默地改一份副本）
+        black, white = self.black, self.white
+        cached = self._cells
+        if cached[0] == black and cached[1] == white:
+            return cached[2]
+        spec = f"0{self.size * self.size}b"
+        cells = bytes(
+            map(
+                add,
+                format(black, spec)[::-1].encode().translate(_BLACK_CELLS),
+                format(white, spec)[::-1].encode().translate(_WHITE_CELLS),
+            )
+        )
+        self._cells = (black, white, cells)
+        return cells
+
+    def symmetric_hashes(self) -> Tuple[int, ...]:
+        # 直接遍历位棋盘上的棋子，不经过 data
+        cached = self._symmetric
+        if cached is not None and cached[0] == self.zobrist:
+            return cached[1]
+        keys = symmetric_keys(self.size)
+        hashes = [0] * SYMMETRY_COUNT
+        for code, bits in ((BLACK, self.black), (WHITE, self.white)):
+            code_keys = keys[code]
+            for index in iter_indices(bits):
+                for t, key in enumerate(code_keys[index]):
+                    hashes[t] ^= key
+        result = tuple(hashes)
+        self._symmetric = (self.zobrist, result)
+        return result
+
+    def bits(self, color: PlayerColor) -> int:
+        return self.black if color == PlayerColor.BLACK else self.white
+
+    def place(self, index: int, color: PlayerColor, flips: int) -> None:
+        """
+        一次性落子并翻转 flips 中的所有对方棋子。
+        """
+        keys = self._keys
+        code = BLACK if color == PlayerColor.BLACK else WHITE
+        value = self.zobrist ^ keys[code][index]
+        journal = self.journal
+        if journal is not None:
+            journal.append((index, EMPTY, code))
+        # 翻转一子：异或掉黑白两张键表中该格的键
+        black_keys, white_keys = keys[BLACK], keys[WHITE]
+        opponent = WHITE if code == BLACK else BLACK
+        flipped_count = 0
+        for flipped in iter_indices(flips):
+            value ^= black_keys[flipped] ^ white_keys[flipped]
+            flipped_count += 1
+            if journal is not None:
+                journal.append((flipped, opponent, code))
+        self.zobrist = value
+        counts = self.counts
+        counts[EMPTY] -= 1
+        counts[code] += 1 + flipped_count
+        counts[opponent] -= flipped_count
+
+        changed = flips | (1 << index)
+        if color == PlayerColor.BLACK:
+            self.black |= changed
+            self.white &= ~changed
+        else:
+            self.white |= changed
+            self.black &= ~changed
+        self._occupy(index)
+
+    def unplace(self, index: int, color: PlayerColor, flips: int) -> None:
+        """
+        place 的逆操作：移走 index 处的棋子并把 flips 翻回对方。
+        """
+        keys = self._keys
+        code = BLACK if color == PlayerColor.BLACK else WHITE
+        opponent = WHITE if code == BLACK else BLACK
+        value = self.zobrist ^ keys[code][index]
+        journal = self.journal
+        black_keys, white_keys = keys[BLACK], keys[WHITE]
+        flipped_count = 0
+        for flipped in iter_indices(flips):
+            value ^= black_keys[flipped] ^ white_keys[flipped]
+            flipped_count += 1
+            if journal is not None:
+                journal.append((flipped, code, opponent))
+        if journal is not None:
+            journal.append((index, code, EMPTY))
+        self.zobrist = value
+        counts = self.counts
+        counts[EMPTY] += 1
+        counts[code] -= 1 + flipped_count
+        counts[opponent] += flipped_count
+
+        bit = 1 << index
+        if color == PlayerColor.BLACK:
+            self.black &= ~(flips | bit)
+            self.white |= flips
+        else:
+            self.white &= ~(flips | bit)
+            self.black |= flips
+        self._vacate(index)
+
+    def _occupy(self, index: int) -> None:
+        # index 由空变为有子：它离开 frontier，周围的空格加入
+        frontier = self.frontier
+        frontier.discard(index)
+        occupied = self.black | self.white
+        for neighbor in self.geometry.neighbors8[index]:
+            if not (occupied >> neighbor) & 1:
+                frontier.add(neighbor)
+
+    def _vacate(self, index: int) -> None:
+        # index 由有子变为空（悔棋）：重新判断它与周围空格是否仍与棋子相邻
+        frontier = self.frontier
+        occupied = self.black | self.white
+        masks = self.geometry.neighbor_masks8
+        for cell in (index,) + self.geometry.neighbors8[index]:
+            if (occupied >> cell) & 1:
+                continue
+            if occupied & masks[cell]:
+                frontier.add(cell)
+            else:
+                frontier.discard(cell)
+
+    def clone(self) -> "OthelloBoard":
+        other = object.__new__(OthelloBoard)
+        other.size = self.size
+        other.geometry = self.geometry
+        other.zobrist = self.zobrist
+        other.journal = None
+        other.counts = self.counts[:]
+        other._keys = self._keys
+        other._symmetric = self._symmetric
+        other.black = self.black
+        other.white = self.white
+        other.frontier = set(self.frontier)
+        other._cells = self._cells
+        return other
@@ -1,12 +1,14 @@
 from __future__ import annotations
 
-from typing import List, Tuple
+from typing import Any, Iterator, List, Optional, Tuple
 
-from src.core.board import Board
+from src.core.bitmask import iter_indices, mask_to_coords, popcount
+from src.core.board import BLACK, WHITE, Board
 from src.core.history import History
 from src.core.move import Move
 from src.core.player import PlayerColor
-from src.rules.base_rule import ApplyResult, GameResult, RuleEngine
+from src.rules.base_rule import ApplyResult, GameResult, MovePlan, RuleEngine
+from src.rules.othello_bitboard import OthelloBoard, bitboards_of, flip_mask, has_legal, legal_mask
 
 
 class OthelloRuleEngine(RuleEngine):
@@ -15,52 +17,74 @@ class OthelloRuleEngine(RuleEngine):
     - 只能落子在能翻转至少一个对手棋子的空位；
     - 若当前方无任何合法落子，则该回合被迫弃权（pass）；
     - 棋盘满或双方都无合法落子时终局，按棋子数判胜负。
+
+    走法生成与翻转计算委托给位棋盘后端（othello_bitboard），
+    OthelloBoard 可直接读取位棋盘，普通 Board 则先转换。
     """
 
     def __init__(self) -> None:
+        super().__init__()
         self.last_error_message: str = ""
 
     def is_legal(self, board: Board, move: Move, history: History) -> bool:
+        return self.prepare_move(board, move, history) is not None
+
+    def prepare_move(self, board: Board, move: Move, history: Optional[History]) -> Optional[MovePlan]:
+        """
+        校验落子并算出翻子掩码，apply_move / make_move 直接使用，不再重算。
+        """
         if move.color is None:
             self.last_error_message = "Missing player color"
-            return False
+            return None
 
         if move.is_pass:
-            if self.legal_moves(board, move.color):
+            if self.has_legal_move(board, move.color):
                 self.last_error_message = "Pass not allowed: you have legal moves"
-                return False
+                return None
             self.last_error_message = ""
-            return True
+            return MovePlan(move=move)
 
         if not board.in_bounds(move.x, move.y) or not board.is_empty(move.x, move.y):
             self.last_error_message = ""
-            return False
+            return None
 
-        flips = self.flips_for_move(board, move.x, move.y, move.color)
+        index = move.y * board.size + move.x
+        # 不与任何棋子相邻的空格不可能翻子，frontier 可 O(1) 排除
+        if isinstance(board, OthelloBoard) and index not in board.frontier:
+            self.last_error_message = "Illegal move in Othello: must flip at least one disc"
+            return None
+        own, opp = self._own_opp(board, move.color)
+        flips = flip_mask(own, opp, index, board.size)
         if not flips:
             self.last_error_message = "Illegal move in Othello: must flip at least one disc"
-            return False
+            return None
         self.last_error_message = ""
-        return True
+        return MovePlan(move=move, flips=flips)
 
-    def apply_move(self, board: Board, move: Move, history: History) -> ApplyResult:
+    def apply_move(
+        self, board: Board, move: Move, history: History, plan: Optional[MovePlan] = None
+    ) -> ApplyResult:
         if move.color is None:
             return ApplyResult(ended=False, message="Missing player color")
 
         if move.is_pass:
             return ApplyResult(ended=False, message="Forced pass (no legal moves)")
 
-        flips = self.flips_for_move(board, move.x, move.y, move.color)
-        board.set(move.x, move.y, move.color)
-        for fx, fy in flips:
-            board.set(fx, fy, move.color)
-        return ApplyResult(ended=False, message=f"Move ({move.x},{move.y}); flipped {len(flips)}")
+        index = move.y * board.size + move.x
+        flips = plan.flips if plan is not None else self._flips(board, move.color, index)
+        if isinstance(board, OthelloBoard):
+            board.place(index, move.color, flips)
+        else:
+            board.set(move.x, move.y, move.color)
+            for fx, fy in mask_to_coords(flips, board.size):
+                board.set(fx, fy, move.color)
+        return ApplyResult(ended=False, message=f"Move ({move.x},{move.y}); flipped {popcount(flips)}")
 
     def is_end(self, board: Board, history: History) -> bool:
         if self._is_board_full(board):
             return True
         # 双方都无合法落子才终局
-        return (not self.legal_moves(board, PlayerColor.BLACK)) and (not self.legal_moves(board, PlayerColor.WHITE))
+        return not self.has_legal_move(board, PlayerColor.BLACK) and not self.has_legal_move(board, PlayerColor.WHITE)
 
     def result(self, board: Board, history: History) -> GameResult:
         black, white = self.count_discs(board)
@@ -73,74 +97,77 @@ class OthelloRuleEngine(RuleEngine):
     # --- Othello helpers (public) ---
 
     def legal_moves(self, board: Board, color: PlayerColor) -> List[Tuple[int, int]]:
-        moves: List[Tuple[int, int]] = []
-        for y in range(board.size):
-            for x in range(board.size):
-                if board.is_empty(x, y) and self.flips_for_move(board, x, y, color):
-                    moves.append((x, y))
-        return moves
+        return mask_to_coords(self.legal_move_bits(board, color), board.size)
+
+    def make_move(self, board: Board, move: Move, plan: Optional[MovePlan] = None) -> Any:
+        """
+        位棋盘上的令牌为 (index, color, flips)，撤销时按位还原；普通 Board 走通用实现。
+        """
+        if move.is_pass:
+            return None
+        if not isinstance(board, OthelloBoard):
+            return super().make_move(board, move, plan)
+        index = move.y * board.size + move.x
+        flips = plan.flips if plan is not None else self._flips(board, move.color, index)
+        board.place(index, move.color, flips)
+        return index, move.color, flips
+
+    def unmake_move(self, board: Board, token: Any) -> None:
+        if token is None:
+            return
+        if isinstance(board, OthelloBoard):
+            board.unplace(*token)
+        else:
+            super().unmake_move(board, token)
+
+    def iter_legal_moves(
+        self, board: Board, color: PlayerColor, history: Optional[History] = None
+    ) -> Iterator[Tuple[int, int]]:
+        # 位棋盘一次移位填充即得整盘掩码，再按位惰性产出坐标
+        size = board.size
+        for index in iter_indices(self.legal_move_bits(board, color)):
+            yield index % size, index // size
+
+    def has_legal_move(self, board: Board, color: PlayerColor, history: Optional[History] = None) -> bool:
+        cached = self.legal_cache.get((board.size, board.position_key(color)))
+        if cached is not None:
+            return bool(cached)
+        own, opp = self._own_opp(board, color)
+        return has_legal(own, opp, board.size)
+
+    def legal_move_mask(self, board: Board, color: PlayerColor, history: Optional[History] = None) -> int:
+        return self.legal_move_bits(board, color)
+
+    def legal_move_bits(self, board: Board, color: PlayerColor) -> int:
+        # 同一局面的走法生成在控制器、终局判断与 AI 之间共享
+        key = (board.size, board.position_key(color))
+        mask = self.legal_cache.get(key)
+        if mask is None:
+            own, opp = self._own_opp(board, color)
+            mask = legal_mask(own, opp, board.size)
+            self.legal_cache.put(key, mask)
+        return mask
 
     def flips_for_move(self, board: Board, x: int, y: int, color: PlayerColor) -> List[Tuple[int, int]]:
         if not board.in_bounds(x, y) or not board.is_empty(x, y):
             return []
-
-        opponent = color.opposite()
-        flips: List[Tuple[int, int]] = []
-        directions = [
-            (-1, -1),
-            (0, -1),
-            (1, -1),
-            (-1, 0),
-            (1, 0),
-            (-1, 1),
-            (0, 1),
-            (1, 1),
-        ]
-        for dx, dy in directions:
-            flips.extend(self._ray_flips(board, x, y, color, opponent, dx, dy))
-        return flips
+        own, opp = self._own_opp(board, color)
+        return mask_to_coords(flip_mask(own, opp, y * board.size + x, board.size), board.size)
 
     def count_discs(self, board: Board) -> Tuple[int, int]:
-        black = 0
-        white = 0
-        for row in board.cells:
-            for cell in row:
-                if cell == PlayerColor.BLACK:
-                    black += 1
-                elif cell == PlayerColor.WHITE:
-                    white += 1
-        return black, white
+        return board.counts[BLACK], board.counts[WHITE]
 
     # --- internals ---
 
     def _is_board_full(self, board: Board) -> bool:
-        return all(cell is not None for row in board.cells for cell in row)
-
-    def _ray_flips(
-        self,
-        board: Board,
-        x: int,
-        y: int,
-        color: PlayerColor,
-        opponent: PlayerColor,
-        dx: int,
-        dy: int,
-    ) -> List[Tuple[int, int]]:
-        cx, cy = x + dx, y + dy
-        ray: List[Tuple[int, int]] = []
-
-        # 第一格必须是对方棋子
-        if not board.in_bounds(cx, cy) or board.get(cx, cy) != opponent:
-            return []
+        return board.is_full()
+
+    def _flips(self, board: Board, color: PlayerColor, index: int) -> int:
+        own, opp = self._own_opp(board, color)
+        return flip_mask(own, opp, index, board.size)
 
-        while board.in_bounds(cx, cy):
-            cell = board.get(cx, cy)
-            if cell == opponent:
-                ray.append((cx, cy))
-            elif cell == color:
-                return ray  # 被己方棋子封口，合法翻转
-            else:
-                break  # 遇到空位，不能翻转
-            cx += dx
-            cy += dy
-        return []
+    def _own_opp(self, board: Board, color: PlayerColor) -> Tuple[int, int]:
+        black, white = bitboards_of(board)
+        if color == PlayerColor.BLACK:
+            return black, white
+        return white, black
@@ -9,12 +9,23 @@ class Seat:
     """
     表示一方的“对弈参与者”配置：
     - human: 人类玩家（可游客或已登录）
-    - ai: AI 玩家（按等级区分）
+    - ai: AI 玩家（按等级区分；ai3 及以上为搜索型 AI，可指定深度、节点预算或用时）
     """
 
     kind: str  # "human" | "ai"
     ai_level: Optional[int] = None
     username: Optional[str] = None
+    ai_depth: Optional[int] = None  # 搜索深度（默认等于等级）
+    ai_nodes: Optional[int] = None  # 节点预算（None 表示不限）
+    ai_tt_mb: Optional[int] = None  # 置换表内存上限（MB，None 表示默认值）
+    ai_endgame: Optional[int] = None  # 精确求解的空格数阈值（None 表示默认值，0 表示关闭）
+    ai_book: bool = True  # 是否先查开局库
+    ai_workers: Optional[int] = None  # 并行搜索的工作进程数（None 或 1 表示单进程）
+    ai_time_ms: Optional[int] = None  # 每步固定用时（毫秒）
+    ai_clock_ms: Optional[int] = None  # 时钟模式的总用时（毫秒），与 ai_time_ms 二选一
+    ai_increment_ms: Optional[int] = None  # 时钟模式每步加秒（毫秒）
+    ai_ponder: bool = False  # 人类思考时是否在后台预想
+    ai_patterns: bool = True  # 有模式权重文件时是否用模式表评估
 
     def display_name(self) -> str:
         if self.kind == "ai":